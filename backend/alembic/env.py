@@ -8,7 +8,7 @@ import sys
 # Add the parent directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.models.base import Base
+from app.models.base import Base, sync_database_url
 from app.core.config import settings
 
 # Import all models to ensure they are registered with SQLAlchemy
@@ -36,7 +36,7 @@ target_metadata = Base.metadata
 
 
 def get_url():
-    return settings.DATABASE_URL
+    return sync_database_url()
 
 
 def run_migrations_offline() -> None:
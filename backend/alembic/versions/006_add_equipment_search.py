@@ -0,0 +1,76 @@
+"""Add full-text search index for equipment
+
+Revision ID: 006
+Revises: 005
+Create Date: 2025-08-04 10:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    if conn.dialect.name == 'postgresql':
+        # Weighted tsvector kept up to date by Postgres itself
+        op.execute("""
+            ALTER TABLE equipment ADD COLUMN search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(brand, '') || ' ' || coalesce(model, '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(description, '') || ' ' || coalesce(notes, '')), 'C')
+            ) STORED
+        """)
+        op.execute("CREATE INDEX ix_equipment_search_vector ON equipment USING gin (search_vector)")
+    elif conn.dialect.name == 'sqlite':
+        # External-content FTS5 table synced by triggers
+        op.execute("""
+            CREATE VIRTUAL TABLE equipment_fts USING fts5(
+                name, brand, model, description, notes,
+                content='equipment', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER equipment_fts_ai AFTER INSERT ON equipment BEGIN
+                INSERT INTO equipment_fts(rowid, name, brand, model, description, notes)
+                VALUES (new.id, new.name, new.brand, new.model, new.description, new.notes);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER equipment_fts_ad AFTER DELETE ON equipment BEGIN
+                INSERT INTO equipment_fts(equipment_fts, rowid, name, brand, model, description, notes)
+                VALUES ('delete', old.id, old.name, old.brand, old.model, old.description, old.notes);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER equipment_fts_au
+            AFTER UPDATE OF name, brand, model, description, notes ON equipment BEGIN
+                INSERT INTO equipment_fts(equipment_fts, rowid, name, brand, model, description, notes)
+                VALUES ('delete', old.id, old.name, old.brand, old.model, old.description, old.notes);
+                INSERT INTO equipment_fts(rowid, name, brand, model, description, notes)
+                VALUES (new.id, new.name, new.brand, new.model, new.description, new.notes);
+            END
+        """)
+        # Index the rows that already exist
+        op.execute("INSERT INTO equipment_fts(equipment_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+
+    if conn.dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_equipment_search_vector")
+        op.drop_column('equipment', 'search_vector')
+    elif conn.dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS equipment_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS equipment_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS equipment_fts_ai")
+        op.execute("DROP TABLE IF EXISTS equipment_fts")
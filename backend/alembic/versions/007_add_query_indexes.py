@@ -0,0 +1,58 @@
+"""Add composite and partial indexes for equipment and team queries
+
+Revision ID: 007
+Revises: 006
+Create Date: 2025-08-06 09:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+# Partial index predicate for available_only queries, per dialect
+AVAILABLE = {
+    'sqlite_where': sa.text('is_available = 1'),
+    'postgresql_where': sa.text('is_available'),
+}
+
+
+def upgrade() -> None:
+    # Equipment list/stats filters: owner_id + category + is_available, team_id + is_available
+    op.create_index('ix_equipment_owner_category_available', 'equipment', ['owner_id', 'category', 'is_available'], unique=False)
+    op.create_index('ix_equipment_team_available', 'equipment', ['team_id', 'is_available'], unique=False)
+    op.create_index('ix_equipment_created_at_id', 'equipment', ['created_at', 'id'], unique=False)
+    op.create_index('ix_equipment_available_id', 'equipment', ['id'], unique=False, **AVAILABLE)
+    op.create_index('ix_equipment_available_owner', 'equipment', ['owner_id'], unique=False, **AVAILABLE)
+    op.create_index('ix_equipment_available_category', 'equipment', ['category'], unique=False, **AVAILABLE)
+
+    # Leading columns of the composites above, so they only cost writes now
+    op.execute('DROP INDEX IF EXISTS ix_equipment_owner_id')
+    op.execute('DROP INDEX IF EXISTS ix_equipment_team_id')
+
+    # Team permission checks, member lists and owner counts
+    op.create_index('ix_team_memberships_user_team_role', 'team_memberships', ['user_id', 'team_id', 'role'], unique=False)
+    op.create_index('ix_team_memberships_team_role', 'team_memberships', ['team_id', 'role'], unique=False)
+
+    # Invitation lists and the pending-invitation check
+    op.create_index('ix_team_invitations_team_email', 'team_invitations', ['team_id', 'email'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_team_invitations_team_email', table_name='team_invitations')
+    op.drop_index('ix_team_memberships_team_role', table_name='team_memberships')
+    op.drop_index('ix_team_memberships_user_team_role', table_name='team_memberships')
+
+    op.create_index(op.f('ix_equipment_team_id'), 'equipment', ['team_id'], unique=False)
+    op.create_index(op.f('ix_equipment_owner_id'), 'equipment', ['owner_id'], unique=False)
+
+    op.drop_index('ix_equipment_available_category', table_name='equipment')
+    op.drop_index('ix_equipment_available_owner', table_name='equipment')
+    op.drop_index('ix_equipment_available_id', table_name='equipment')
+    op.drop_index('ix_equipment_created_at_id', table_name='equipment')
+    op.drop_index('ix_equipment_team_available', table_name='equipment')
+    op.drop_index('ix_equipment_owner_category_available', table_name='equipment')
@@ -0,0 +1,59 @@
+"""Add equipment stats counter tables
+
+Revision ID: 008
+Revises: 007
+Create Date: 2025-08-07 11:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'equipment_counters',
+        sa.Column('scope', sa.String(), nullable=False),
+        sa.Column('scope_id', sa.String(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('available', sa.Integer(), nullable=False),
+        sa.Column('categories', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('scope', 'scope_id')
+    )
+    op.create_table(
+        'equipment_category_counters',
+        sa.Column('scope', sa.String(), nullable=False),
+        sa.Column('scope_id', sa.String(), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('available', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('scope', 'scope_id', 'category')
+    )
+
+    # Backfill from the existing equipment
+    op.execute("""
+        INSERT INTO equipment_category_counters (scope, scope_id, category, total, available)
+        SELECT 'owner', owner_id, category, count(*), sum(CASE WHEN is_available THEN 1 ELSE 0 END)
+        FROM equipment WHERE owner_id IS NOT NULL
+        GROUP BY owner_id, category
+        UNION ALL
+        SELECT 'team', CAST(team_id AS VARCHAR), category, count(*), sum(CASE WHEN is_available THEN 1 ELSE 0 END)
+        FROM equipment WHERE team_id IS NOT NULL
+        GROUP BY team_id, category
+    """)
+    op.execute("""
+        INSERT INTO equipment_counters (scope, scope_id, total, available, categories)
+        SELECT scope, scope_id, sum(total), sum(available), count(*)
+        FROM equipment_category_counters
+        GROUP BY scope, scope_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('equipment_category_counters')
+    op.drop_table('equipment_counters')
@@ -0,0 +1,26 @@
+"""Add optimistic concurrency version columns to equipment and teams
+
+Revision ID: 010
+Revises: 009
+Create Date: 2025-08-14 10:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows start at version 1, like new ones
+    op.add_column('equipment', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+    op.add_column('teams', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    op.drop_column('teams', 'version')
+    op.drop_column('equipment', 'version')
@@ -0,0 +1,52 @@
+"""Add equipment checkouts with one active checkout per item
+
+Revision ID: 011
+Revises: 010
+Create Date: 2025-08-18 09:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+# Partial index predicate for active checkouts, per dialect
+ACTIVE = {
+    'sqlite_where': sa.text('is_active = 1'),
+    'postgresql_where': sa.text('is_active'),
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        'equipment_checkouts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('equipment_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('checked_out_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('checked_in_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('checkout_notes', sa.Text(), nullable=True),
+        sa.Column('checkin_notes', sa.Text(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), server_default=sa.true(), nullable=False),
+        sa.Column('due_date', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['equipment_id'], ['equipment.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_equipment_checkouts_id'), 'equipment_checkouts', ['id'], unique=False)
+    op.create_index(op.f('ix_equipment_checkouts_equipment_id'), 'equipment_checkouts', ['equipment_id'], unique=False)
+    op.create_index(op.f('ix_equipment_checkouts_user_id'), 'equipment_checkouts', ['user_id'], unique=False)
+    # The database, not the application, guarantees one active checkout per item
+    op.create_index('ux_equipment_checkouts_active_equipment', 'equipment_checkouts', ['equipment_id'], unique=True, **ACTIVE)
+
+
+def downgrade() -> None:
+    op.drop_index('ux_equipment_checkouts_active_equipment', table_name='equipment_checkouts')
+    op.drop_index(op.f('ix_equipment_checkouts_user_id'), table_name='equipment_checkouts')
+    op.drop_index(op.f('ix_equipment_checkouts_equipment_id'), table_name='equipment_checkouts')
+    op.drop_index(op.f('ix_equipment_checkouts_id'), table_name='equipment_checkouts')
+    op.drop_table('equipment_checkouts')
@@ -0,0 +1,53 @@
+"""Add overdue checkout flags, job watermarks and the active due-date index
+
+Revision ID: 012
+Revises: 011
+Create Date: 2025-08-20 14:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+# Partial index predicate for active checkouts, per dialect
+ACTIVE = {
+    'sqlite_where': sa.text('is_active = 1'),
+    'postgresql_where': sa.text('is_active'),
+}
+
+
+def upgrade() -> None:
+    # The overdue scanner's range scan: open checkouts by due date
+    op.create_index('ix_equipment_checkouts_active_due_date', 'equipment_checkouts', ['due_date'], unique=False, **ACTIVE)
+
+    op.create_table(
+        'overdue_checkouts',
+        sa.Column('checkout_id', sa.Integer(), nullable=False),
+        sa.Column('equipment_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('team_id', sa.Integer(), nullable=True),
+        sa.Column('due_date', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('flagged_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['checkout_id'], ['equipment_checkouts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('checkout_id')
+    )
+    op.create_index('ix_overdue_checkouts_team_due_date', 'overdue_checkouts', ['team_id', 'due_date', 'checkout_id'], unique=False)
+
+    op.create_table(
+        'job_watermarks',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('watermark', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('job_watermarks')
+    op.drop_index('ix_overdue_checkouts_team_due_date', table_name='overdue_checkouts')
+    op.drop_table('overdue_checkouts')
+    op.drop_index('ix_equipment_checkouts_active_due_date', table_name='equipment_checkouts')
@@ -0,0 +1,50 @@
+"""Add equipment reservations with an overlap-free window per item
+
+Revision ID: 013
+Revises: 012
+Create Date: 2025-08-22 11:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'equipment_reservations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('equipment_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('starts_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('ends_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.CheckConstraint('ends_at > starts_at', name='ck_equipment_reservations_window'),
+        sa.ForeignKeyConstraint(['equipment_id'], ['equipment.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_equipment_reservations_id'), 'equipment_reservations', ['id'], unique=False)
+    op.create_index(op.f('ix_equipment_reservations_user_id'), 'equipment_reservations', ['user_id'], unique=False)
+    # Sorted-endpoint index: overlap searches are bounded range scans on it
+    op.create_index('ix_equipment_reservations_equipment_window', 'equipment_reservations', ['equipment_id', 'starts_at', 'ends_at'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+        op.execute("""
+            ALTER TABLE equipment_reservations ADD CONSTRAINT ex_equipment_reservations_overlap
+            EXCLUDE USING gist (equipment_id WITH =, tstzrange(starts_at, ends_at, '[)') WITH &&)
+        """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_equipment_reservations_equipment_window', table_name='equipment_reservations')
+    op.drop_index(op.f('ix_equipment_reservations_user_id'), table_name='equipment_reservations')
+    op.drop_index(op.f('ix_equipment_reservations_id'), table_name='equipment_reservations')
+    op.drop_table('equipment_reservations')
@@ -0,0 +1,60 @@
+"""Add kits: named groups of equipment checked out together
+
+Revision ID: 014
+Revises: 013
+Create Date: 2025-08-25 10:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'kits',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('team_id', sa.Integer(), nullable=True),
+        sa.Column('created_by_user_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['created_by_user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_kits_id'), 'kits', ['id'], unique=False)
+    op.create_index(op.f('ix_kits_team_id'), 'kits', ['team_id'], unique=False)
+
+    op.create_table(
+        'kit_items',
+        sa.Column('kit_id', sa.Integer(), nullable=False),
+        sa.Column('equipment_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['kit_id'], ['kits.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['equipment_id'], ['equipment.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('kit_id', 'equipment_id')
+    )
+    op.create_index(op.f('ix_kit_items_equipment_id'), 'kit_items', ['equipment_id'], unique=False)
+
+    # Which kit checkout a checkout row belongs to; plain column, the history outlives the kit
+    op.add_column('equipment_checkouts', sa.Column('kit_id', sa.Integer(), nullable=True))
+    op.create_index(
+        'ix_equipment_checkouts_active_kit', 'equipment_checkouts', ['kit_id'], unique=False,
+        sqlite_where=sa.text('is_active = 1'), postgresql_where=sa.text('is_active'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_equipment_checkouts_active_kit', table_name='equipment_checkouts')
+    op.drop_column('equipment_checkouts', 'kit_id')
+    op.drop_index(op.f('ix_kit_items_equipment_id'), table_name='kit_items')
+    op.drop_table('kit_items')
+    op.drop_index(op.f('ix_kits_team_id'), table_name='kits')
+    op.drop_index(op.f('ix_kits_id'), table_name='kits')
+    op.drop_table('kits')
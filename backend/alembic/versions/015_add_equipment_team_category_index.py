@@ -0,0 +1,24 @@
+"""Add a team_id + category + is_available index for team equipment lists
+
+Revision ID: 015
+Revises: 014
+Create Date: 2025-08-27 09:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '015'
+down_revision = '014'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # GET /teams/{id}/equipment?category=...; ix_equipment_team_available still serves team-only pages in id order
+    op.create_index('ix_equipment_team_category_available', 'equipment', ['team_id', 'category', 'is_available'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_equipment_team_category_available', table_name='equipment')
@@ -0,0 +1,70 @@
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
+import httpx
+
+from app.models.base import get_async_db
+from app.services.auth_service import AuthService, UserSnapshot, identity_cache
+from app.services.token_verifier import token_verifier, TokenVerificationError
+
+security = HTTPBearer()
+
+
+async def get_token_claims(token: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    """Verified identity claims for the bearer token."""
+    try:
+        return await token_verifier.get_claims(token.credentials)
+    except TokenVerificationError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    except httpx.HTTPError as e:
+        print(f"Auth0 API Error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to connect to Auth0")
+
+
+async def get_auth0_user_info(
+    token: HTTPAuthorizationCredentials = Depends(security),
+    claims: dict = Depends(get_token_claims),
+) -> dict:
+    """Full Auth0 profile for the bearer token (falls back to /userinfo if claims are missing)."""
+    try:
+        return await token_verifier.get_user_info(token.credentials, claims)
+    except TokenVerificationError:
+        raise HTTPException(status_code=401, detail="Could not retrieve user information from Auth0")
+    except httpx.HTTPError as e:
+        print(f"Auth0 API Error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to connect to Auth0")
+
+
+async def get_current_user(
+    token: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+) -> UserSnapshot:
+    """
+    Dependency to get the current user from the token.
+
+    Resolved users are served from the identity cache; concurrent requests
+    with the same token share a single verification and database lookup.
+    Users seen for the first time are synced from their Auth0 profile.
+    On a miss the lookup runs on the request's async session, the same one
+    the endpoint gets from ``get_async_db``.
+    """
+    async def resolve():
+        claims = await get_token_claims(token)
+        user = await db.run_sync(lambda session: AuthService.get_user_by_auth0_id(claims["sub"], session))
+        if not user:
+            user_info = await get_auth0_user_info(token, claims)
+            try:
+                user = await db.run_sync(lambda session: AuthService.sync_user_from_auth0(user_info, session))
+            except Exception as e:
+                print(f"User Sync Error: {str(e)}")
+                raise HTTPException(status_code=500, detail="Authentication failed")
+        return UserSnapshot.from_user(user), claims.get("exp")
+
+    return await identity_cache.get_or_resolve(token.credentials, resolve)
+
+
+async def require_admin(current_user: UserSnapshot = Depends(get_current_user)) -> UserSnapshot:
+    """Dependency for operations endpoints that change data outside a user's own items and teams."""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
@@ -3,7 +3,14 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text
 from sqlalchemy.exc import OperationalError
 
+from app.api.deps import require_admin
+from app.core.cache import lookup_cache
 from app.models.base import get_db
+from app.services.auth_service import identity_cache, login_sync_stats
+from app.services.equipment_counters import EquipmentCounterService
+from app.services.membership_index import membership_index
+from app.services.overdue_scanner import OverdueScanService
+from app.utils.etag import conditional_get_stats
 
 router = APIRouter()
 
@@ -78,6 +85,46 @@ async def health_check():
     """Simple health check endpoint"""
     return {"status": "healthy", "message": "Admin endpoints are working"}
 
+@router.get("/identity-cache")
+async def identity_cache_stats():
+    """Hit/miss/eviction counters for the resolved-user identity cache"""
+    return identity_cache.stats()
+
+@router.get("/login-sync")
+async def login_sync_statistics():
+    """Login syncs that needed a users row write vs. writes skipped as unchanged"""
+    return login_sync_stats.stats()
+
+@router.get("/lookup-cache")
+async def lookup_cache_stats():
+    """Hit/miss/invalidation counters for the category (and similar) lookup cache"""
+    return lookup_cache.stats()
+
+@router.get("/membership-cache")
+async def membership_cache_stats():
+    """Hit ratio, evictions and invalidations of the per-worker team role index"""
+    return membership_index.stats()
+
+@router.get("/conditional-get")
+async def conditional_get_statistics():
+    """ETag-tagged GETs per endpoint and the share answered with 304 Not Modified"""
+    return conditional_get_stats.stats()
+
+@router.get("/equipment-counters")
+async def check_equipment_counters(db: Session = Depends(get_db)):
+    """Compare the equipment stats counters against the equipment table and report drift"""
+    return EquipmentCounterService.check(db)
+
+@router.post("/equipment-counters/rebuild", dependencies=[Depends(require_admin)])
+async def rebuild_equipment_counters(db: Session = Depends(get_db)):
+    """Rebuild drifted equipment stats counters from the equipment table. Admins only."""
+    return EquipmentCounterService.check(db, repair=True)
+
+@router.post("/overdue-scan", dependencies=[Depends(require_admin)])
+async def run_overdue_scan(db: Session = Depends(get_db)):
+    """Flag newly overdue checkouts now instead of waiting for the scanner's next run. Admins only."""
+    return OverdueScanService.scan(db)
+
 @router.get("/equipment-schema")
 async def check_equipment_schema(db: Session = Depends(get_db)):
     """Debug endpoint to check equipment table schema"""
@@ -1,19 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.security import HTTPBearer
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.schemas.user import User as UserSchema
-from app.services.auth_service import AuthService
+from app.services.auth_service import AuthService, UserSnapshot
 from app.models.base import get_db
-from app.core.config import settings
-import requests
+from app.api.deps import get_auth0_user_info, get_token_claims, get_current_user as get_current_db_user
 
 router = APIRouter()
-security = HTTPBearer()
 
 
 @router.post("/sync", response_model=UserSchema)
 async def sync_user_on_login(
-    token: str = Depends(security),
+    user_info: dict = Depends(get_auth0_user_info),
     db: Session = Depends(get_db)
 ):
     """
@@ -21,118 +18,45 @@ async def sync_user_on_login(
     This should be called from the frontend after successful Auth0 login.
     """
     try:
-        # Get user info from Auth0 using the token
-        auth0_user_info_url = f"https://{settings.AUTH0_DOMAIN}/userinfo"
-        
-        user_info_response = requests.get(
-            auth0_user_info_url,
-            headers={"Authorization": f"Bearer {token.credentials}"}
-        )
-
-        if user_info_response.status_code != 200:
-            raise HTTPException(
-                status_code=401, 
-                detail="Could not retrieve user information from Auth0"
-            )
-
-        user_info = user_info_response.json()
-
         # Sync with local database
         user = AuthService.sync_user_from_auth0(user_info, db)
-        
+
         return user
 
-    except requests.exceptions.RequestException as e:
-        print(f"Auth0 API Error: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to connect to Auth0")
     except Exception as e:
         print(f"Login Sync Error: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
 @router.get("/me", response_model=UserSchema)
-async def get_current_user(
-    token: str = Depends(security),
-    db: Session = Depends(get_db)
-):
+async def get_current_user(current_user: UserSnapshot = Depends(get_current_db_user)):
     """
     Get current user information from the database using Auth0 token.
+    Users not yet in the local database are synced on first sight.
     """
-    try:
-        # Get user info from Auth0 using the token
-        auth0_user_info_url = f"https://{settings.AUTH0_DOMAIN}/userinfo"
-        
-        user_info_response = requests.get(
-            auth0_user_info_url,
-            headers={"Authorization": f"Bearer {token.credentials}"}
-        )
-
-        if user_info_response.status_code != 200:
-            raise HTTPException(
-                status_code=401, 
-                detail="Invalid token"
-            )
-
-        user_info = user_info_response.json()
-        auth0_id = user_info.get('sub')
-
-        # Get user from local database
-        user = AuthService.get_user_by_auth0_id(auth0_id, db)
-        
-        if not user:
-            # User not in local database, sync them
-            user = AuthService.sync_user_from_auth0(user_info, db)
-        
-        return user
-
-    except requests.exceptions.RequestException as e:
-        print(f"Auth0 API Error: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to connect to Auth0")
-    except Exception as e:
-        print(f"Get Current User Error: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+    return current_user
 
 
 @router.post("/complete-onboarding")
 async def complete_onboarding(
-    token: str = Depends(security),
+    claims: dict = Depends(get_token_claims),
     db: Session = Depends(get_db)
 ):
     """
     Mark user's onboarding as complete.
     """
-    try:
-        # Get user info from Auth0 using the token
-        auth0_user_info_url = f"https://{settings.AUTH0_DOMAIN}/userinfo"
-        
-        user_info_response = requests.get(
-            auth0_user_info_url,
-            headers={"Authorization": f"Bearer {token.credentials}"}
-        )
-
-        if user_info_response.status_code != 200:
-            raise HTTPException(
-                status_code=401, 
-                detail="Invalid token"
-            )
+    # Get user from local database
+    user = AuthService.get_user_by_auth0_id(claims["sub"], db)
 
-        user_info = user_info_response.json()
-        auth0_id = user_info.get('sub')
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
 
-        # Get user from local database
-        user = AuthService.get_user_by_auth0_id(auth0_id, db)
-        
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-        
+    try:
         # Mark onboarding as complete
         user = AuthService.mark_onboarding_complete(user.id, db)
-        
+
         return {"message": "Onboarding completed successfully", "user": user}
 
-    except requests.exceptions.RequestException as e:
-        print(f"Auth0 API Error: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to connect to Auth0")
     except Exception as e:
         print(f"Complete Onboarding Error: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
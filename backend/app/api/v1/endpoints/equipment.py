@@ -1,18 +1,56 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 
-from app.schemas.equipment import EquipmentCreate, EquipmentUpdate, EquipmentResponse
+from app.schemas.equipment import (
+    EquipmentCreate, EquipmentUpdate, EquipmentResponse, EquipmentSearchResult,
+    EquipmentBulkCreate, EquipmentBulkUpdate, EquipmentBulkDelete,
+    EquipmentBulkCreateResult, EquipmentBulkUpdateResult, EquipmentBulkDeleteResult,
+)
+from app.schemas.checkout import CheckinCreate, CheckoutCreate, CheckoutResponse
+from app.schemas.reservation import ReservationCreate, ReservationResponse
+from app.models.checkout import EquipmentCheckout
+from app.models.collection_version import EQUIPMENT, TEAMS
 from app.models.equipment import Equipment
-from app.models.base import get_db
+from app.models.team import Team, TeamMembership
+from app.models.reservation import MAX_RESERVATION
+from app.models.base import get_async_db
+from app.core.config import settings
+from app.api.deps import get_current_user
+from app.services.auth_service import UserSnapshot
+from app.services.collection_versions import CollectionVersionService, equipment_scopes
+from app.services.equipment_bulk import EquipmentBulkService
+from app.services.equipment_checkout import EquipmentCheckoutService
+from app.services.equipment_counters import EquipmentCounterService
+from app.services.equipment_lookups import EquipmentLookupService
+from app.services.equipment_reservations import EquipmentReservationService, ReservationConflict, free_during
+from app.services.equipment_search import EquipmentSearchService
+from app.services.equipment_writes import CheckoutConflict, EquipmentWriteService
+from app.services.team_service import TeamService
+from app.services.versioned_writes import VersionConflict
+from app.utils.etag import not_modified_response, weak_etag
+from app.utils.export import export_response
+from app.utils.fieldsets import fieldset_response, parse_fields
+from app.utils.responses import wire_response
+from app.utils.timestamps import utc_naive
+from app.utils.pagination import InvalidCursor, KeysetSort, NEXT_CURSOR_HEADER, paginate_async, resolve_sort
 
 router = APIRouter()
 
+EQUIPMENT_SORTS = {
+    "id": KeysetSort("id", Equipment.id, Equipment.id),
+    "name": KeysetSort("name", Equipment.name, Equipment.id),
+    "created_at": KeysetSort("created_at", Equipment.created_at, Equipment.id),
+    "category": KeysetSort("category", Equipment.category, Equipment.id),
+}
+
 @router.post("/", response_model=EquipmentResponse)
-def create_equipment(
+async def create_equipment(
     equipment: EquipmentCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new equipment item"""
     try:
@@ -21,14 +59,14 @@ def create_equipment(
         print(f"Created Equipment object: {db_equipment.__dict__}")
         db.add(db_equipment)
         print("Added to session, committing...")
-        db.commit()
+        await db.commit()
         print("Committed successfully, refreshing...")
-        db.refresh(db_equipment)
+        await db.refresh(db_equipment)
         print(f"Equipment created successfully with ID: {db_equipment.id}")
         return db_equipment
     except IntegrityError as e:
         print(f"IntegrityError occurred: {str(e)}")
-        db.rollback()
+        await db.rollback()
         if "serial_number" in str(e):
             raise HTTPException(
                 status_code=400, 
@@ -40,103 +78,408 @@ def create_equipment(
         print(f"Error type: {type(e)}")
         import traceback
         traceback.print_exc()
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+def equipment_filters(
+    category: Optional[str] = None, available_only: bool = False,
+    owner_id: Optional[str] = None, team_id: Optional[int] = None,
+) -> list:
+    """WHERE criteria for the list endpoints' shared query parameters."""
+    criteria = []
+    if category:
+        criteria.append(Equipment.category == category)
+    if available_only:
+        criteria.append(Equipment.is_available == True)
+    if owner_id:
+        criteria.append(Equipment.owner_id == owner_id)
+    if team_id is not None:
+        criteria.append(Equipment.team_id == team_id)
+    return criteria
+
+async def equipment_page(
+    db: AsyncSession, response: Response, criteria: list, endpoint: str,
+    cursor: Optional[str], limit: int, sort: str, fields: Optional[str],
+    if_none_match: Optional[str], accept: Optional[str], scopes: Tuple[str, ...] = (EQUIPMENT,),
+):
+    """
+    One keyset page of equipment matching ``criteria``, with conditional GET
+    and sparse fieldsets; shared by every equipment list endpoint.
+
+    The ETag covers the versions of ``scopes``: the narrowest ones every
+    matching row belongs to (e.g. ``equipment_scopes(None, team_id)``), plus
+    TEAMS when ``criteria`` depend on memberships.
+    """
+    fieldset = parse_fields(fields, EquipmentResponse)
+    sort_by = resolve_sort(sort, EQUIPMENT_SORTS)
+    versions = [await db.run_sync(CollectionVersionService.get_version, name) for name in scopes]
+    etag = weak_etag(EQUIPMENT, *versions)
+    not_modified = not_modified_response(endpoint, etag, if_none_match, accept, response, fieldset)
+    if not_modified:
+        return not_modified
+    
+    if fieldset:
+        # Only the requested columns, plus what the cursor is built from
+        columns = dict.fromkeys((*fieldset, sort_by.name, "id"))
+        statement = select(*(Equipment.__table__.c[name] for name in columns))
+    else:
+        statement = select(Equipment)
+    
+    items = await paginate_async(db, statement.where(*criteria), sort_by, cursor, limit, response, entities=not fieldset)
+    if fieldset:
+        return fieldset_response(EquipmentResponse, fieldset, items, accept, response)
+    return wire_response(EquipmentResponse, items, accept, response)
+
 @router.get("/", response_model=List[EquipmentResponse])
-def get_equipment(
-    skip: int = 0,
-    limit: int = 100,
+async def get_equipment(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGINATION_DEFAULT_LIMIT, ge=1, le=settings.PAGINATION_MAX_LIMIT),
+    sort: str = Query("id", description="id, name, created_at or category; prefix with - for descending"),
+    category: Optional[str] = None,
+    available_only: bool = False,
+    owner_id: Optional[str] = None,
+    team_id: Optional[int] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated subset of fields to return, e.g. id,name,category,is_available"),
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get equipment with optional filtering, one keyset page at a time"""
+    criteria = equipment_filters(category, available_only, owner_id, team_id)
+    if team_id is not None:
+        scopes = equipment_scopes(None, team_id)
+    elif owner_id:
+        scopes = equipment_scopes(owner_id, None)
+    else:
+        scopes = [EQUIPMENT]
+    return await equipment_page(
+        db, response, criteria, "equipment.list", cursor, limit, sort, fields, if_none_match, accept,
+        scopes=tuple(scopes),
+    )
+
+@router.get("/my-teams", response_model=List[EquipmentResponse])
+async def get_my_team_equipment(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGINATION_DEFAULT_LIMIT, ge=1, le=settings.PAGINATION_MAX_LIMIT),
+    sort: str = Query("id", description="id, name, created_at or category; prefix with - for descending"),
+    category: Optional[str] = None,
+    available_only: bool = False,
+    owner_id: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated subset of fields to return, e.g. id,name,category,is_available"),
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Equipment of every active team the current user belongs to, in one query"""
+    my_teams = (
+        select(TeamMembership.team_id)
+        .join(Team, Team.id == TeamMembership.team_id)
+        .where(TeamMembership.user_id == current_user.id, Team.is_active == True)
+    )
+    criteria = [Equipment.team_id.in_(my_teams), *equipment_filters(category, available_only, owner_id)]
+    return await equipment_page(
+        db, response, criteria, "equipment.my_teams", cursor, limit, sort, fields, if_none_match, accept,
+        scopes=(EQUIPMENT, TEAMS),
+    )
+
+@router.get("/search", response_model=List[EquipmentSearchResult])
+async def search_equipment(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGINATION_DEFAULT_LIMIT, ge=1, le=settings.PAGINATION_MAX_LIMIT),
+    category: Optional[str] = None,
+    available_only: bool = False,
+    owner_id: Optional[str] = None,
+    team_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Full-text search over name, brand, model, description and notes, best matches first"""
+    try:
+        results, next_cursor = await db.run_sync(
+            EquipmentSearchService.search, q, limit, cursor,
+            owner_id=owner_id, team_id=team_id, category=category, available_only=available_only
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return results
+
+@router.get("/availability", response_model=List[EquipmentResponse])
+async def get_equipment_availability(
+    response: Response,
+    starts_at: datetime = Query(..., alias="from"),
+    ends_at: datetime = Query(..., alias="to", description="Exclusive"),
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGINATION_DEFAULT_LIMIT, ge=1, le=settings.PAGINATION_MAX_LIMIT),
+    category: Optional[str] = None,
+    owner_id: Optional[str] = None,
+    team_id: Optional[int] = None,
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Equipment that is neither reserved nor checked out at any point in [from, to), one keyset page at a time"""
+    starts_at, ends_at = utc_naive(starts_at), utc_naive(ends_at)
+    if ends_at <= starts_at:
+        raise HTTPException(status_code=400, detail="'to' must be after 'from'")
+    
+    statement = select(Equipment).where(*free_during(starts_at, ends_at))
+    
+    if category:
+        statement = statement.where(Equipment.category == category)
+    
+    if owner_id:
+        statement = statement.where(Equipment.owner_id == owner_id)
+    
+    if team_id is not None:
+        statement = statement.where(Equipment.team_id == team_id)
+    
+    items = await paginate_async(db, statement, EQUIPMENT_SORTS["id"], cursor, limit, response)
+    return wire_response(EquipmentResponse, items, accept, response)
+
+@router.get("/export")
+async def export_equipment(
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    gzip: bool = False,
     category: Optional[str] = None,
     available_only: bool = False,
     owner_id: Optional[str] = None,
-    db: Session = Depends(get_db)
+    team_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all equipment with optional filtering"""
-    query = db.query(Equipment)
+    """Stream every matching equipment item as NDJSON or CSV, optionally gzipped"""
+    table = Equipment.__table__
+    statement = select(*(table.c[name] for name in EquipmentResponse.model_fields)).order_by(table.c.id)
     
     if category:
-        query = query.filter(Equipment.category == category)
+        statement = statement.where(table.c.category == category)
     
     if available_only:
-        query = query.filter(Equipment.is_available == True)
+        statement = statement.where(table.c.is_available == True)
     
     if owner_id:
-        query = query.filter(Equipment.owner_id == owner_id)
+        statement = statement.where(table.c.owner_id == owner_id)
     
-    equipment = query.offset(skip).limit(limit).all()
-    return equipment
+    if team_id is not None:
+        statement = statement.where(table.c.team_id == team_id)
+    
+    return export_response(db.bind, statement, "equipment", fmt, gzip)
+
+@router.post("/bulk", response_model=EquipmentBulkCreateResult)
+async def bulk_create_equipment(payload: EquipmentBulkCreate, db: AsyncSession = Depends(get_async_db)):
+    """Create many equipment items; rows with duplicate serial numbers are reported in errors"""
+    created, errors = await db.run_sync(EquipmentBulkService.create, [item.model_dump() for item in payload.items])
+    return {"created": created, "errors": errors}
+
+@router.patch("/bulk", response_model=EquipmentBulkUpdateResult)
+async def bulk_update_equipment(payload: EquipmentBulkUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Partially update many equipment items by id"""
+    items = [item.model_dump(exclude_unset=True) for item in payload.items]
+    updated, errors = await db.run_sync(EquipmentBulkService.update, items)
+    return {"updated": updated, "errors": errors}
+
+@router.delete("/bulk", response_model=EquipmentBulkDeleteResult)
+async def bulk_delete_equipment(payload: EquipmentBulkDelete, db: AsyncSession = Depends(get_async_db)):
+    """Delete many equipment items by id"""
+    deleted, errors = await db.run_sync(EquipmentBulkService.delete, payload.ids)
+    return {"deleted": deleted, "errors": errors}
 
 @router.get("/{equipment_id}", response_model=EquipmentResponse)
-def get_equipment_by_id(equipment_id: int, db: Session = Depends(get_db)):
+async def get_equipment_by_id(
+    equipment_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get equipment by ID"""
-    equipment = db.query(Equipment).filter(Equipment.id == equipment_id).first()
+    version = await db.scalar(select(Equipment.version).where(Equipment.id == equipment_id))
+    if version is None:
+        raise HTTPException(status_code=404, detail="Equipment not found")
+    # Every write to the row bumps its version, and no write to another row does
+    etag = weak_etag(EQUIPMENT, equipment_id, version)
+    not_modified = not_modified_response("equipment.item", etag, if_none_match, accept, response)
+    if not_modified:
+        return not_modified
+    
+    equipment = await db.get(Equipment, equipment_id)
     if not equipment:
         raise HTTPException(status_code=404, detail="Equipment not found")
-    return equipment
+    return wire_response(EquipmentResponse, equipment, accept, response)
 
 @router.put("/{equipment_id}", response_model=EquipmentResponse)
-def update_equipment(
+async def update_equipment(
     equipment_id: int,
     equipment_update: EquipmentUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Update equipment by ID"""
-    equipment = db.query(Equipment).filter(Equipment.id == equipment_id).first()
-    if not equipment:
-        raise HTTPException(status_code=404, detail="Equipment not found")
-    
+    """Update equipment by ID; with ``version``, only if nobody changed it since"""
     # Update only provided fields
-    update_data = equipment_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(equipment, field, value)
+    update_data = equipment_update.model_dump(exclude_unset=True)
+    version = update_data.pop("version", None)
     
     try:
-        db.commit()
-        db.refresh(equipment)
-        return equipment
+        equipment = await db.run_sync(EquipmentWriteService.update, equipment_id, update_data, version)
+    except (VersionConflict, CheckoutConflict) as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except IntegrityError as e:
-        db.rollback()
         if "serial_number" in str(e):
             raise HTTPException(
                 status_code=400, 
                 detail="Serial number already exists"
             )
         raise HTTPException(status_code=400, detail="Database error")
+    
+    if not equipment:
+        raise HTTPException(status_code=404, detail="Equipment not found")
+    return equipment
 
 @router.delete("/{equipment_id}")
-def delete_equipment(equipment_id: int, db: Session = Depends(get_db)):
+async def delete_equipment(
+    equipment_id: int,
+    version: Optional[int] = Query(None, description="Version last read; a stale one is rejected with 409"),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Delete equipment by ID"""
-    equipment = db.query(Equipment).filter(Equipment.id == equipment_id).first()
-    if not equipment:
-        raise HTTPException(status_code=404, detail="Equipment not found")
+    try:
+        deleted = await db.run_sync(EquipmentWriteService.delete, equipment_id, version)
+    except VersionConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
     
-    db.delete(equipment)
-    db.commit()
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Equipment not found")
     return {"message": "Equipment deleted successfully"}
 
+@router.post("/{equipment_id}/checkout", response_model=CheckoutResponse)
+async def checkout_equipment(
+    equipment_id: int,
+    checkout: Optional[CheckoutCreate] = None,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Check an available item out to the current user; 409 if someone else got it first"""
+    checkout = checkout or CheckoutCreate()
+    try:
+        result = await db.run_sync(
+            EquipmentCheckoutService.checkout, equipment_id, current_user.id, checkout.due_date, checkout.notes
+        )
+    except CheckoutConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    if not result:
+        raise HTTPException(status_code=404, detail="Equipment not found")
+    return result
+
+async def _can_check_in(
+    db: AsyncSession, owner_id: Optional[str], team_id: Optional[int], borrower_id: int, current_user: UserSnapshot
+) -> bool:
+    """The borrower, the item's owner, site admins and the owners and admins of its team may check it in."""
+    if current_user.is_admin or borrower_id == current_user.id or owner_id == current_user.auth0_id:
+        return True
+    return team_id is not None and await db.run_sync(lambda session: TeamService.check_user_team_permission(
+        current_user.id, team_id, ["owner", "admin"], session
+    ))
+
+@router.post("/{equipment_id}/checkin", response_model=CheckoutResponse)
+async def checkin_equipment(
+    equipment_id: int,
+    checkin: Optional[CheckinCreate] = None,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Check a checked-out item back in and make it available again. The borrower, the item's owner or team owners and admins only."""
+    row = (await db.execute(
+        select(Equipment.owner_id, Equipment.team_id, EquipmentCheckout.id, EquipmentCheckout.user_id)
+        .outerjoin(EquipmentCheckout, (EquipmentCheckout.equipment_id == Equipment.id) & (EquipmentCheckout.is_active == True))
+        .where(Equipment.id == equipment_id)
+    )).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Equipment not found")
+    owner_id, team_id, checkout_id, borrower_id = row
+    if checkout_id is not None and not await _can_check_in(db, owner_id, team_id, borrower_id, current_user):
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    
+    try:
+        # Only the checkout checked above: if it was closed meanwhile, this is a 409, not someone else's checkout
+        result = await db.run_sync(
+            EquipmentCheckoutService.checkin, equipment_id, checkin.notes if checkin else None,
+            EquipmentCheckout.id == checkout_id,
+        )
+    except CheckoutConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    if not result:
+        raise HTTPException(status_code=404, detail="Equipment not found")
+    return result
+
+@router.post("/{equipment_id}/reservations", response_model=ReservationResponse)
+async def reserve_equipment(
+    equipment_id: int,
+    reservation: ReservationCreate,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Book an item for [starts_at, ends_at); 409 if it is reserved or checked out during that window"""
+    try:
+        result = await db.run_sync(
+            EquipmentReservationService.reserve, equipment_id, current_user.id,
+            reservation.starts_at, reservation.ends_at, reservation.notes
+        )
+    except ReservationConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    if not result:
+        raise HTTPException(status_code=404, detail="Equipment not found")
+    return result
+
+@router.get("/{equipment_id}/reservations", response_model=List[ReservationResponse])
+async def get_equipment_reservations(
+    equipment_id: int,
+    starts_at: Optional[datetime] = Query(None, alias="from", description="Defaults to now"),
+    ends_at: Optional[datetime] = Query(None, alias="to", description=f"Defaults to {MAX_RESERVATION.days} days after 'from'"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """An item's reservations overlapping [from, to), in start order"""
+    starts_at = utc_naive(starts_at) if starts_at else datetime.utcnow()
+    ends_at = utc_naive(ends_at) if ends_at else starts_at + MAX_RESERVATION
+    if ends_at <= starts_at:
+        raise HTTPException(status_code=400, detail="'to' must be after 'from'")
+    
+    return await db.run_sync(EquipmentReservationService.in_window, equipment_id, starts_at, ends_at)
+
+@router.delete("/{equipment_id}/reservations/{reservation_id}")
+async def cancel_equipment_reservation(
+    equipment_id: int,
+    reservation_id: int,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Cancel a reservation; only whoever made it (or an admin) can"""
+    user_id = None if current_user.is_admin else current_user.id
+    cancelled = await db.run_sync(EquipmentReservationService.cancel, equipment_id, reservation_id, user_id)
+    if not cancelled:
+        raise HTTPException(status_code=404, detail="Reservation not found")
+    return {"message": "Reservation cancelled successfully"}
+
 @router.get("/categories/list")
-def get_equipment_categories(db: Session = Depends(get_db)):
-    """Get list of all equipment categories"""
-    categories = db.query(Equipment.category).distinct().all()
-    return {"categories": [cat[0] for cat in categories if cat[0]]}
+async def get_equipment_categories(
+    owner_id: Optional[str] = None,
+    team_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get list of equipment categories, optionally for one owner or team (cached)"""
+    return {"categories": await db.run_sync(EquipmentLookupService.categories, owner_id=owner_id, team_id=team_id)}
 
 @router.get("/stats/summary")
-def get_equipment_stats(owner_id: Optional[str] = None, db: Session = Depends(get_db)):
-    """Get equipment statistics, optionally filtered by owner"""
-    query = db.query(Equipment)
-    
-    if owner_id:
-        query = query.filter(Equipment.owner_id == owner_id)
-    
-    total_items = query.count()
-    available_items = query.filter(Equipment.is_available == True).count()
-    in_use_items = total_items - available_items
-    categories = query.with_entities(Equipment.category).distinct().count()
-    
-    return {
-        "total_items": total_items,
-        "available_items": available_items,
-        "in_use_items": in_use_items,
-        "categories": categories
-    }
+async def get_equipment_stats(
+    owner_id: Optional[str] = None,
+    team_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get equipment statistics, optionally filtered by owner or team"""
+    return await db.run_sync(EquipmentCounterService.get_stats, owner_id=owner_id, team_id=team_id)
@@ -0,0 +1,175 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import List, Optional
+
+from app.models.base import get_async_db
+from app.models.checkout import EquipmentCheckout
+from app.models.kit import Kit
+from app.schemas.checkout import CheckinCreate, CheckoutCreate, CheckoutResponse
+from app.schemas.kit import KitCreate, KitResponse, KitUpdate
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.services.auth_service import UserSnapshot
+from app.services.equipment_checkout import EquipmentCheckoutService, KitCheckoutConflict
+from app.services.equipment_writes import CheckoutConflict
+from app.services.kits import KitService, UnknownEquipment
+from app.services.team_service import TeamService
+from app.utils.pagination import KeysetSort, paginate_async
+from app.utils.responses import wire_response
+
+router = APIRouter()
+
+KIT_SORT = KeysetSort("id", Kit.id, Kit.id)
+
+
+async def _can_manage(db: AsyncSession, kit: Kit, current_user: UserSnapshot) -> bool:
+    """The kit's creator, site admins and the owners and admins of its team may change it."""
+    if current_user.is_admin or kit.created_by_user_id == current_user.id:
+        return True
+    return kit.team_id is not None and await db.run_sync(lambda session: TeamService.check_user_team_permission(
+        current_user.id, kit.team_id, ["owner", "admin"], session
+    ))
+
+
+async def _require_kit(db: AsyncSession, kit_id: int, current_user: UserSnapshot) -> None:
+    kit = await db.run_sync(KitService.get, kit_id)
+    if not kit:
+        raise HTTPException(status_code=404, detail="Kit not found")
+    if not await _can_manage(db, kit, current_user):
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+
+
+@router.post("/", response_model=KitResponse)
+async def create_kit(
+    kit: KitCreate,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create a kit; team kits can be created by any member of the team"""
+    if kit.team_id is not None and not await db.run_sync(lambda session: TeamService.check_user_team_permission(
+        current_user.id, kit.team_id, ["owner", "admin", "member"], session
+    )):
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    try:
+        return await db.run_sync(KitService.create, kit, current_user.id)
+    except UnknownEquipment as e:
+        raise HTTPException(status_code=400, detail={"message": str(e), "equipment_ids": e.equipment_ids})
+
+
+@router.get("/", response_model=List[KitResponse])
+async def get_kits(
+    response: Response,
+    team_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGINATION_DEFAULT_LIMIT, ge=1, le=settings.PAGINATION_MAX_LIMIT),
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get kits one keyset page at a time, optionally for one team"""
+    statement = select(Kit).options(selectinload(Kit.equipment))
+    if team_id is not None:
+        statement = statement.where(Kit.team_id == team_id)
+    kits = await paginate_async(db, statement, KIT_SORT, cursor, limit, response)
+    return wire_response(KitResponse, kits, accept, response)
+
+
+@router.get("/{kit_id}", response_model=KitResponse)
+async def get_kit(kit_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Get a kit with its equipment ids"""
+    kit = await db.run_sync(KitService.get, kit_id)
+    if not kit:
+        raise HTTPException(status_code=404, detail="Kit not found")
+    return kit
+
+
+@router.put("/{kit_id}", response_model=KitResponse)
+async def update_kit(
+    kit_id: int,
+    kit_update: KitUpdate,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Rename a kit or replace its items"""
+    await _require_kit(db, kit_id, current_user)
+    try:
+        kit = await db.run_sync(KitService.update, kit_id, kit_update)
+    except UnknownEquipment as e:
+        raise HTTPException(status_code=400, detail={"message": str(e), "equipment_ids": e.equipment_ids})
+    if not kit:
+        raise HTTPException(status_code=404, detail="Kit not found")
+    return kit
+
+
+@router.delete("/{kit_id}")
+async def delete_kit(
+    kit_id: int,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Delete a kit; its equipment stays"""
+    await _require_kit(db, kit_id, current_user)
+    try:
+        deleted = await db.run_sync(KitService.delete, kit_id)
+    except CheckoutConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Kit not found")
+    return {"message": "Kit deleted successfully"}
+
+
+@router.post("/{kit_id}/checkout", response_model=List[CheckoutResponse])
+async def checkout_kit(
+    kit_id: int,
+    checkout: Optional[CheckoutCreate] = None,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Check out every item of a kit in one transaction; 409 listing the unavailable items if any is taken"""
+    checkout = checkout or CheckoutCreate()
+    try:
+        result = await db.run_sync(
+            EquipmentCheckoutService.checkout_kit, kit_id, current_user.id, checkout.due_date, checkout.notes
+        )
+    except KitCheckoutConflict as e:
+        raise HTTPException(status_code=409, detail={"message": str(e), "equipment_ids": e.equipment_ids})
+    except CheckoutConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    if result is None:
+        raise HTTPException(status_code=404, detail="Kit not found")
+    return result
+
+
+@router.post("/{kit_id}/checkin", response_model=List[CheckoutResponse])
+async def checkin_kit(
+    kit_id: int,
+    checkin: Optional[CheckinCreate] = None,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Check in everything still out from the kit's checkout. The borrower or whoever may change the kit only."""
+    kit = await db.run_sync(KitService.get, kit_id)
+    if not kit:
+        raise HTTPException(status_code=404, detail="Kit not found")
+    criteria = []
+    if not await _can_manage(db, kit, current_user):
+        # Borrowers bring back their own checkouts
+        criteria.append(EquipmentCheckout.user_id == current_user.id)
+        borrowed = await db.scalar(select(EquipmentCheckout.id).where(
+            EquipmentCheckout.kit_id == kit_id, EquipmentCheckout.is_active == True, *criteria
+        ).limit(1))
+        if borrowed is None:
+            raise HTTPException(status_code=403, detail="Insufficient permissions")
+    
+    try:
+        result = await db.run_sync(
+            EquipmentCheckoutService.checkin_kit, kit_id, checkin.notes if checkin else None, *criteria
+        )
+    except CheckoutConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    if result is None:
+        raise HTTPException(status_code=404, detail="Kit not found")
+    return result
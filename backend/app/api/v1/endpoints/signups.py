@@ -1,14 +1,21 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional
 
 from app.schemas.signup import EmailSignupCreate, EmailSignupResponse
 from app.models.signup import EmailSignup
 from app.models.base import get_db
+from app.core.config import settings
+from app.utils.export import export_response
+from app.utils.pagination import KeysetSort, paginate
+from app.utils.responses import wire_response
 
 router = APIRouter()
 
+SIGNUP_SORT = KeysetSort("id", EmailSignup.id, EmailSignup.id)
+
 @router.post("/", response_model=EmailSignupResponse)
 def create_email_signup(
     signup: EmailSignupCreate,
@@ -34,13 +41,26 @@ def create_email_signup(
 
 @router.get("/", response_model=List[EmailSignupResponse])
 def get_email_signups(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGINATION_DEFAULT_LIMIT, ge=1, le=settings.PAGINATION_MAX_LIMIT),
+    accept: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Get email signups one keyset page at a time (admin endpoint)"""
+    signups = paginate(db.query(EmailSignup), SIGNUP_SORT, cursor, limit, response)
+    return wire_response(EmailSignupResponse, signups, accept, response)
+
+@router.get("/export")
+def export_email_signups(
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    gzip: bool = False,
     db: Session = Depends(get_db)
 ):
-    """Get all email signups (admin endpoint)"""
-    signups = db.query(EmailSignup).offset(skip).limit(limit).all()
-    return signups
+    """Stream every signup as NDJSON or CSV, optionally gzipped (admin endpoint)"""
+    table = EmailSignup.__table__
+    statement = select(*(table.c[name] for name in EmailSignupResponse.model_fields)).order_by(table.c.id)
+    return export_response(db.get_bind(), statement, "signups", fmt, gzip)
 
 @router.get("/count")
 def get_signup_count(db: Session = Depends(get_db)):
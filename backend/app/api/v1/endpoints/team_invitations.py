@@ -1,32 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from datetime import datetime, timedelta
 import secrets
 
 from app.models.team import Team, TeamInvitation, TeamMembership
 from app.schemas.team import (
     TeamInvitation as TeamInvitationSchema,
+    TeamInvitationBulkCreate,
+    TeamInvitationBulkResult,
     TeamInvitationCreate,
     TeamInvitationUpdate,
     TeamRole,
     SubscriptionType
 )
-from app.models.base import get_db
+from app.models.base import get_async_db
+from app.services.auth_service import UserSnapshot
+from app.services.team_invitations import TeamInvitationService
+from app.services.team_service import TeamService
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.utils.pagination import KeysetSort, paginate_async
+from app.utils.responses import wire_response
 
 router = APIRouter()
 
+INVITATION_SORT = KeysetSort("id", TeamInvitation.id, TeamInvitation.id)
+
 # Create a team invitation
 @router.post("/teams/{team_id}/invitations", response_model=TeamInvitationSchema)
 async def create_team_invitation(
     team_id: int,
     invitation: TeamInvitationCreate,
-    current_user_id: str,  # In a real app, this would come from auth
-    current_user_name: str = None,  # In a real app, this would come from auth
-    db: Session = Depends(get_db)
+    current_user_id: int,  # users.id; in a real app, this would come from auth
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Check if team exists
-    team = db.query(Team).filter(Team.id == team_id).first()
+    team = await db.get(Team, team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     
@@ -38,10 +49,10 @@ async def create_team_invitation(
         )
     
     # Check if user is already a member
-    existing_membership = db.query(TeamMembership).filter(
+    existing_membership = await db.scalar(select(TeamMembership).where(
         TeamMembership.team_id == team_id,
         TeamMembership.user_id == current_user_id
-    ).first()
+    ))
     
     if not existing_membership or existing_membership.role not in [TeamRole.OWNER, TeamRole.ADMIN]:
         raise HTTPException(
@@ -50,12 +61,12 @@ async def create_team_invitation(
         )
     
     # Check if there's already a pending invitation for this email
-    existing_invitation = db.query(TeamInvitation).filter(
+    existing_invitation = await db.scalar(select(TeamInvitation).where(
         TeamInvitation.team_id == team_id,
         TeamInvitation.email == invitation.email,
         TeamInvitation.is_accepted == False,
         TeamInvitation.expires_at > datetime.utcnow()
-    ).first()
+    ))
     
     if existing_invitation:
         raise HTTPException(
@@ -74,34 +85,79 @@ async def create_team_invitation(
         role=invitation.role,
         token=token,
         expires_at=expires_at,
-        invited_by_user_id=current_user_id,
-        invited_by_name=current_user_name
+        invited_by_user_id=current_user_id
     )
     
     db.add(db_invitation)
-    db.commit()
-    db.refresh(db_invitation)
+    await db.commit()
+    await db.refresh(db_invitation)
     return db_invitation
 
+# Invite many emails at once
+@router.post("/teams/{team_id}/invitations/bulk", response_model=List[TeamInvitationBulkResult])
+async def create_team_invitations_bulk(
+    team_id: int,
+    invitations: TeamInvitationBulkCreate,
+    response: Response,
+    accept: Optional[str] = Header(None),
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Invite every listed email in one transaction. Emails that are already
+    members, already have a pending invitation or repeat an earlier entry
+    are skipped and reported with their status, in request order.
+    """
+    team = await db.get(Team, team_id)
+    if not team:
+        raise HTTPException(status_code=404, detail="Team not found")
+    
+    if team.subscription_type != SubscriptionType.PAID:
+        raise HTTPException(
+            status_code=403,
+            detail="Team invitations require a paid subscription"
+        )
+    
+    if not await db.run_sync(lambda session: TeamService.check_user_team_permission(
+        current_user.id, team_id, [TeamRole.OWNER, TeamRole.ADMIN], session
+    )):
+        raise HTTPException(
+            status_code=403,
+            detail="Only team owners and admins can send invitations"
+        )
+    
+    results = await db.run_sync(
+        TeamInvitationService.invite_many, team_id, invitations.emails, invitations.role.value, current_user.id
+    )
+    return wire_response(TeamInvitationBulkResult, results, accept, response)
+
 # Get all invitations for a team
 @router.get("/teams/{team_id}/invitations", response_model=List[TeamInvitationSchema])
-async def get_team_invitations(team_id: int, db: Session = Depends(get_db)):
+async def get_team_invitations(
+    team_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGINATION_DEFAULT_LIMIT, ge=1, le=settings.PAGINATION_MAX_LIMIT),
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
     # Check if team exists
-    team = db.query(Team).filter(Team.id == team_id).first()
+    team = await db.get(Team, team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     
-    invitations = db.query(TeamInvitation).filter(
+    invitations = select(TeamInvitation).where(
         TeamInvitation.team_id == team_id
-    ).all()
-    return invitations
+    )
+    invitations = await paginate_async(db, invitations, INVITATION_SORT, cursor, limit, response)
+    return wire_response(TeamInvitationSchema, invitations, accept, response)
 
 # Get invitation by token
 @router.get("/invitations/{token}", response_model=TeamInvitationSchema)
-async def get_invitation_by_token(token: str, db: Session = Depends(get_db)):
-    invitation = db.query(TeamInvitation).filter(
+async def get_invitation_by_token(token: str, db: AsyncSession = Depends(get_async_db)):
+    invitation = await db.scalar(select(TeamInvitation).where(
         TeamInvitation.token == token
-    ).first()
+    ))
     
     if not invitation:
         raise HTTPException(status_code=404, detail="Invitation not found")
@@ -118,14 +174,12 @@ async def get_invitation_by_token(token: str, db: Session = Depends(get_db)):
 @router.post("/invitations/{token}/accept")
 async def accept_team_invitation(
     token: str,
-    accepting_user_id: str,  # In a real app, this would come from auth
-    accepting_user_name: str = None,  # In a real app, this would come from auth
-    accepting_user_email: str = None,  # In a real app, this would come from auth
-    db: Session = Depends(get_db)
+    accepting_user_id: int,  # users.id; in a real app, this would come from auth
+    db: AsyncSession = Depends(get_async_db)
 ):
-    invitation = db.query(TeamInvitation).filter(
+    invitation = await db.scalar(select(TeamInvitation).where(
         TeamInvitation.token == token
-    ).first()
+    ))
     
     if not invitation:
         raise HTTPException(status_code=404, detail="Invitation not found")
@@ -137,10 +191,10 @@ async def accept_team_invitation(
         raise HTTPException(status_code=400, detail="Invitation has already been accepted")
     
     # Check if user is already a member
-    existing_membership = db.query(TeamMembership).filter(
+    existing_membership = await db.scalar(select(TeamMembership).where(
         TeamMembership.team_id == invitation.team_id,
         TeamMembership.user_id == accepting_user_id
-    ).first()
+    ))
     
     if existing_membership:
         raise HTTPException(status_code=400, detail="User is already a member of this team")
@@ -149,9 +203,7 @@ async def accept_team_invitation(
     membership = TeamMembership(
         team_id=invitation.team_id,
         user_id=accepting_user_id,
-        role=invitation.role,
-        user_name=accepting_user_name,
-        user_email=accepting_user_email
+        role=invitation.role
     )
     
     # Mark invitation as accepted
@@ -159,16 +211,14 @@ async def accept_team_invitation(
     invitation.accepted_at = datetime.utcnow()
     
     db.add(membership)
-    db.commit()
+    await db.commit()
     
     return {"message": "Invitation accepted successfully"}
 
 # Cancel/delete an invitation
 @router.delete("/invitations/{invitation_id}")
-async def cancel_invitation(invitation_id: int, db: Session = Depends(get_db)):
-    invitation = db.query(TeamInvitation).filter(
-        TeamInvitation.id == invitation_id
-    ).first()
+async def cancel_invitation(invitation_id: int, db: AsyncSession = Depends(get_async_db)):
+    invitation = await db.get(TeamInvitation, invitation_id)
     
     if not invitation:
         raise HTTPException(status_code=404, detail="Invitation not found")
@@ -176,8 +226,8 @@ async def cancel_invitation(invitation_id: int, db: Session = Depends(get_db)):
     if invitation.is_accepted:
         raise HTTPException(status_code=400, detail="Cannot cancel an accepted invitation")
     
-    db.delete(invitation)
-    db.commit()
+    await db.delete(invitation)
+    await db.commit()
     return {"message": "Invitation cancelled successfully"}
 
 # Update an invitation (e.g., change role)
@@ -185,11 +235,16 @@ async def cancel_invitation(invitation_id: int, db: Session = Depends(get_db)):
 async def update_invitation(
     invitation_id: int,
     invitation_update: TeamInvitationUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    invitation = db.query(TeamInvitation).filter(
-        TeamInvitation.id == invitation_id
-    ).first()
+    updated = await db.run_sync(lambda session: TeamService.update_invitation(
+        invitation_id, invitation_update.dict(exclude_unset=True), session
+    ))
+    if updated:
+        return updated
+    
+    # Nothing matched; find out why
+    invitation = await db.get(TeamInvitation, invitation_id)
     
     if not invitation:
         raise HTTPException(status_code=404, detail="Invitation not found")
@@ -197,13 +252,4 @@ async def update_invitation(
     if invitation.is_accepted:
         raise HTTPException(status_code=400, detail="Cannot update an accepted invitation")
     
-    if invitation.expires_at < datetime.utcnow():
-        raise HTTPException(status_code=400, detail="Cannot update an expired invitation")
-    
-    # Update the invitation
-    for key, value in invitation_update.dict(exclude_unset=True).items():
-        setattr(invitation, key, value)
-    
-    db.commit()
-    db.refresh(invitation)
-    return invitation
+    raise HTTPException(status_code=400, detail="Cannot update an expired invitation")
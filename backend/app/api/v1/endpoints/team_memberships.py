@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from typing import List, Optional
 
 from app.models.team import Team, TeamMembership
 from app.schemas.team import (
@@ -9,27 +11,33 @@ from app.schemas.team import (
     TeamMembershipUpdate,
     TeamRole
 )
-from app.models.base import get_db
+from app.models.base import get_async_db
+from app.services.team_service import TeamService
+from app.core.config import settings
+from app.utils.pagination import KeysetSort, paginate_async
+from app.utils.responses import wire_response
 
 router = APIRouter()
 
+MEMBERSHIP_SORT = KeysetSort("id", TeamMembership.id, TeamMembership.id)
+
 # Add a member to a team
 @router.post("/teams/{team_id}/members", response_model=TeamMembershipSchema)
 async def add_team_member(
     team_id: int,
     member: TeamMembershipCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Check if team exists
-    team = db.query(Team).filter(Team.id == team_id).first()
+    team = await db.get(Team, team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     
     # Check if user is already a member
-    existing_membership = db.query(TeamMembership).filter(
+    existing_membership = await db.scalar(select(TeamMembership).where(
         TeamMembership.team_id == team_id,
         TeamMembership.user_id == member.user_id
-    ).first()
+    ))
     
     if existing_membership:
         raise HTTPException(status_code=400, detail="User is already a member of this team")
@@ -38,79 +46,74 @@ async def add_team_member(
     db_membership = TeamMembership(
         team_id=team_id,
         user_id=member.user_id,
-        role=member.role,
-        user_name=member.user_name,
-        user_email=member.user_email
+        role=member.role
     )
     db.add(db_membership)
-    db.commit()
-    db.refresh(db_membership)
+    await db.commit()
+    await db.refresh(db_membership)
     return db_membership
 
 # Get all members of a team
 @router.get("/teams/{team_id}/members", response_model=List[TeamMembershipSchema])
-async def get_team_members(team_id: int, db: Session = Depends(get_db)):
+async def get_team_members(
+    team_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGINATION_DEFAULT_LIMIT, ge=1, le=settings.PAGINATION_MAX_LIMIT),
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
     # Check if team exists
-    team = db.query(Team).filter(Team.id == team_id).first()
+    team = await db.get(Team, team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     
-    members = db.query(TeamMembership).filter(TeamMembership.team_id == team_id).all()
-    return members
+    members = select(TeamMembership).where(TeamMembership.team_id == team_id)
+    members = await paginate_async(db, members, MEMBERSHIP_SORT, cursor, limit, response)
+    return wire_response(TeamMembershipSchema, members, accept, response)
 
 # Update a team member's role
 @router.put("/teams/{team_id}/members/{user_id}", response_model=TeamMembershipSchema)
 async def update_team_member(
     team_id: int,
-    user_id: str,
+    user_id: int,
     member_update: TeamMembershipUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    # Check if team exists
-    team = db.query(Team).filter(Team.id == team_id).first()
-    if not team:
-        raise HTTPException(status_code=404, detail="Team not found")
+    membership = await db.run_sync(lambda session: TeamService.update_membership(
+        team_id, user_id, member_update.dict(exclude_unset=True), session
+    ))
+    if membership:
+        return membership
     
-    # Find the membership
-    membership = db.query(TeamMembership).filter(
-        TeamMembership.team_id == team_id,
-        TeamMembership.user_id == user_id
-    ).first()
-    
-    if not membership:
-        raise HTTPException(status_code=404, detail="Member not found in team")
-    
-    # Update the membership
-    for key, value in member_update.dict(exclude_unset=True).items():
-        setattr(membership, key, value)
-    
-    db.commit()
-    db.refresh(membership)
-    return membership
+    # Nothing matched; find out why
+    if not await db.get(Team, team_id):
+        raise HTTPException(status_code=404, detail="Team not found")
+    raise HTTPException(status_code=404, detail="Member not found in team")
 
 # Remove a member from a team
 @router.delete("/teams/{team_id}/members/{user_id}")
-async def remove_team_member(team_id: int, user_id: str, db: Session = Depends(get_db)):
+async def remove_team_member(team_id: int, user_id: int, db: AsyncSession = Depends(get_async_db)):
     # Check if team exists
-    team = db.query(Team).filter(Team.id == team_id).first()
+    team = await db.get(Team, team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     
     # Find the membership
-    membership = db.query(TeamMembership).filter(
+    membership = await db.scalar(select(TeamMembership).where(
         TeamMembership.team_id == team_id,
         TeamMembership.user_id == user_id
-    ).first()
+    ))
     
     if not membership:
         raise HTTPException(status_code=404, detail="Member not found in team")
     
     # Don't allow removing the last owner
     if membership.role == TeamRole.OWNER:
-        owner_count = db.query(TeamMembership).filter(
+        owner_count = await db.scalar(select(func.count()).select_from(TeamMembership).where(
             TeamMembership.team_id == team_id,
             TeamMembership.role == TeamRole.OWNER
-        ).count()
+        ))
         
         if owner_count <= 1:
             raise HTTPException(
@@ -118,16 +121,19 @@ async def remove_team_member(team_id: int, user_id: str, db: Session = Depends(g
                 detail="Cannot remove the last owner from a team"
             )
     
-    db.delete(membership)
-    db.commit()
+    await db.delete(membership)
+    await db.commit()
     return {"message": "Member removed from team successfully"}
 
 # Get teams for a specific user
 @router.get("/users/{user_id}/teams", response_model=List[TeamMembershipSchema])
-async def get_user_teams(user_id: str, db: Session = Depends(get_db)):
-    memberships = db.query(TeamMembership).join(Team).filter(
-        TeamMembership.user_id == user_id
-    ).all()
+async def get_user_teams(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    memberships = await db.scalars(
+        select(TeamMembership)
+        .join(Team)
+        .where(TeamMembership.user_id == user_id)
+        .options(joinedload(TeamMembership.team))
+    )
     
     # Populate team name and description for each membership
     result = []
@@ -138,8 +144,6 @@ async def get_user_teams(user_id: str, db: Session = Depends(get_db)):
             "user_id": membership.user_id,
             "team_id": membership.team_id,
             "role": membership.role,
-            "user_name": membership.user_name,
-            "user_email": membership.user_email,
             "joined_at": membership.joined_at,
             "team_name": team.name if team else None,
             "team_description": team.description if team else None
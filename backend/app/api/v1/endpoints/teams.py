@@ -1,84 +1,180 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
-from typing import List
-
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import List, Optional
+
+from app.models.checkout import EquipmentCheckout, OverdueCheckout
+from app.models.equipment import Equipment
 from app.models.team import Team
-from app.models.user import User
+from app.schemas.checkout import OverdueCheckoutResponse
+from app.schemas.equipment import EquipmentResponse
 from app.schemas.team import (
-    Team as TeamSchema, TeamCreate, TeamUpdate, TeamWithMembers
+    Team as TeamSchema, TeamCreate, TeamDashboard, TeamUpdate, TeamWithMembers
 )
-from app.models.base import get_db
-from app.services.auth_service import AuthService
+from app.models.base import get_async_db
+from app.services.collection_versions import CollectionVersionService, equipment_scopes, team_scope
+from app.services.team_dashboard import TeamDashboardService
 from app.services.team_service import TeamService
+from app.services.versioned_writes import VersionConflict
+from app.api.deps import get_current_user
+from app.api.v1.endpoints.equipment import equipment_filters, equipment_page
 from app.core.config import settings
-import requests
+from app.utils.etag import not_modified_response, weak_etag
+from app.utils.pagination import KeysetSort, paginate_async
+from app.utils.responses import wire_response
+from app.services.auth_service import UserSnapshot
 
 router = APIRouter()
-security = HTTPBearer()
 
+TEAM_SORT = KeysetSort("id", Team.id, Team.id)
+OVERDUE_SORT = KeysetSort("due_date", OverdueCheckout.due_date, OverdueCheckout.checkout_id)
+
+# TeamWithMembers responses embed both collections; nothing can lazy-load on an AsyncSession
+WITH_MEMBERS = (selectinload(Team.members), selectinload(Team.invitations))
 
-async def get_current_user(token: str = Depends(security), db: Session = Depends(get_db)) -> User:
-    """
-    Dependency to get current user from token.
-    This could be moved to a separate dependencies file.
-    """
-    try:
-        auth0_user_info_url = f"https://{settings.AUTH0_DOMAIN}/userinfo"
-        user_info_response = requests.get(
-            auth0_user_info_url,
-            headers={"Authorization": f"Bearer {token.credentials}"}
-        )
-        
-        if user_info_response.status_code != 200:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        
-        user_info = user_info_response.json()
-        auth0_id = user_info.get('sub')
-        
-        # Get user from local database
-        current_user = AuthService.get_user_by_auth0_id(auth0_id, db)
-        if not current_user:
-            # Sync user if not exists
-            current_user = AuthService.sync_user_from_auth0(user_info, db)
-        
-        return current_user
-        
-    except requests.exceptions.RequestException:
-        raise HTTPException(status_code=500, detail="Failed to connect to Auth0")
-    except Exception:
-        raise HTTPException(status_code=500, detail="Authentication failed")
+
+async def require_member(db: AsyncSession, team_id: int, current_user: UserSnapshot) -> None:
+    """403 unless the user is in the team (or a site admin); 404 if the team does not exist."""
+    if current_user.is_admin or await db.run_sync(lambda session: TeamService.check_user_team_permission(
+        current_user.id, team_id, ["owner", "admin", "member"], session
+    )):
+        return
+    if not await db.run_sync(lambda session: TeamService.get_team_by_id(team_id, session)):
+        raise HTTPException(status_code=404, detail="Team not found")
+    raise HTTPException(status_code=403, detail="Insufficient permissions")
 
 
 # Create a new team
 @router.post("/", response_model=TeamSchema)
 async def create_team(
     team: TeamCreate, 
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new team. The creator becomes the team owner."""
     try:
-        return TeamService.create_team(team, current_user, db)
+        return await db.run_sync(lambda session: TeamService.create_team(team, current_user, session))
     except Exception as e:
         raise HTTPException(status_code=500, detail="Failed to create team")
 
 
 # Get all teams
 @router.get("/", response_model=List[TeamWithMembers])
-async def get_teams(db: Session = Depends(get_db)):
-    """Get all active teams."""
-    return TeamService.get_all_teams(db)
+async def get_teams(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGINATION_DEFAULT_LIMIT, ge=1, le=settings.PAGINATION_MAX_LIMIT),
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get active teams one keyset page at a time."""
+    statement = select(Team).where(Team.is_active == True).options(*WITH_MEMBERS)
+    teams = await paginate_async(db, statement, TEAM_SORT, cursor, limit, response)
+    return wire_response(TeamWithMembers, teams, accept, response)
 
 
 # Get a specific team by ID
 @router.get("/{team_id}", response_model=TeamWithMembers)
-async def get_team(team_id: int, db: Session = Depends(get_db)):
+async def get_team(
+    team_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get a specific team by ID."""
-    team = TeamService.get_team_by_id(team_id, db)
+    etag = weak_etag("team", team_id, await db.run_sync(CollectionVersionService.get_version, team_scope(team_id)))
+    not_modified = not_modified_response("teams.item", etag, if_none_match, accept, response)
+    if not_modified:
+        return not_modified
+    
+    team = await db.scalar(
+        select(Team).where(Team.id == team_id, Team.is_active == True).options(*WITH_MEMBERS)
+    )
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
-    return team
+    return wire_response(TeamWithMembers, team, accept, response)
+
+
+# Get a team's overdue checkouts
+@router.get("/{team_id}/overdue", response_model=List[OverdueCheckoutResponse])
+async def get_team_overdue_checkouts(
+    team_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGINATION_DEFAULT_LIMIT, ge=1, le=settings.PAGINATION_MAX_LIMIT),
+    accept: Optional[str] = Header(None),
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Overdue checkouts of the team's equipment, longest overdue first.
+    Members only: the rows name borrowers.
+
+    Served from the rows the overdue scanner flagged, so the cost follows
+    the page size rather than the number of checkouts; an item returned or
+    moved to another team since its last scan is left out.
+    """
+    await require_member(db, team_id, current_user)
+    
+    statement = (
+        select(
+            OverdueCheckout.checkout_id, OverdueCheckout.equipment_id, Equipment.name.label("equipment_name"),
+            OverdueCheckout.user_id, OverdueCheckout.due_date, OverdueCheckout.flagged_at,
+        )
+        .join(EquipmentCheckout, EquipmentCheckout.id == OverdueCheckout.checkout_id)
+        .join(Equipment, Equipment.id == OverdueCheckout.equipment_id)
+        .where(
+            OverdueCheckout.team_id == team_id,
+            EquipmentCheckout.is_active == True,
+            Equipment.team_id == team_id,
+        )
+    )
+    overdue = await paginate_async(db, statement, OVERDUE_SORT, cursor, limit, response, entities=False)
+    return wire_response(OverdueCheckoutResponse, overdue, accept, response)
+
+
+# Get a team's equipment
+@router.get("/{team_id}/equipment", response_model=List[EquipmentResponse])
+async def get_team_equipment(
+    team_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGINATION_DEFAULT_LIMIT, ge=1, le=settings.PAGINATION_MAX_LIMIT),
+    sort: str = Query("id", description="id, name, created_at or category; prefix with - for descending"),
+    category: Optional[str] = None,
+    available_only: bool = False,
+    owner_id: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated subset of fields to return, e.g. id,name,category,is_available"),
+    if_none_match: Optional[str] = Header(None),
+    accept: Optional[str] = Header(None),
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a team's equipment one keyset page at a time, with the equipment list's filters. Members only."""
+    await require_member(db, team_id, current_user)
+    
+    criteria = equipment_filters(category, available_only, owner_id, team_id)
+    return await equipment_page(
+        db, response, criteria, "teams.equipment", cursor, limit, sort, fields, if_none_match, accept,
+        scopes=tuple(equipment_scopes(None, team_id)),
+    )
+
+
+# Get a team's dashboard
+@router.get("/{team_id}/dashboard", response_model=TeamDashboard)
+async def get_team_dashboard(
+    team_id: int,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Members by role, pending invitations, equipment by category and condition and open checkouts, in one call. Members only."""
+    await require_member(db, team_id, current_user)
+    dashboard = await db.run_sync(TeamDashboardService.build, team_id)
+    if not dashboard:
+        raise HTTPException(status_code=404, detail="Team not found")
+    return dashboard
 
 
 # Update a team
@@ -86,17 +182,20 @@ async def get_team(team_id: int, db: Session = Depends(get_db)):
 async def update_team(
     team_id: int, 
     team_update: TeamUpdate, 
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a team. Only team owners and admins can update."""
     # Check permission
-    if not TeamService.check_user_team_permission(
-        current_user.id, team_id, ["owner", "admin"], db
-    ):
+    if not await db.run_sync(lambda session: TeamService.check_user_team_permission(
+        current_user.id, team_id, ["owner", "admin"], session
+    )):
         raise HTTPException(status_code=403, detail="Insufficient permissions")
     
-    team = TeamService.update_team(team_id, team_update, db)
+    try:
+        team = await db.run_sync(lambda session: TeamService.update_team(team_id, team_update, session))
+    except VersionConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     return team
@@ -106,11 +205,11 @@ async def update_team(
 @router.delete("/{team_id}")
 async def delete_team(
     team_id: int, 
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a team. Only team owners can delete."""
-    success = TeamService.delete_team(team_id, current_user, db)
+    success = await db.run_sync(lambda session: TeamService.delete_team(team_id, current_user, session))
     if not success:
         raise HTTPException(status_code=404, detail="Team not found or insufficient permissions")
     return {"message": "Team deleted successfully"}
@@ -120,12 +219,12 @@ async def delete_team(
 @router.get("/users/{user_id}/teams", response_model=List[TeamSchema])
 async def get_user_teams(
     user_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all teams a user is a member of."""
     # Users can only see their own teams unless they're admin
     if current_user.id != user_id and not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Insufficient permissions")
     
-    return TeamService.get_user_teams(user_id, db)
+    return await db.run_sync(lambda session: TeamService.get_user_teams(user_id, session))
@@ -0,0 +1,156 @@
+from collections import OrderedDict
+from functools import partial
+from typing import Any, Callable, Optional, Tuple
+import asyncio
+import json
+import threading
+import time
+
+import redis
+from sqlalchemy.util import await_only
+
+from app.core.config import settings
+
+
+def off_loop(fn: Callable, *args, **kwargs) -> Any:
+    """
+    Call blocking ``fn`` without stalling the event loop.
+
+    Lookups run inside ``run_sync`` and invalidations inside session commits,
+    which on the async engine is a greenlet on the event loop's thread. There
+    the call goes to the default executor and the greenlet waits for it, so
+    other requests keep running. Where no loop is running (sync sessions in
+    the threadpool, scripts) it is called in place.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return fn(*args, **kwargs)
+    return await_only(loop.run_in_executor(None, partial(fn, *args, **kwargs)))
+
+
+class MemoryCacheBackend:
+    """Per-process TTL/LRU store. Invalidations do not reach other workers."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+
+class RedisCacheBackend:
+    """
+    Shared store for multi-worker deployments.
+
+    Redis errors are logged and treated as misses, so an unreachable Redis
+    only costs the database query it was saving. Calls go through
+    ``off_loop``: a slow Redis holds up the request waiting on it, not
+    every request on the worker.
+    """
+
+    def __init__(self, client: "redis.Redis"):
+        self.client = client
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            value = off_loop(self.client.get, key)
+        except redis.RedisError as e:
+            print(f"Lookup cache read failed: {e}")
+            return None
+        return value.decode() if isinstance(value, bytes) else value
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        try:
+            off_loop(self.client.set, key, value, ex=ttl)
+        except redis.RedisError as e:
+            print(f"Lookup cache write failed: {e}")
+
+    def delete(self, *keys: str) -> None:
+        try:
+            off_loop(self.client.delete, *keys)
+        except redis.RedisError as e:
+            print(f"Lookup cache invalidation failed: {e}")
+
+
+class LookupCache:
+    """
+    Read-through cache for small, frequently read lookups (equipment
+    category lists) with explicit invalidation by key.
+
+    Values are stored as JSON. Writers invalidate after their transaction
+    commits; ``ttl`` bounds how long a value cached by a read that raced a
+    commit can stay stale.
+    """
+
+    def __init__(self, backend, ttl: int = 300, prefix: str = "kitlog:lookup:"):
+        self.backend = backend
+        self.ttl = ttl
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        cached = self.backend.get(self.prefix + key)
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+            return json.loads(cached)
+        with self._lock:
+            self.misses += 1
+        value = loader()
+        self.backend.set(self.prefix + key, json.dumps(value), self.ttl)
+        return value
+
+    def invalidate(self, *keys: str) -> None:
+        if not keys:
+            return
+        self.backend.delete(*(self.prefix + key for key in keys))
+        with self._lock:
+            self.invalidations += len(keys)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+def build_lookup_cache() -> LookupCache:
+    if settings.LOOKUP_CACHE_BACKEND == "redis":
+        backend = RedisCacheBackend(redis.Redis.from_url(settings.REDIS_URL, socket_timeout=0.5))
+    else:
+        backend = MemoryCacheBackend(max_entries=settings.LOOKUP_CACHE_MAX_ENTRIES)
+    return LookupCache(backend, ttl=settings.LOOKUP_CACHE_TTL)
+
+
+lookup_cache = build_lookup_cache()
@@ -22,9 +22,41 @@ class Settings(BaseSettings):
     # Database - will be overridden by Railway's DATABASE_URL
     DATABASE_URL: str = "sqlite:///./kitlog.db"
     
+    # Pagination (keyset cursors); endpoints reject limits above the max
+    PAGINATION_DEFAULT_LIMIT: int = 100
+    PAGINATION_MAX_LIMIT: int = 500
+    
+    # Equipment stats served from counter rows kept up to date on every write;
+    # after turning this back on, rebuild them via POST /admin/equipment-counters/rebuild
+    EQUIPMENT_COUNTERS_ENABLED: bool = True
+    
+    # Bulk equipment endpoints: rows per request, rows per transaction
+    BULK_MAX_ITEMS: int = 5000
+    BULK_CHUNK_SIZE: int = 500
+    
+    # Streaming exports: rows fetched and encoded per batch
+    EXPORT_BATCH_SIZE: int = 1000
+    
+    # Items per kit: a kit checkout claims them all in one transaction
+    KIT_MAX_ITEMS: int = 200
+    
+    # Emails per POST /teams/{id}/invitations/bulk, all inserted in one transaction
+    INVITATION_BULK_MAX: int = 1000
+    
+    # Overdue-checkout scanner, run by every app process from its lifespan
+    OVERDUE_SCAN_ENABLED: bool = True
+    OVERDUE_SCAN_INTERVAL: int = 60  # Seconds between runs
+    OVERDUE_SCAN_OVERLAP: int = 300  # Seconds each run re-reads before the watermark, for late commits
+    
     # Redis
     REDIS_URL: str = "redis://localhost:6379"
     
+    # Lookup cache (category lists etc.): "memory" is per process, so use
+    # "redis" when running several workers
+    LOOKUP_CACHE_BACKEND: str = "memory"
+    LOOKUP_CACHE_TTL: int = 300  # Seconds; bounds staleness if an invalidation is lost
+    LOOKUP_CACHE_MAX_ENTRIES: int = 10000  # Memory backend only
+    
     # JWT
     SECRET_KEY: str = "your-secret-key-here-change-in-production"
     ALGORITHM: str = "HS256"
@@ -34,6 +66,26 @@ class Settings(BaseSettings):
     AUTH0_DOMAIN: str = "dev-your-domain.us.auth0.com"  # Will be overridden by env var
     AUTH0_CLIENT_ID: str = "your-client-id"  # Will be overridden by env var
     AUTH0_CLIENT_SECRET: str = "your-client-secret"  # Will be overridden by env var
+    AUTH0_AUDIENCE: Optional[str] = None  # API identifier; access tokens for it are verified locally, unset sends every token to /userinfo
+    AUTH0_JWKS_CACHE_TTL: int = 3600  # Seconds before the cached JWKS is refetched
+    AUTH0_JWKS_MIN_REFRESH_INTERVAL: int = 30  # Seconds between refetches triggered by an unknown kid
+    
+    # Outbound HTTP to Auth0 (shared async client)
+    AUTH0_HTTP_CONNECT_TIMEOUT: float = 2.0  # Seconds
+    AUTH0_HTTP_READ_TIMEOUT: float = 5.0  # Seconds
+    AUTH0_HTTP_MAX_CONCURRENCY: int = 20  # In-flight requests (and pooled connections) per worker
+    
+    # Identity cache (token digest -> resolved user)
+    IDENTITY_CACHE_TTL: int = 300  # Seconds; never outlives the token's own exp
+    IDENTITY_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Membership index (user -> team roles) for permission checks, per worker
+    MEMBERSHIP_CACHE_TTL: int = 60  # Seconds; bounds how long other workers see a changed role
+    MEMBERSHIP_CACHE_MAX_USERS: int = 10000
+    
+    # Login sync: skip unchanged profile writes, record last_login at this granularity
+    LOGIN_SYNC_COALESCE: bool = True
+    LAST_LOGIN_GRANULARITY_MINUTES: int = 15
     
     # Environment
     ENVIRONMENT: str = "development"
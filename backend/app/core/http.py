@@ -0,0 +1,73 @@
+import asyncio
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class Auth0HttpClient:
+    """
+    App-lifetime pooled ``httpx.AsyncClient`` for calls to Auth0.
+
+    Requests never block the event loop, are bounded by strict connect/read
+    timeouts, and at most ``max_concurrency`` are in flight per worker (extra
+    callers queue on a semaphore instead of opening more sockets).
+    HTTP/2 is negotiated when the ``h2`` package is installed.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = 2.0,
+        read_timeout: float = 5.0,
+        max_concurrency: int = 20,
+    ):
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout, pool=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_concurrency,
+            max_keepalive_connections=max_concurrency,
+            keepalive_expiry=60,
+        )
+        self.max_concurrency = max_concurrency
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        # Pooled connections belong to the loop that opened them; rebuild the
+        # client if we are now running on a different one (e.g. in tests)
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=HTTP2_AVAILABLE,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._client
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        client = self._ensure_client()
+        async with self._semaphore:
+            return await client.get(url, **kwargs)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._semaphore = None
+            self._loop = None
+
+
+auth0_http = Auth0HttpClient(
+    connect_timeout=settings.AUTH0_HTTP_CONNECT_TIMEOUT,
+    read_timeout=settings.AUTH0_HTTP_READ_TIMEOUT,
+    max_concurrency=settings.AUTH0_HTTP_MAX_CONCURRENCY,
+)
@@ -1,12 +1,43 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL)
+# DATABASE_URL may name either driver; each engine gets the one it needs
+SYNC_DRIVERS = {"sqlite": "pysqlite", "postgresql": "psycopg2"}
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def _with_driver(url: str, drivers: dict) -> str:
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend in drivers:
+        url = url.set(drivername=f"{backend}+{drivers[backend]}")
+    return url.render_as_string(hide_password=False)
+
+
+def sync_database_url(url: str = settings.DATABASE_URL) -> str:
+    """``url`` with a blocking driver, for Alembic, scripts and the sync session."""
+    return _with_driver(url, SYNC_DRIVERS)
+
+
+def async_database_url(url: str = settings.DATABASE_URL) -> str:
+    """``url`` with an asyncio driver (aiosqlite / asyncpg)."""
+    return _with_driver(url, ASYNC_DRIVERS)
+
+
+engine = create_engine(sync_database_url())
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Ported endpoints run their queries on the event loop instead of holding a
+# threadpool slot per request. Objects stay loaded after commit so responses
+# can be serialized without another (lazy, and thus impossible) round trip.
+async_engine = create_async_engine(async_database_url())
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 # Dependency to get database session
@@ -16,3 +47,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency to get an async database session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
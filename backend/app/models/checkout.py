@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Index, text, true
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.models.base import Base
@@ -9,10 +9,10 @@ class EquipmentCheckout(Base):
     id = Column(Integer, primary_key=True, index=True)
     
     # Equipment being checked out
-    equipment_id = Column(Integer, ForeignKey("equipment.id"), nullable=False)
+    equipment_id = Column(Integer, ForeignKey("equipment.id", ondelete="CASCADE"), nullable=False, index=True)
     
     # User who checked out the equipment
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     
     # Checkout details
     checked_out_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -23,14 +23,63 @@ class EquipmentCheckout(Base):
     checkin_notes = Column(Text, nullable=True)
     
     # Status tracking
-    is_active = Column(Boolean, default=True)  # False when checked back in
+    is_active = Column(Boolean, nullable=False, default=True, server_default=true())  # False when checked back in
     
     # Due date (optional)
     due_date = Column(DateTime(timezone=True), nullable=True)
+
+    # Kit this item was checked out with, if any. Not a foreign key: the
+    # history outlives the kit.
+    kit_id = Column(Integer, nullable=True)
     
     # Relationships
     equipment = relationship("Equipment", back_populates="checkouts")
     user = relationship("User", back_populates="checkouts")
+
+    # At most one active checkout per item (alembic revision 011): the database
+    # has the last word when two people grab the same camera at once
+    __table_args__ = (
+        Index(
+            "ux_equipment_checkouts_active_equipment", "equipment_id", unique=True,
+            sqlite_where=text("is_active = 1"), postgresql_where=text("is_active"),
+        ),
+        # The overdue scanner's range scan over open checkouts (alembic revision 012)
+        Index(
+            "ix_equipment_checkouts_active_due_date", "due_date",
+            sqlite_where=text("is_active = 1"), postgresql_where=text("is_active"),
+        ),
+        # Checking a kit back in (alembic revision 014)
+        Index(
+            "ix_equipment_checkouts_active_kit", "kit_id",
+            sqlite_where=text("is_active = 1"), postgresql_where=text("is_active"),
+        ),
+    )
     
     def __repr__(self):
         return f"<EquipmentCheckout {self.equipment_id} by {self.user_id}>"
+
+
+class OverdueCheckout(Base):
+    """
+    A checkout the overdue scanner found past its due date.
+
+    Written in batches by app/services/overdue_scanner.py and read per team,
+    so listing a team's overdue items never touches the checkouts table
+    beyond the rows returned. Rows for checkouts that were checked in since
+    are purged on the next scan.
+    """
+    __tablename__ = "overdue_checkouts"
+
+    checkout_id = Column(Integer, ForeignKey("equipment_checkouts.id", ondelete="CASCADE"), primary_key=True)
+    equipment_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    team_id = Column(Integer, nullable=True)  # Equipment's team when flagged; None for personal items
+    due_date = Column(DateTime(timezone=True), nullable=False)
+    flagged_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_overdue_checkouts_team_due_date", "team_id", "due_date", "checkout_id"),
+    )
+
+    def __repr__(self):
+        return f"<OverdueCheckout {self.checkout_id} due {self.due_date}>"
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String
+from app.models.base import Base
+
+# Collections with version counters; see app/services/collection_versions.py
+EQUIPMENT = "equipment"
+TEAMS = "teams"
+
+
+class CollectionVersion(Base):
+    """
+    Version of one scope of a collection (e.g. "equipment:team:3"), bumped in
+    the same transaction as every write to a row in that scope; used for ETags.
+    """
+    __tablename__ = "collection_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
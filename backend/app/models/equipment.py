@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Index, DDL, event, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.models.base import Base
@@ -21,9 +21,101 @@ class Equipment(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # User or Team ownership - using String for owner_id to match Auth0 user IDs
-    owner_id = Column(String, nullable=True, index=True)
+    owner_id = Column(String, nullable=True)
     owner_name = Column(String, nullable=True)
-    team_id = Column(Integer, ForeignKey("teams.id"), nullable=True, index=True)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=True)
+
+    # Optimistic concurrency (alembic revision 010): every UPDATE bumps it, and
+    # ORM flushes fail with StaleDataError if the row changed since it was read
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     
     # Relationships
     team = relationship("Team", foreign_keys=[team_id])
+    # History rows go with the item (ON DELETE CASCADE); no need to load them first
+    checkouts = relationship("EquipmentCheckout", back_populates="equipment", passive_deletes=True)
+
+    __mapper_args__ = {"version_id_col": version}
+
+    # Shaped after the list/stats filters (alembic revision 007). The composites
+    # also serve owner_id-only and team_id-only lookups; the partial indexes
+    # keep available_only pages from walking unavailable rows.
+    __table_args__ = (
+        Index("ix_equipment_owner_category_available", "owner_id", "category", "is_available"),
+        Index("ix_equipment_team_available", "team_id", "is_available"),
+        # GET /teams/{id}/equipment with a category (alembic revision 015)
+        Index("ix_equipment_team_category_available", "team_id", "category", "is_available"),
+        # Keyset pagination for sort=created_at
+        Index("ix_equipment_created_at_id", "created_at", "id"),
+        Index(
+            "ix_equipment_available_id", "id",
+            sqlite_where=text("is_available = 1"), postgresql_where=text("is_available"),
+        ),
+        Index(
+            "ix_equipment_available_owner", "owner_id",
+            sqlite_where=text("is_available = 1"), postgresql_where=text("is_available"),
+        ),
+        Index(
+            "ix_equipment_available_category", "category",
+            sqlite_where=text("is_available = 1"), postgresql_where=text("is_available"),
+        ),
+    )
+
+
+# Full-text search index over the descriptive columns (alembic revision 006).
+# It is not mapped: the database keeps it in sync with every write.
+#  - SQLite: external-content FTS5 table maintained by triggers
+#  - Postgres: generated, weighted tsvector column with a GIN index
+SEARCH_COLUMNS = ("name", "brand", "model", "description", "notes")
+
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS equipment_fts USING fts5(
+        name, brand, model, description, notes,
+        content='equipment', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS equipment_fts_ai AFTER INSERT ON equipment BEGIN
+        INSERT INTO equipment_fts(rowid, name, brand, model, description, notes)
+        VALUES (new.id, new.name, new.brand, new.model, new.description, new.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS equipment_fts_ad AFTER DELETE ON equipment BEGIN
+        INSERT INTO equipment_fts(equipment_fts, rowid, name, brand, model, description, notes)
+        VALUES ('delete', old.id, old.name, old.brand, old.model, old.description, old.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS equipment_fts_au
+    AFTER UPDATE OF name, brand, model, description, notes ON equipment BEGIN
+        INSERT INTO equipment_fts(equipment_fts, rowid, name, brand, model, description, notes)
+        VALUES ('delete', old.id, old.name, old.brand, old.model, old.description, old.notes);
+        INSERT INTO equipment_fts(rowid, name, brand, model, description, notes)
+        VALUES (new.id, new.name, new.brand, new.model, new.description, new.notes);
+    END
+    """,
+]
+
+POSTGRES_SEARCH_DDL = [
+    """
+    ALTER TABLE equipment ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(brand, '') || ' ' || coalesce(model, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '') || ' ' || coalesce(notes, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_equipment_search_vector ON equipment USING gin (search_vector)",
+]
+
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(Equipment.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in POSTGRES_SEARCH_DDL:
+    event.listen(Equipment.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+event.listen(
+    Equipment.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS equipment_fts").execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String
+from app.models.base import Base
+
+# Counter scopes: an item counts towards its owner and its team, if it has them.
+# There is deliberately no global scope: every write would update the same row.
+SCOPE_OWNER = "owner"
+SCOPE_TEAM = "team"
+
+
+class EquipmentCounter(Base):
+    """Equipment totals for one scope, e.g. ("owner", "auth0|123") or ("team", "3")."""
+    __tablename__ = "equipment_counters"
+
+    scope = Column(String, primary_key=True)  # owner, team
+    scope_id = Column(String, primary_key=True)  # owner_id, or team_id as text
+    total = Column(Integer, nullable=False, default=0)
+    available = Column(Integer, nullable=False, default=0)
+    categories = Column(Integer, nullable=False, default=0)  # Categories with at least one item
+
+
+class EquipmentCategoryCounter(Base):
+    """Per-category equipment counts for one scope; rows are removed when they reach zero."""
+    __tablename__ = "equipment_category_counters"
+
+    scope = Column(String, primary_key=True)
+    scope_id = Column(String, primary_key=True)
+    category = Column(String, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    available = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime, String
+from app.models.base import Base
+
+# Background jobs with a watermark; see app/services/overdue_scanner.py
+OVERDUE_SCAN = "overdue_scan"
+
+
+class JobWatermark(Base):
+    """How far an incremental background job has processed its input."""
+    __tablename__ = "job_watermarks"
+
+    name = Column(String, primary_key=True)
+    watermark = Column(DateTime(timezone=True), nullable=False)  # Naive UTC, like the rows it is compared with
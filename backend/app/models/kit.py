@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Table
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.models.base import Base
+
+# Which items make up a kit. An item can belong to several kits (a body in
+# both the "doc kit" and the "interview kit"); deleting either side drops
+# the link.
+kit_items = Table(
+    "kit_items",
+    Base.metadata,
+    Column("kit_id", Integer, ForeignKey("kits.id", ondelete="CASCADE"), primary_key=True),
+    Column("equipment_id", Integer, ForeignKey("equipment.id", ondelete="CASCADE"), primary_key=True, index=True),
+)
+
+
+class Kit(Base):
+    """A named group of equipment that is checked out and in as a whole."""
+    __tablename__ = "kits"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    description = Column(Text, nullable=True)
+    team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), nullable=True, index=True)
+    created_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Links go with the kit (ON DELETE CASCADE); no need to load them first
+    equipment = relationship("Equipment", secondary=kit_items, order_by="Equipment.id", passive_deletes=True)
+
+    @property
+    def equipment_ids(self):
+        return [item.id for item in self.equipment]
+
+    def __repr__(self):
+        return f"<Kit {self.name}>"
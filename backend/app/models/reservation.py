@@ -0,0 +1,50 @@
+from datetime import timedelta
+from sqlalchemy import Column, Integer, DateTime, Text, ForeignKey, Index, CheckConstraint, DDL, event
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.models.base import Base
+
+# Longest bookable window. Overlap searches rely on it: a reservation ending
+# after ``t`` must start after ``t - MAX_RESERVATION``, which turns them into
+# a bounded range scan on (equipment_id, starts_at). Raising it is safe;
+# lowering it hides existing longer reservations from conflict checks.
+MAX_RESERVATION = timedelta(days=90)
+
+
+class EquipmentReservation(Base):
+    """A booking of one item for the half-open window [starts_at, ends_at), in naive UTC."""
+    __tablename__ = "equipment_reservations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    equipment_id = Column(Integer, ForeignKey("equipment.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    starts_at = Column(DateTime(timezone=True), nullable=False)
+    ends_at = Column(DateTime(timezone=True), nullable=False)
+    notes = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    equipment = relationship("Equipment")
+    user = relationship("User")
+
+    # Sorted-endpoint index for overlap searches (alembic revision 013)
+    __table_args__ = (
+        CheckConstraint("ends_at > starts_at", name="ck_equipment_reservations_window"),
+        Index("ix_equipment_reservations_equipment_window", "equipment_id", "starts_at", "ends_at"),
+    )
+
+    def __repr__(self):
+        return f"<EquipmentReservation {self.equipment_id} {self.starts_at} - {self.ends_at}>"
+
+
+# On Postgres the database itself rejects overlapping bookings of an item,
+# however concurrent transactions interleave (needs btree_gist for the = part)
+POSTGRES_RESERVATION_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS btree_gist",
+    """
+    ALTER TABLE equipment_reservations ADD CONSTRAINT ex_equipment_reservations_overlap
+    EXCLUDE USING gist (equipment_id WITH =, tstzrange(starts_at, ends_at, '[)') WITH &&)
+    """,
+]
+
+for _statement in POSTGRES_RESERVATION_DDL:
+    event.listen(EquipmentReservation.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
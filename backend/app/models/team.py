@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models.base import Base
@@ -13,12 +13,15 @@ class Team(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     subscription_type = Column(String, default="free")  # free or paid
     is_active = Column(Boolean, default=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Optimistic concurrency, see Equipment.version
 
     # Relationships
     members = relationship("TeamMembership", back_populates="team", cascade="all, delete-orphan")
     invitations = relationship("TeamInvitation", back_populates="team", cascade="all, delete-orphan")
     equipment = relationship("Equipment", foreign_keys="Equipment.team_id", back_populates="team")
 
+    __mapper_args__ = {"version_id_col": version}
+
 class TeamMembership(Base):
     __tablename__ = "team_memberships"
 
@@ -32,6 +35,13 @@ class TeamMembership(Base):
     team = relationship("Team", back_populates="members")
     user = relationship("User", back_populates="team_memberships")
 
+    __table_args__ = (
+        # Permission checks: user_id + team_id + role
+        Index("ix_team_memberships_user_team_role", "user_id", "team_id", "role"),
+        # Member lists and owner counts
+        Index("ix_team_memberships_team_role", "team_id", "role"),
+    )
+
 class TeamInvitation(Base):
     __tablename__ = "team_invitations"
 
@@ -50,3 +60,8 @@ class TeamInvitation(Base):
 
     # Relationships
     team = relationship("Team", back_populates="invitations")
+
+    __table_args__ = (
+        # Invitation lists and the pending-invitation check
+        Index("ix_team_invitations_team_email", "team_id", "email"),
+    )
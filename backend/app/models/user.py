@@ -36,6 +36,7 @@ class User(Base):
     # Note: Equipment.owner_id is a string (Auth0 ID), not a foreign key to users.id
     # So we don't define a direct relationship here
     team_memberships = relationship("TeamMembership", back_populates="user")
+    checkouts = relationship("EquipmentCheckout", back_populates="user")
     
     def __repr__(self):
         return f"<User {self.email}>"
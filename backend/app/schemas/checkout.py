@@ -0,0 +1,36 @@
+from pydantic import BaseModel, FutureDatetime
+from typing import Optional
+from datetime import datetime
+
+class CheckoutCreate(BaseModel):
+    due_date: Optional[FutureDatetime] = None  # The overdue scanner only looks forward from its watermark
+    notes: Optional[str] = None
+
+class CheckinCreate(BaseModel):
+    notes: Optional[str] = None
+
+class CheckoutResponse(BaseModel):
+    id: int
+    equipment_id: int
+    user_id: int
+    checked_out_at: Optional[datetime] = None
+    checked_in_at: Optional[datetime] = None
+    due_date: Optional[datetime] = None
+    checkout_notes: Optional[str] = None
+    checkin_notes: Optional[str] = None
+    kit_id: Optional[int] = None
+    is_active: bool
+
+    class Config:
+        from_attributes = True
+
+class OverdueCheckoutResponse(BaseModel):
+    checkout_id: int
+    equipment_id: int
+    equipment_name: str
+    user_id: int
+    due_date: datetime
+    flagged_at: datetime
+
+    class Config:
+        from_attributes = True
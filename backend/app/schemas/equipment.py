@@ -1,7 +1,9 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from datetime import datetime
 
+from app.core.config import settings
+
 class EquipmentBase(BaseModel):
     name: str
     description: Optional[str] = None
@@ -15,6 +17,7 @@ class EquipmentBase(BaseModel):
     notes: Optional[str] = None
     owner_id: Optional[str] = None
     owner_name: Optional[str] = None
+    team_id: Optional[int] = None
 
 class EquipmentCreate(EquipmentBase):
     pass
@@ -32,11 +35,50 @@ class EquipmentUpdate(BaseModel):
     notes: Optional[str] = None
     owner_id: Optional[str] = None
     owner_name: Optional[str] = None
+    team_id: Optional[int] = None
+    version: Optional[int] = None  # Version last read; a stale one is rejected with 409. Omit to overwrite unconditionally
 
 class EquipmentResponse(EquipmentBase):
     id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
+    version: int
     
     class Config:
         from_attributes = True
+
+class EquipmentSearchResult(EquipmentResponse):
+    rank: float
+    snippet: Optional[str] = Field(
+        None,
+        description="HTML fragment: the matching text, HTML-escaped, with matches wrapped in <mark> tags and no other markup",
+    )
+
+class EquipmentBulkCreate(BaseModel):
+    items: List[EquipmentCreate] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+class EquipmentBulkUpdateItem(EquipmentUpdate):
+    id: int
+
+class EquipmentBulkUpdate(BaseModel):
+    items: List[EquipmentBulkUpdateItem] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+class EquipmentBulkDelete(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+class BulkItemError(BaseModel):
+    index: int  # Position in the request's items/ids
+    id: Optional[int] = None
+    detail: str
+
+class EquipmentBulkCreateResult(BaseModel):
+    created: List[EquipmentResponse]
+    errors: List[BulkItemError]
+
+class EquipmentBulkUpdateResult(BaseModel):
+    updated: List[EquipmentResponse]
+    errors: List[BulkItemError]
+
+class EquipmentBulkDeleteResult(BaseModel):
+    deleted: List[int]
+    errors: List[BulkItemError]
@@ -0,0 +1,28 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+from app.core.config import settings
+
+class KitBase(BaseModel):
+    name: str
+    description: Optional[str] = None
+    team_id: Optional[int] = None
+
+class KitCreate(KitBase):
+    equipment_ids: List[int] = Field(..., min_length=1, max_length=settings.KIT_MAX_ITEMS)
+
+class KitUpdate(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    equipment_ids: Optional[List[int]] = Field(None, min_length=1, max_length=settings.KIT_MAX_ITEMS)  # Replaces the kit's items
+
+class KitResponse(KitBase):
+    id: int
+    equipment_ids: List[int]
+    created_by_user_id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,38 @@
+from pydantic import BaseModel, field_validator, model_validator
+from typing import Optional
+from datetime import datetime
+
+from app.models.reservation import MAX_RESERVATION
+from app.utils.timestamps import utc_naive
+
+class ReservationCreate(BaseModel):
+    starts_at: datetime
+    ends_at: datetime  # Exclusive
+    notes: Optional[str] = None
+
+    @field_validator("starts_at", "ends_at")
+    @classmethod
+    def as_utc(cls, value: datetime) -> datetime:
+        return utc_naive(value)
+
+    @model_validator(mode="after")
+    def check_window(self) -> "ReservationCreate":
+        if self.ends_at <= self.starts_at:
+            raise ValueError("ends_at must be after starts_at")
+        if self.ends_at - self.starts_at > MAX_RESERVATION:
+            raise ValueError(f"Reservations can be at most {MAX_RESERVATION.days} days long")
+        if self.ends_at <= datetime.utcnow():
+            raise ValueError("Reservation window is in the past")
+        return self
+
+class ReservationResponse(BaseModel):
+    id: int
+    equipment_id: int
+    user_id: int
+    starts_at: datetime
+    ends_at: datetime
+    notes: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -1,8 +1,10 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, Field
+from typing import Dict, Optional, List
 from datetime import datetime
 from enum import Enum
 
+from app.core.config import settings
+
 class SubscriptionType(str, Enum):
     FREE = "free"
     PAID = "paid"
@@ -25,12 +27,14 @@ class TeamUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
     subscription_type: Optional[SubscriptionType] = None
+    version: Optional[int] = None  # Version last read; a stale one is rejected with 409
 
 class Team(TeamBase):
     id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
     is_active: bool = True
+    version: int
     
     class Config:
         from_attributes = True
@@ -67,6 +71,10 @@ class TeamInvitationCreate(TeamInvitationBase):
 class TeamInvitationUpdate(BaseModel):
     role: Optional[TeamRole] = None
 
+class TeamInvitationBulkCreate(BaseModel):
+    emails: List[EmailStr] = Field(..., min_length=1, max_length=settings.INVITATION_BULK_MAX)
+    role: TeamRole = TeamRole.MEMBER
+
 class TeamInvitation(TeamInvitationBase):
     id: int
     team_id: int
@@ -75,13 +83,51 @@ class TeamInvitation(TeamInvitationBase):
     expires_at: datetime
     is_accepted: bool = False
     accepted_at: Optional[datetime] = None
-    invited_by_user_id: str
+    invited_by_user_id: int
     invited_by_name: Optional[str] = None
     
     class Config:
         from_attributes = True
 
+class InvitationStatus(str, Enum):
+    INVITED = "invited"
+    ALREADY_MEMBER = "already_member"
+    ALREADY_INVITED = "already_invited"  # A pending, unexpired invitation exists
+    DUPLICATE = "duplicate"  # Listed earlier in the same request
+
+class TeamInvitationBulkResult(BaseModel):
+    email: EmailStr
+    status: InvitationStatus
+    invitation: Optional[TeamInvitation] = None  # Only for INVITED
+
 # Extended team schema with members
 class TeamWithMembers(Team):
     members: List[TeamMembership] = []
     invitations: List[TeamInvitation] = []
+
+# Team dashboard (GET /teams/{id}/dashboard)
+class TeamDashboardMembers(BaseModel):
+    total: int
+    by_role: Dict[str, int]
+
+class TeamDashboardCategory(BaseModel):
+    total: int
+    available: int
+
+class TeamDashboardEquipment(BaseModel):
+    total_items: int
+    available_items: int
+    in_use_items: int
+    by_category: Dict[str, TeamDashboardCategory]
+    by_condition: Dict[str, int]
+
+class TeamDashboardCheckouts(BaseModel):
+    active: int
+    overdue: int
+
+class TeamDashboard(BaseModel):
+    team: Team
+    members: TeamDashboardMembers
+    pending_invitations: int
+    equipment: TeamDashboardEquipment
+    checkouts: TeamDashboardCheckouts
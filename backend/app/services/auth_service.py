@@ -1,9 +1,260 @@
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.models.base import SessionLocal
-from datetime import datetime
-from typing import Optional
+from app.core.config import settings
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
+import asyncio
+import hashlib
 import json
+import threading
+import time
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Immutable, session-independent copy of a User row, safe to share between requests."""
+    id: int
+    auth0_id: str
+    email: str
+    name: str
+    picture: Optional[str] = None
+    email_verified: Optional[bool] = False
+    display_name: Optional[str] = None
+    bio: Optional[str] = None
+    is_active: Optional[bool] = True
+    is_admin: Optional[bool] = False
+    has_completed_onboarding: Optional[bool] = False
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    last_login: Optional[datetime] = None
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(**{f.name: getattr(user, f.name) for f in fields(cls)})
+
+
+class IdentityCache:
+    """
+    Bounded TTL/LRU cache of token digest -> auth0_id -> UserSnapshot.
+
+    Concurrent misses for the same token are coalesced (single-flight): the
+    first caller resolves the user, everyone else awaits its result.
+    Entries never outlive the token's own expiry.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: int = 300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._users: Dict[str, UserSnapshot] = {}
+        self._tokens_by_user: Dict[str, Set[str]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def _drop(self, key: str) -> None:
+        auth0_id, _ = self._entries.pop(key)
+        tokens = self._tokens_by_user.get(auth0_id)
+        if tokens is not None:
+            tokens.discard(key)
+            if not tokens:
+                del self._tokens_by_user[auth0_id]
+                self._users.pop(auth0_id, None)
+
+    def _lookup(self, key: str) -> Optional[UserSnapshot]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        auth0_id, expires_at = entry
+        snapshot = self._users.get(auth0_id)
+        if expires_at <= time.time() or snapshot is None:
+            self._drop(key)
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return snapshot
+
+    def get(self, token: str) -> Optional[UserSnapshot]:
+        with self._lock:
+            snapshot = self._lookup(self.digest(token))
+            if snapshot is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return snapshot
+
+    def put(self, token: str, snapshot: UserSnapshot, token_expires_at: Optional[float] = None) -> None:
+        expires_at = time.time() + self.ttl
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        key = self.digest(token)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (snapshot.auth0_id, expires_at)
+            self._users[snapshot.auth0_id] = snapshot
+            self._tokens_by_user.setdefault(snapshot.auth0_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_user(self, auth0_id: str) -> None:
+        """Forget every cached token for a user, e.g. after their row changed."""
+        with self._lock:
+            for key in list(self._tokens_by_user.get(auth0_id, ())):
+                self._drop(key)
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._users.clear()
+            self._tokens_by_user.clear()
+
+    async def get_or_resolve(
+        self,
+        token: str,
+        resolver: Callable[[], Awaitable[Tuple[UserSnapshot, Optional[float]]]],
+    ) -> UserSnapshot:
+        """
+        Return the cached user for ``token`` or resolve it exactly once.
+
+        Args:
+            token: Raw bearer token
+            resolver: Coroutine function returning (snapshot, token exp timestamp)
+        """
+        key = self.digest(token)
+        with self._lock:
+            snapshot = self._lookup(key)
+            if snapshot is not None:
+                self.hits += 1
+                return snapshot
+            inflight = self._inflight.get(key)
+            if inflight is not None:
+                self.coalesced += 1
+            else:
+                self.misses += 1
+                future = asyncio.get_running_loop().create_future()
+                self._inflight[key] = future
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        try:
+            snapshot, token_expires_at = await resolver()
+            self.put(token, snapshot, token_expires_at)
+            future.set_result(snapshot)
+            return snapshot
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "users": len(self._users),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+        }
+
+
+identity_cache = IdentityCache(
+    max_entries=settings.IDENTITY_CACHE_MAX_ENTRIES,
+    ttl=settings.IDENTITY_CACHE_TTL,
+)
+
+
+# Auth0 profile claims the app actually reads; everything else is dropped before storing
+STORED_AUTH0_CLAIMS = ("sub", "email", "email_verified", "name", "nickname", "picture")
+
+
+def compact_auth0_metadata(auth0_user_data: dict) -> str:
+    """Canonical, compact JSON of the claims we use (stable for hashing)."""
+    claims = {k: auth0_user_data[k] for k in STORED_AUTH0_CLAIMS if k in auth0_user_data}
+    return json.dumps(claims, sort_keys=True, separators=(",", ":"))
+
+
+def profile_hash(metadata: Optional[str]) -> Optional[str]:
+    if metadata is None:
+        return None
+    return hashlib.sha256(metadata.encode()).hexdigest()
+
+
+def _last_login_is_stale(last_login: Optional[datetime], now: datetime) -> bool:
+    if last_login is None:
+        return True
+    if last_login.tzinfo is not None:
+        last_login = last_login.astimezone(timezone.utc).replace(tzinfo=None)
+    return now - last_login >= timedelta(minutes=settings.LAST_LOGIN_GRANULARITY_MINUTES)
+
+
+class LoginSyncStats:
+    """Counts login syncs that did or did not need a write, bucketed per minute."""
+
+    WINDOW_MINUTES = 60
+
+    def __init__(self):
+        self.syncs = 0
+        self.writes = 0
+        self.writes_avoided = 0
+        self._avoided_by_minute: "OrderedDict[int, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, wrote: bool) -> None:
+        minute = int(time.time() // 60)
+        with self._lock:
+            self.syncs += 1
+            if wrote:
+                self.writes += 1
+                return
+            self.writes_avoided += 1
+            self._avoided_by_minute[minute] = self._avoided_by_minute.get(minute, 0) + 1
+            while next(iter(self._avoided_by_minute)) <= minute - self.WINDOW_MINUTES:
+                self._avoided_by_minute.popitem(last=False)
+
+    def stats(self) -> dict:
+        minute = int(time.time() // 60)
+        with self._lock:
+            window = {m: n for m, n in self._avoided_by_minute.items() if m > minute - self.WINDOW_MINUTES}
+        return {
+            "syncs": self.syncs,
+            "writes": self.writes,
+            "writes_avoided": self.writes_avoided,
+            "writes_avoided_last_minute": window.get(minute - 1, 0),
+            "writes_avoided_per_minute": round(sum(window.values()) / self.WINDOW_MINUTES, 2),
+        }
+
+
+login_sync_stats = LoginSyncStats()
+
 
 class AuthService:
     
@@ -35,16 +286,33 @@ class AuthService:
             
             # Check if user exists
             user = db.query(User).filter(User.auth0_id == auth0_id).first()
+            now = datetime.utcnow()
+            metadata = compact_auth0_metadata(auth0_user_data)
             
             if user:
-                # Update existing user
-                user.email = email or user.email
-                user.name = auth0_user_data.get('name') or user.name
-                user.picture = auth0_user_data.get('picture') or user.picture
-                user.email_verified = auth0_user_data.get('email_verified', user.email_verified)
-                user.last_login = datetime.utcnow()
-                user.auth0_metadata = json.dumps(auth0_user_data)
-                user.updated_at = datetime.utcnow()
+                # Update existing user, touching only the columns that changed
+                coalesce = settings.LOGIN_SYNC_COALESCE
+                changed = not coalesce or profile_hash(metadata) != profile_hash(user.auth0_metadata)
+                if changed:
+                    profile = {
+                        'email': email or user.email,
+                        'name': auth0_user_data.get('name') or user.name,
+                        'picture': auth0_user_data.get('picture') or user.picture,
+                        'email_verified': auth0_user_data.get('email_verified', user.email_verified),
+                        'auth0_metadata': metadata,
+                    }
+                    for column, value in profile.items():
+                        if getattr(user, column) != value:
+                            setattr(user, column, value)
+                    user.updated_at = now
+                
+                if not coalesce or _last_login_is_stale(user.last_login, now):
+                    user.last_login = now
+                
+                if not db.is_modified(user):
+                    login_sync_stats.record(wrote=False)
+                    return user
+                login_sync_stats.record(wrote=True)
             else:
                 # Create new user
                 user = User(
@@ -53,14 +321,15 @@ class AuthService:
                     name=auth0_user_data.get('name', ''),
                     picture=auth0_user_data.get('picture'),
                     email_verified=auth0_user_data.get('email_verified', False),
-                    last_login=datetime.utcnow(),
-                    auth0_metadata=json.dumps(auth0_user_data),
+                    last_login=now,
+                    auth0_metadata=metadata,
                     has_completed_onboarding=False
                 )
                 db.add(user)
             
             db.commit()
             db.refresh(user)
+            identity_cache.invalidate_user(user.auth0_id)
             return user
             
         except Exception as e:
@@ -118,6 +387,7 @@ class AuthService:
                 user.updated_at = datetime.utcnow()
                 db.commit()
                 db.refresh(user)
+                identity_cache.invalidate_user(user.auth0_id)
             return user
         finally:
             if close_db:
@@ -0,0 +1,95 @@
+from typing import Iterable, List, Optional
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.collection_version import CollectionVersion, EQUIPMENT, TEAMS
+from app.models.equipment import Equipment
+from app.models.team import Team, TeamInvitation, TeamMembership
+
+
+def equipment_scopes(owner_id: Optional[str], team_id: Optional[int]) -> List[str]:
+    """Version rows an equipment row with this owner and team belongs to."""
+    scopes = []
+    if owner_id is not None:
+        scopes.append(f"{EQUIPMENT}:owner:{owner_id}")
+    if team_id is not None:
+        scopes.append(f"{EQUIPMENT}:team:{team_id}")
+    return scopes or [f"{EQUIPMENT}:unscoped"]
+
+
+def team_scope(team_id: int) -> str:
+    """Version row for a team, its memberships and its invitations (embedded in TeamWithMembers)."""
+    return f"{TEAMS}:team:{team_id}"
+
+
+def bump_versions(connection: Connection, names: Iterable[str]) -> None:
+    """
+    Increment each scope's version, inside the caller's transaction.
+
+    ORM writes go through the flush hook below; Core/bulk writes must call
+    this themselves (after apply_deltas, so locks are always taken in the
+    same order).
+    """
+    insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+    versions = CollectionVersion.__table__
+    for name in sorted(set(names)):
+        stmt = insert(versions).values(name=name, version=1)
+        connection.execute(stmt.on_conflict_do_update(
+            index_elements=[versions.c.name],
+            set_={"version": versions.c.version + 1},
+        ))
+
+
+def _previous(obj, attr: str) -> list:
+    return list(getattr(inspect(obj).attrs, attr).history.deleted)
+
+
+def _scopes(obj) -> List[str]:
+    """Scopes a written object belongs to, before and after the write."""
+    if isinstance(obj, Equipment):
+        owners = {obj.owner_id, *_previous(obj, "owner_id")}
+        teams = {obj.team_id, *_previous(obj, "team_id")}
+        return [scope for owner_id in owners for team_id in teams for scope in equipment_scopes(owner_id, team_id)]
+    if isinstance(obj, Team):
+        return [team_scope(obj.id)]
+    if isinstance(obj, (TeamMembership, TeamInvitation)):
+        return [team_scope(team_id) for team_id in {obj.team_id, *_previous(obj, "team_id")}]
+    return []
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_changed_scopes(session, flush_context):
+    # session.new/dirty/deleted still hold the pre-flush state here
+    names = set()
+    for obj in session.new | session.deleted:
+        names.update(_scopes(obj))
+    for obj in session.dirty:
+        if session.is_modified(obj):
+            names.update(_scopes(obj))
+    if names:
+        bump_versions(session.connection(), names)
+
+
+class CollectionVersionService:
+
+    @staticmethod
+    def get_version(db: Session, name: str) -> int:
+        """
+        Current version of one scope (e.g. ``team_scope(3)``), or of a whole
+        collection when ``name`` is a bare collection (EQUIPMENT, TEAMS).
+
+        A collection's version is the sum of its scope versions: each only
+        ever goes up, so the sum changes with every write to any of them,
+        and writers in different scopes never update the same row.
+        """
+        if ":" in name:
+            statement = select(CollectionVersion.version).where(CollectionVersion.name == name)
+        else:
+            # Range rather than LIKE so the primary key index serves it everywhere
+            statement = select(func.sum(CollectionVersion.version)).where(
+                CollectionVersion.name >= f"{name}:", CollectionVersion.name < f"{name};"
+            )
+        return db.execute(statement).scalar() or 0
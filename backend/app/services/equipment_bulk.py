@@ -0,0 +1,240 @@
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.models.equipment import Equipment
+from app.services.equipment_counters import TRACKED, new_deltas
+from app.services.equipment_writes import (
+    CHECKED_OUT, TRACKED_COLUMNS, count_change, count_move, drop_kit_links, record_core_write, tracked_values
+)
+
+SERIAL_EXISTS = "Serial number already exists"
+SERIAL_REPEATED = "Serial number appears more than once in this request"
+ID_REPEATED = "Equipment id appears more than once in this request"
+NOT_FOUND = "Equipment not found"
+VERSION_CONFLICT = "Equipment was modified by someone else; reload and retry"
+CHECKED_OUT_DETAIL = "Equipment is checked out; check it in instead"
+
+# (request index, item) pairs
+Entries = List[Tuple[int, dict]]
+ChunkResult = Tuple[list, List[dict]]
+
+
+def _error(index: int, detail: str, equipment_id: Optional[int] = None) -> dict:
+    return {"index": index, "id": equipment_id, "detail": detail}
+
+
+def _integrity_detail(e: Exception) -> str:
+    if isinstance(e, StaleDataError):
+        return VERSION_CONFLICT
+    return SERIAL_EXISTS if "serial_number" in str(e) else "Database integrity error"
+
+
+def _reject_repeats(entries: Entries, key: str, detail: str) -> Tuple[Entries, List[dict]]:
+    """Keep the first item per non-null ``key`` value; later ones become errors."""
+    kept, errors, seen = [], [], set()
+    for index, item in entries:
+        value = item.get(key)
+        if value is not None and value in seen:
+            errors.append(_error(index, detail, item.get("id")))
+            continue
+        seen.add(value)
+        kept.append((index, item))
+    return kept, errors
+
+
+class EquipmentBulkService:
+    """
+    Batched equipment writes for imports and mass edits.
+
+    Requests are split into chunks of ``BULK_CHUNK_SIZE`` rows; each chunk
+    is validated with one lookup, written with one multi-row statement and
+    committed on its own. Rows that cannot be written (duplicate serial
+    numbers, unknown ids, stale versions, checked-out items made available
+    or deleted) are reported per row instead of failing the batch. If a chunk still
+    hits a constraint or a version check (e.g. a concurrent write to the
+    same row), it is retried one row per transaction.
+    """
+
+    @staticmethod
+    def _run(
+        db: Session,
+        entries: Entries,
+        errors: List[dict],
+        write_chunk: Callable[[Session, Entries], ChunkResult],
+    ) -> ChunkResult:
+        results = []
+        size = settings.BULK_CHUNK_SIZE
+        for start in range(0, len(entries), size):
+            chunk_results, chunk_errors = EquipmentBulkService._write(db, entries[start:start + size], write_chunk)
+            results.extend(chunk_results)
+            errors.extend(chunk_errors)
+        errors.sort(key=lambda error: error["index"])
+        return results, errors
+
+    @staticmethod
+    def _write(db: Session, entries: Entries, write_chunk) -> ChunkResult:
+        try:
+            return write_chunk(db, entries)
+        except (IntegrityError, StaleDataError) as e:
+            db.rollback()
+            if len(entries) == 1:
+                index, item = entries[0]
+                return [], [_error(index, _integrity_detail(e), item.get("id"))]
+        results, errors = [], []
+        for entry in entries:
+            entry_results, entry_errors = EquipmentBulkService._write(db, [entry], write_chunk)
+            results.extend(entry_results)
+            errors.extend(entry_errors)
+        return results, errors
+
+    @staticmethod
+    def _finish(db: Session, objects: List[Equipment], deltas, lookup_keys: set, rows: List[tuple]) -> List[Equipment]:
+        record_core_write(db, deltas, lookup_keys, rows)
+        # Detach with their loaded state so serializing them after commit needs no refresh
+        for obj in objects:
+            db.expunge(obj)
+        db.commit()
+        return objects
+
+    @staticmethod
+    def _create_chunk(db: Session, entries: Entries) -> ChunkResult:
+        serials = {item["serial_number"] for _, item in entries if item.get("serial_number") is not None}
+        taken = set(db.scalars(select(Equipment.serial_number).where(Equipment.serial_number.in_(serials))))
+
+        rows, errors = [], []
+        for index, item in entries:
+            if item.get("serial_number") in taken:
+                errors.append(_error(index, SERIAL_EXISTS))
+                continue
+            rows.append(item)
+        if not rows:
+            return [], errors
+
+        # One multi-row INSERT ... RETURNING. Ids are assigned in VALUES order, so
+        # sorting by id restores request order (sort_by_parameter_order would make
+        # SQLite fall back to one statement per row).
+        created = sorted(db.scalars(insert(Equipment).returning(Equipment), rows).all(), key=lambda obj: obj.id)
+        deltas, lookup_keys, written = new_deltas(), set(), []
+        for obj in created:
+            count_change(deltas, lookup_keys, tracked_values(obj), sign=1)
+            written.append(tracked_values(obj))
+        return EquipmentBulkService._finish(db, created, deltas, lookup_keys, written), errors
+
+    @staticmethod
+    def _update_chunk(db: Session, entries: Entries) -> ChunkResult:
+        ids = [item["id"] for _, item in entries]
+        current = {
+            row.id: row
+            for row in db.execute(
+                select(Equipment.id, Equipment.version, *TRACKED_COLUMNS, CHECKED_OUT.label("checked_out"))
+                .where(Equipment.id.in_(ids))
+                .with_for_update()
+            )
+        }
+        serials = {item["serial_number"] for _, item in entries if item.get("serial_number") is not None}
+        taken = dict(db.execute(
+            select(Equipment.serial_number, Equipment.id).where(Equipment.serial_number.in_(serials))
+        ).all())
+
+        rows, errors = [], []
+        for index, item in entries:
+            equipment_id, serial = item["id"], item.get("serial_number")
+            if equipment_id not in current:
+                errors.append(_error(index, NOT_FOUND, equipment_id))
+                continue
+            if serial is not None and taken.get(serial, equipment_id) != equipment_id:
+                errors.append(_error(index, SERIAL_EXISTS, equipment_id))
+                continue
+            if item.get("version") is not None and item["version"] != current[equipment_id].version:
+                errors.append(_error(index, VERSION_CONFLICT, equipment_id))
+                continue
+            if item.get("is_available") and current[equipment_id].checked_out:
+                errors.append(_error(index, CHECKED_OUT_DETAIL, equipment_id))
+                continue
+            rows.append(item)
+        if not rows:
+            return [], errors
+
+        # Bulk UPDATE by primary key checks and bumps the version itself; a row
+        # changed since the read above fails the chunk with StaleDataError
+        db.execute(update(Equipment), [{**item, "version": current[item["id"]].version} for item in rows])
+
+        deltas, lookup_keys, written = new_deltas(), set(), []
+        for item in rows:
+            old = tracked_values(current[item["id"]])
+            new = tuple(item.get(attr, value) for attr, value in zip(TRACKED, old))
+            if new != old:
+                count_move(deltas, lookup_keys, old, new)
+            written += [old, new]
+        updated = db.scalars(
+            select(Equipment)
+            .where(Equipment.id.in_([item["id"] for item in rows]))
+            .order_by(Equipment.id)
+            .execution_options(populate_existing=True)
+        ).all()
+        return EquipmentBulkService._finish(db, updated, deltas, lookup_keys, written), errors
+
+    @staticmethod
+    def _delete_chunk(db: Session, entries: Entries) -> ChunkResult:
+        ids = [item["id"] for _, item in entries]
+        current = {
+            row.id: row
+            for row in db.execute(
+                select(Equipment.id, *TRACKED_COLUMNS, CHECKED_OUT.label("checked_out"))
+                .where(Equipment.id.in_(ids))
+                .with_for_update()
+            )
+        }
+
+        deleted, errors = [], []
+        for index, item in entries:
+            if item["id"] not in current:
+                errors.append(_error(index, NOT_FOUND, item["id"]))
+            elif current[item["id"]].checked_out:
+                errors.append(_error(index, CHECKED_OUT_DETAIL, item["id"]))
+            else:
+                deleted.append(item["id"])
+        if not deleted:
+            return [], errors
+
+        db.execute(
+            delete(Equipment).where(Equipment.id.in_(deleted)).execution_options(synchronize_session=False)
+        )
+        deltas, lookup_keys, written = new_deltas(), set(), []
+        for equipment_id in deleted:
+            count_change(deltas, lookup_keys, tracked_values(current[equipment_id]), sign=-1)
+            written.append(tracked_values(current[equipment_id]))
+        drop_kit_links(db, deleted)
+        EquipmentBulkService._finish(db, [], deltas, lookup_keys, written)
+        return deleted, errors
+
+    @staticmethod
+    def create(db: Session, items: List[dict]) -> Tuple[List[Equipment], List[dict]]:
+        """
+        Insert equipment rows in chunks.
+
+        Returns:
+            (created, errors): Created rows in request order, and one error
+            per rejected row with its index in ``items``
+        """
+        entries, errors = _reject_repeats(list(enumerate(items)), "serial_number", SERIAL_REPEATED)
+        return EquipmentBulkService._run(db, entries, errors, EquipmentBulkService._create_chunk)
+
+    @staticmethod
+    def update(db: Session, items: List[Dict]) -> Tuple[List[Equipment], List[dict]]:
+        """Apply partial updates; every item carries ``id`` plus only the fields to change."""
+        entries, errors = _reject_repeats(list(enumerate(items)), "id", ID_REPEATED)
+        entries, serial_errors = _reject_repeats(entries, "serial_number", SERIAL_REPEATED)
+        return EquipmentBulkService._run(db, entries, errors + serial_errors, EquipmentBulkService._update_chunk)
+
+    @staticmethod
+    def delete(db: Session, ids: List[int]) -> Tuple[List[int], List[dict]]:
+        """Delete equipment by id, reporting unknown and checked-out ids per row."""
+        entries, errors = _reject_repeats(
+            [(index, {"id": equipment_id}) for index, equipment_id in enumerate(ids)], "id", ID_REPEATED
+        )
+        return EquipmentBulkService._run(db, entries, errors, EquipmentBulkService._delete_chunk)
@@ -0,0 +1,260 @@
+from datetime import datetime
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import Iterable, List, Optional
+
+from app.models.checkout import EquipmentCheckout
+from app.models.equipment import Equipment
+from app.models.kit import Kit, kit_items
+from app.services.equipment_counters import new_deltas
+from app.services.equipment_reservations import reserved_by_others
+from app.services.equipment_writes import CheckoutConflict, count_move, record_core_write, tracked_values
+from app.services.versioned_writes import update_returning
+from app.utils.timestamps import utc_naive
+
+
+class KitCheckoutConflict(CheckoutConflict):
+    """Raised when some of a kit's items cannot be checked out; none of them were."""
+
+    def __init__(self, kit_id: int, equipment_ids: List[int]):
+        super().__init__(f"Kit {kit_id}: equipment {', '.join(map(str, equipment_ids))} not available or reserved")
+        self.equipment_ids = equipment_ids
+
+
+def _record_flips(db: Session, items: Iterable[Equipment], available: bool) -> None:
+    """Move flipped items between the available and unavailable counters."""
+    deltas, lookup_keys = new_deltas(), set()
+    for equipment in items:
+        scope = tracked_values(equipment)[:3]
+        count_move(deltas, lookup_keys, (*scope, not available), (*scope, available))
+    record_core_write(db, deltas, lookup_keys, [tracked_values(equipment) for equipment in items])
+
+
+def _set_availability(db: Session, equipment_id: int, available: bool, *criteria) -> Optional[Equipment]:
+    """
+    Flip ``is_available`` only if it still has the opposite value (compare-and-set)
+    and the row matches ``criteria``.
+
+    Of two concurrent writers, the second matches no row: the first one's
+    UPDATE holds the row lock (Postgres) or the write lock (SQLite) until it
+    commits, and the second then sees the new value.
+    """
+    equipment = update_returning(
+        db, Equipment, equipment_id, {"is_available": available}, None,
+        Equipment.is_available == (not available), *criteria,
+    )
+    if equipment is not None:
+        _record_flips(db, [equipment], available)
+    return equipment
+
+
+def _set_availability_many(db: Session, equipment_ids: List[int], available: bool, *criteria) -> List[Equipment]:
+    """``_set_availability`` for several items in one UPDATE; returns the items it flipped."""
+    items = db.scalars(
+        update(Equipment)
+        .where(Equipment.id.in_(equipment_ids), Equipment.is_available == (not available), *criteria)
+        .values(is_available=available, version=Equipment.version + 1)
+        .returning(Equipment)
+        .execution_options(populate_existing=True, synchronize_session=False)
+    ).all()
+    _record_flips(db, items, available)
+    return items
+
+
+def _kit_exists(db: Session, kit_id: int) -> bool:
+    return db.scalar(select(Kit.id).where(Kit.id == kit_id)) is not None
+
+
+def _exists(db: Session, equipment_id: int) -> bool:
+    return db.scalar(select(Equipment.id).where(Equipment.id == equipment_id)) is not None
+
+
+def _reserved(db: Session, equipment_id: int, user_id: int, now: datetime, due_date: Optional[datetime]) -> bool:
+    return db.scalar(select(reserved_by_others(now, due_date, user_id, equipment_id)))
+
+
+class EquipmentCheckoutService:
+    """
+    Checking equipment out and back in, each in one short transaction.
+
+    Availability is claimed with a compare-and-set UPDATE on the item, so
+    two people grabbing the same camera cannot both succeed; the partial
+    unique index on active checkouts backs that up in the database. A kit
+    is claimed the same way, with one UPDATE over all of its items and one
+    multi-row INSERT of their checkouts.
+
+    The same UPDATE also requires that nobody else has the item reserved
+    between now and the due date (any later time without one), so a walk-up
+    checkout cannot take equipment from under a booking. The borrower's own
+    reservations do not count.
+    """
+
+    @staticmethod
+    def checkout(
+        db: Session, equipment_id: int, user_id: int,
+        due_date: Optional[datetime] = None, notes: Optional[str] = None,
+    ) -> Optional[EquipmentCheckout]:
+        """
+        Check an available item out to ``user_id``.
+
+        Returns:
+            EquipmentCheckout: The new active checkout, or None if the item does not exist
+
+        Raises:
+            CheckoutConflict: If the item is checked out, otherwise unavailable or
+                reserved by someone else before ``due_date``
+        """
+        if due_date is not None:
+            due_date = utc_naive(due_date)  # The overdue scanner compares it with naive UTC timestamps
+        now = datetime.utcnow()
+        try:
+            if _set_availability(
+                db, equipment_id, False, ~reserved_by_others(now, due_date, user_id)
+            ) is None:
+                db.rollback()  # Let the next writer in before looking any further
+                if not _exists(db, equipment_id):
+                    return None
+                if _reserved(db, equipment_id, user_id, now, due_date):
+                    raise CheckoutConflict(f"Equipment {equipment_id} is reserved by someone else before it is due back")
+                raise CheckoutConflict(f"Equipment {equipment_id} is not available")
+
+            checkout = db.scalars(
+                insert(EquipmentCheckout).returning(EquipmentCheckout),
+                [{"equipment_id": equipment_id, "user_id": user_id, "due_date": due_date, "checkout_notes": notes}],
+            ).one()
+            db.commit()
+            return checkout
+        except IntegrityError:
+            # Another active checkout slipped past the availability check
+            db.rollback()
+            raise CheckoutConflict(f"Equipment {equipment_id} is already checked out")
+        except Exception:
+            db.rollback()
+            raise
+
+    @staticmethod
+    def checkin(db: Session, equipment_id: int, notes: Optional[str] = None, *criteria) -> Optional[EquipmentCheckout]:
+        """
+        Close the item's active checkout, if it matches ``criteria``, and make the item available again.
+
+        Returns:
+            EquipmentCheckout: The closed checkout, or None if the item does not exist
+
+        Raises:
+            CheckoutConflict: If the item is not checked out
+        """
+        try:
+            checkout = db.scalars(
+                update(EquipmentCheckout)
+                .where(EquipmentCheckout.equipment_id == equipment_id, EquipmentCheckout.is_active == True, *criteria)
+                .values(is_active=False, checked_in_at=func.now(), checkin_notes=notes)
+                .returning(EquipmentCheckout)
+                .execution_options(populate_existing=True, synchronize_session=False)
+            ).one_or_none()
+            if checkout is None:
+                db.rollback()
+                if not _exists(db, equipment_id):
+                    return None
+                raise CheckoutConflict(f"Equipment {equipment_id} is not checked out")
+
+            _set_availability(db, equipment_id, available=True)
+            db.commit()
+            return checkout
+        except Exception:
+            db.rollback()
+            raise
+
+    @staticmethod
+    def checkout_kit(
+        db: Session, kit_id: int, user_id: int,
+        due_date: Optional[datetime] = None, notes: Optional[str] = None,
+    ) -> Optional[List[EquipmentCheckout]]:
+        """
+        Check every item of a kit out to ``user_id``, or none of them.
+
+        Returns:
+            List[EquipmentCheckout]: One active checkout per item, by equipment id, or None if the kit does not exist
+
+        Raises:
+            KitCheckoutConflict: If any item is checked out, otherwise unavailable or
+                reserved by someone else before ``due_date``
+            CheckoutConflict: If the kit has no equipment
+        """
+        if due_date is not None:
+            due_date = utc_naive(due_date)
+        now = datetime.utcnow()
+        try:
+            # Joined so a link left behind by a write that skipped drop_kit_links cannot block the kit
+            equipment_ids = db.scalars(
+                select(kit_items.c.equipment_id)
+                .join(Equipment, Equipment.id == kit_items.c.equipment_id)
+                .where(kit_items.c.kit_id == kit_id)
+                .order_by(kit_items.c.equipment_id)
+            ).all()
+            if not equipment_ids:
+                db.rollback()
+                if not _kit_exists(db, kit_id):
+                    return None
+                raise CheckoutConflict(f"Kit {kit_id} has no equipment")
+
+            claimed = {
+                equipment.id for equipment in _set_availability_many(
+                    db, equipment_ids, False, ~reserved_by_others(now, due_date, user_id)
+                )
+            }
+            if len(claimed) < len(equipment_ids):
+                db.rollback()  # Release the items this attempt did get
+                raise KitCheckoutConflict(kit_id, [i for i in equipment_ids if i not in claimed])
+
+            # One multi-row VALUES statement; executemany with ordered RETURNING
+            # falls back to a statement per row on SQLite
+            checkouts = db.scalars(
+                insert(EquipmentCheckout).values([
+                    {"equipment_id": equipment_id, "user_id": user_id, "due_date": due_date,
+                     "checkout_notes": notes, "kit_id": kit_id}
+                    for equipment_id in equipment_ids
+                ]).returning(EquipmentCheckout)
+            ).all()
+            db.commit()
+            return sorted(checkouts, key=lambda checkout: checkout.equipment_id)
+        except IntegrityError:
+            db.rollback()
+            raise CheckoutConflict(f"Kit {kit_id}: an item is already checked out")
+        except Exception:
+            db.rollback()
+            raise
+
+    @staticmethod
+    def checkin_kit(db: Session, kit_id: int, notes: Optional[str] = None, *criteria) -> Optional[List[EquipmentCheckout]]:
+        """
+        Check in whatever is still out from the kit's checkout, among the checkouts matching ``criteria``.
+
+        Items that were checked in on their own in the meantime are skipped.
+
+        Returns:
+            List[EquipmentCheckout]: The closed checkouts, by equipment id, or None if the kit does not exist
+
+        Raises:
+            CheckoutConflict: If nothing from the kit is checked out
+        """
+        try:
+            checkouts = db.scalars(
+                update(EquipmentCheckout)
+                .where(EquipmentCheckout.kit_id == kit_id, EquipmentCheckout.is_active == True, *criteria)
+                .values(is_active=False, checked_in_at=func.now(), checkin_notes=notes)
+                .returning(EquipmentCheckout)
+                .execution_options(populate_existing=True, synchronize_session=False)
+            ).all()
+            if not checkouts:
+                db.rollback()
+                if not _kit_exists(db, kit_id):
+                    return None
+                raise CheckoutConflict(f"Kit {kit_id} is not checked out")
+
+            _set_availability_many(db, [checkout.equipment_id for checkout in checkouts], available=True)
+            db.commit()
+            return sorted(checkouts, key=lambda checkout: checkout.equipment_id)
+        except Exception:
+            db.rollback()
+            raise
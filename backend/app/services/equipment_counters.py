@@ -0,0 +1,274 @@
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import String, case, cast, delete, event, func, inspect, literal, null, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.equipment import Equipment
+from app.models.equipment_counters import (
+    EquipmentCategoryCounter, EquipmentCounter, SCOPE_OWNER, SCOPE_TEAM,
+)
+
+# Equipment columns the counters depend on
+TRACKED = ("owner_id", "team_id", "category", "is_available")
+
+# (scope, scope_id, category) -> [total, available]
+Deltas = Dict[Tuple[str, str, str], List[int]]
+
+
+def new_deltas() -> Deltas:
+    return defaultdict(lambda: [0, 0])
+
+
+def add_deltas(deltas: Deltas, owner_id, team_id, category, is_available, sign: int) -> None:
+    """Count one item (sign=1) or uncount it (sign=-1) in its owner and team scopes."""
+    scopes = []
+    if owner_id is not None:
+        scopes.append((SCOPE_OWNER, owner_id))
+    if team_id is not None:
+        scopes.append((SCOPE_TEAM, str(team_id)))
+    for scope, scope_id in scopes:
+        counts = deltas[(scope, scope_id, category)]
+        counts[0] += sign
+        if is_available:
+            counts[1] += sign
+
+
+def apply_deltas(connection: Connection, deltas: Deltas) -> None:
+    """
+    Apply counter deltas on ``connection``, inside the caller's transaction.
+
+    ORM writes go through the flush hook below; Core/bulk writes to equipment
+    must call this themselves. Rows are upserted in sorted key order so
+    concurrent writers always lock them in the same order.
+    """
+    if not settings.EQUIPMENT_COUNTERS_ENABLED:
+        return
+    insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+    totals = defaultdict(lambda: [0, 0, 0])
+    by_category = EquipmentCategoryCounter.__table__
+
+    for (scope, scope_id, category), (total, available) in sorted(deltas.items()):
+        if not total and not available:
+            continue
+        stmt = insert(by_category).values(
+            scope=scope, scope_id=scope_id, category=category, total=total, available=available
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[by_category.c.scope, by_category.c.scope_id, by_category.c.category],
+            set_={
+                "total": by_category.c.total + stmt.excluded.total,
+                "available": by_category.c.available + stmt.excluded.available,
+            },
+        ).returning(by_category.c.total)
+        new_total = connection.execute(stmt).scalar_one()
+
+        scope_totals = totals[(scope, scope_id)]
+        scope_totals[0] += total
+        scope_totals[1] += available
+        if total > 0 and new_total == total:
+            scope_totals[2] += 1  # First item in this category
+        elif total < 0 and new_total <= 0:
+            scope_totals[2] -= 1  # Last item left this category
+            connection.execute(delete(by_category).where(
+                by_category.c.scope == scope,
+                by_category.c.scope_id == scope_id,
+                by_category.c.category == category,
+                by_category.c.total <= 0,
+            ))
+
+    counters = EquipmentCounter.__table__
+    for (scope, scope_id), (total, available, categories) in sorted(totals.items()):
+        stmt = insert(counters).values(
+            scope=scope, scope_id=scope_id, total=total, available=available, categories=categories
+        )
+        connection.execute(stmt.on_conflict_do_update(
+            index_elements=[counters.c.scope, counters.c.scope_id],
+            set_={
+                "total": counters.c.total + stmt.excluded.total,
+                "available": counters.c.available + stmt.excluded.available,
+                "categories": counters.c.categories + stmt.excluded.categories,
+            },
+        ))
+
+
+def _current_values(obj: Equipment) -> tuple:
+    state = inspect(obj)
+    values = []
+    for attr in TRACKED:
+        default = Equipment.__table__.c[attr].default
+        if state.pending and attr not in state.dict and default is not None and default.is_scalar:
+            values.append(default.arg)  # Column default, applied on INSERT
+        else:
+            values.append(getattr(obj, attr))
+    return tuple(values)
+
+
+def _committed_values(obj: Equipment) -> tuple:
+    state = inspect(obj)
+    values = []
+    for attr in TRACKED:
+        history = state.attrs[attr].history
+        values.append(history.deleted[0] if history.deleted else getattr(obj, attr))
+    return tuple(values)
+
+
+@event.listens_for(Session, "before_flush")
+def _count_equipment_changes(session, flush_context, instances):
+    if not settings.EQUIPMENT_COUNTERS_ENABLED:
+        return
+    deltas = new_deltas()
+    for obj in session.new:
+        if isinstance(obj, Equipment):
+            add_deltas(deltas, *_current_values(obj), sign=1)
+    for obj in session.deleted:
+        if isinstance(obj, Equipment):
+            add_deltas(deltas, *_committed_values(obj), sign=-1)
+    for obj in session.dirty:
+        if isinstance(obj, Equipment) and obj not in session.deleted:
+            old, new = _committed_values(obj), _current_values(obj)
+            if old != new:
+                add_deltas(deltas, *old, sign=-1)
+                add_deltas(deltas, *new, sign=1)
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+
+
+def _load_old_value(target, value, oldvalue, initiator):
+    pass
+
+
+# Load the previous value on assignment so _committed_values sees it even for expired attributes
+for _attr in TRACKED:
+    event.listen(getattr(Equipment, _attr), "set", _load_old_value, active_history=True)
+
+
+class EquipmentCounterService:
+
+    @staticmethod
+    def aggregate_stats(db: Session, owner_id: Optional[str] = None, team_id: Optional[int] = None) -> Tuple[int, int, int]:
+        """(total, available, distinct categories) in a single pass over the matching rows."""
+        query = db.query(
+            func.count(Equipment.id),
+            func.coalesce(func.sum(case((Equipment.is_available == True, 1), else_=0)), 0),
+            func.count(Equipment.category.distinct()),
+        )
+        if owner_id:
+            query = query.filter(Equipment.owner_id == owner_id)
+        if team_id is not None:
+            query = query.filter(Equipment.team_id == team_id)
+        total, available, categories = query.one()
+        return total, available, categories
+
+    @staticmethod
+    def get_stats(db: Session, owner_id: Optional[str] = None, team_id: Optional[int] = None) -> dict:
+        """
+        Equipment statistics for an owner or a team.
+
+        A single owner or team is a primary-key lookup on equipment_counters;
+        everything else (no filter, or both) falls back to one aggregate query.
+        """
+        if settings.EQUIPMENT_COUNTERS_ENABLED and bool(owner_id) != (team_id is not None):
+            scope, scope_id = (SCOPE_OWNER, owner_id) if owner_id else (SCOPE_TEAM, str(team_id))
+            row = db.execute(
+                select(EquipmentCounter.total, EquipmentCounter.available, EquipmentCounter.categories)
+                .where(EquipmentCounter.scope == scope, EquipmentCounter.scope_id == scope_id)
+            ).first()
+            total, available, categories = row if row else (0, 0, 0)
+        else:
+            total, available, categories = EquipmentCounterService.aggregate_stats(db, owner_id, team_id)
+
+        return {
+            "total_items": total,
+            "available_items": available,
+            "in_use_items": total - available,
+            "categories": categories,
+        }
+
+    @staticmethod
+    def check(db: Session, repair: bool = False) -> dict:
+        """
+        Recompute the counters from the equipment table and report drift.
+
+        Expected and stored counters are read in one statement, so both come
+        from the same snapshot. With ``repair``, the counters are rebuilt from
+        the recomputed values (equipment writes are blocked meanwhile on Postgres).
+
+        Returns:
+            dict: ``counters_checked``, the ``drift`` found and whether it was ``repaired``
+        """
+        if repair and db.get_bind().dialect.name == "postgresql":
+            db.connection().exec_driver_sql("LOCK TABLE equipment IN SHARE MODE")
+
+        available = func.sum(case((Equipment.is_available == True, 1), else_=0))
+        stored = EquipmentCategoryCounter
+        statement = union_all(
+            select(literal("expected"), literal(SCOPE_OWNER), Equipment.owner_id, Equipment.category,
+                   func.count(), available, null())
+            .where(Equipment.owner_id.isnot(None))
+            .group_by(Equipment.owner_id, Equipment.category),
+            select(literal("expected"), literal(SCOPE_TEAM), cast(Equipment.team_id, String), Equipment.category,
+                   func.count(), available, null())
+            .where(Equipment.team_id.isnot(None))
+            .group_by(Equipment.team_id, Equipment.category),
+            select(literal("stored"), stored.scope, stored.scope_id, stored.category,
+                   stored.total, stored.available, null()),
+            select(literal("stored"), EquipmentCounter.scope, EquipmentCounter.scope_id, null(),
+                   EquipmentCounter.total, EquipmentCounter.available, EquipmentCounter.categories),
+        )
+
+        expected, actual = {}, {}
+        expected_totals = defaultdict(lambda: [0, 0, 0])
+        for source, scope, scope_id, category, total, available_count, categories in db.execute(statement):
+            if source == "expected":
+                expected[(scope, scope_id, category)] = (total, available_count)
+                scope_totals = expected_totals[(scope, scope_id)]
+                scope_totals[0] += total
+                scope_totals[1] += available_count
+                scope_totals[2] += 1
+            elif category is None:
+                actual[(scope, scope_id, None)] = (total, available_count, categories)
+            else:
+                actual[(scope, scope_id, category)] = (total, available_count)
+        for (scope, scope_id), scope_totals in expected_totals.items():
+            expected[(scope, scope_id, None)] = tuple(scope_totals)
+
+        drift = []
+        for key in sorted(set(expected) | set(actual), key=lambda k: (k[0], k[1], k[2] or "")):
+            zero = (0, 0, 0) if key[2] is None else (0, 0)
+            want, have = expected.get(key, zero), actual.get(key, zero)
+            if want != have:
+                fields = ("total", "available", "categories")
+                drift.append({
+                    "scope": key[0],
+                    "scope_id": key[1],
+                    "category": key[2],
+                    "expected": dict(zip(fields, want)),
+                    "actual": dict(zip(fields, have)),
+                })
+
+        if repair and drift:
+            db.execute(delete(EquipmentCategoryCounter))
+            db.execute(delete(EquipmentCounter))
+            category_rows = [
+                {"scope": s, "scope_id": sid, "category": c, "total": counts[0], "available": counts[1]}
+                for (s, sid, c), counts in expected.items() if c is not None
+            ]
+            total_rows = [
+                {"scope": s, "scope_id": sid, "total": counts[0], "available": counts[1], "categories": counts[2]}
+                for (s, sid, c), counts in expected.items() if c is None
+            ]
+            if category_rows:
+                db.execute(EquipmentCategoryCounter.__table__.insert(), category_rows)
+            if total_rows:
+                db.execute(EquipmentCounter.__table__.insert(), total_rows)
+        db.commit()
+
+        return {
+            "counters_checked": len(set(expected) | set(actual)),
+            "drift": drift,
+            "repaired": repair and bool(drift),
+        }
@@ -0,0 +1,99 @@
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import lookup_cache
+from app.models.equipment import Equipment
+
+PENDING_KEY = "lookup_cache_invalidations"
+
+
+def categories_key(owner_id: Optional[str] = None, team_id: Optional[int] = None) -> str:
+    if owner_id:
+        return f"equipment:categories:owner:{owner_id}"
+    if team_id is not None:
+        return f"equipment:categories:team:{team_id}"
+    return "equipment:categories:all"
+
+
+def equipment_lookup_keys(owner_id: Optional[str], team_id: Optional[int]) -> List[str]:
+    """Cached lookups that an equipment row with this owner and team appears in."""
+    keys = [categories_key()]
+    if owner_id:
+        keys.append(categories_key(owner_id=owner_id))
+    if team_id is not None:
+        keys.append(categories_key(team_id=team_id))
+    return keys
+
+
+def queue_invalidation(session: Session, keys: Iterable[str]) -> None:
+    """
+    Invalidate ``keys`` once ``session`` commits (dropped on rollback).
+
+    ORM writes to equipment are queued by the mapper events below; Core/bulk
+    writes must call this themselves.
+    """
+    session.info.setdefault(PENDING_KEY, set()).update(keys)
+
+
+# Columns the cached lookups are built from; updates touching none of them
+# (availability flips, renames) leave the lookups as they are
+LOOKUP_COLUMNS = ("owner_id", "team_id", "category")
+
+
+def _queue_row(mapper, connection, target):
+    state = inspect(target)
+    owners = {target.owner_id, *state.attrs.owner_id.history.deleted}
+    teams = {target.team_id, *state.attrs.team_id.history.deleted}
+    keys: Set[str] = set()
+    for owner_id in owners:
+        for team_id in teams:
+            keys.update(equipment_lookup_keys(owner_id, team_id))
+    queue_invalidation(state.session, keys)
+
+
+def _queue_updated_row(mapper, connection, target):
+    state = inspect(target)
+    if any(getattr(state.attrs, attr).history.has_changes() for attr in LOOKUP_COLUMNS):
+        _queue_row(mapper, connection, target)
+
+
+event.listen(Equipment, "after_insert", _queue_row)
+event.listen(Equipment, "after_update", _queue_updated_row)
+event.listen(Equipment, "after_delete", _queue_row)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    keys = session.info.pop(PENDING_KEY, None)
+    if keys:
+        lookup_cache.invalidate(*sorted(keys))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop(PENDING_KEY, None)
+
+
+class EquipmentLookupService:
+
+    @staticmethod
+    def categories(db: Session, owner_id: Optional[str] = None, team_id: Optional[int] = None) -> List[str]:
+        """
+        Distinct equipment categories, overall or for one owner or team.
+
+        Single-scope lists are cached; filtering by owner and team together
+        queries the table directly.
+        """
+        def load() -> List[str]:
+            query = select(Equipment.category).distinct()
+            if owner_id:
+                query = query.where(Equipment.owner_id == owner_id)
+            if team_id is not None:
+                query = query.where(Equipment.team_id == team_id)
+            return sorted(category for category in db.scalars(query) if category)
+
+        if owner_id and team_id is not None:
+            return load()
+        return lookup_cache.get_or_load(categories_key(owner_id, team_id), load)
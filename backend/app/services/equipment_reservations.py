@@ -0,0 +1,143 @@
+from datetime import datetime
+from sqlalchemy import DateTime, Integer, Text, delete, exists, insert, literal, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.models.checkout import EquipmentCheckout
+from app.models.equipment import Equipment
+from app.models.reservation import MAX_RESERVATION, EquipmentReservation
+from app.utils.timestamps import utc_naive
+
+
+class ReservationConflict(Exception):
+    """Raised when a requested window overlaps another booking or an open checkout."""
+
+
+def overlapping(starts_at: datetime, ends_at: datetime, equipment_id=Equipment.id) -> list:
+    """
+    Criteria for the item's reservations that overlap [starts_at, ends_at).
+
+    The ``starts_at`` lower bound follows from MAX_RESERVATION and keeps the
+    search a short range scan on (equipment_id, starts_at), however long the
+    item's booking history.
+    """
+    return [
+        EquipmentReservation.equipment_id == equipment_id,
+        EquipmentReservation.starts_at > starts_at - MAX_RESERVATION,
+        EquipmentReservation.starts_at < ends_at,
+        EquipmentReservation.ends_at > starts_at,
+    ]
+
+
+def checked_out_during(starts_at: datetime, equipment_id=Equipment.id):
+    """Whether the item is checked out and not due back before ``starts_at`` (open-ended without a due date)."""
+    return exists().where(
+        EquipmentCheckout.equipment_id == equipment_id,
+        EquipmentCheckout.is_active == True,
+        or_(EquipmentCheckout.due_date.is_(None), EquipmentCheckout.due_date > starts_at),
+    )
+
+
+def reserved_by_others(starts_at: datetime, ends_at: Optional[datetime], user_id: int, equipment_id=Equipment.id):
+    """
+    Whether someone other than ``user_id`` has the item booked during [starts_at, ends_at).
+
+    Without ``ends_at`` the window is open-ended, the way an open checkout
+    blocks every later booking in ``checked_out_during``.
+    """
+    return exists().where(
+        *overlapping(starts_at, ends_at or datetime.max, equipment_id),
+        EquipmentReservation.user_id != user_id,
+    )
+
+
+def free_during(starts_at: datetime, ends_at: datetime, equipment_id=Equipment.id) -> list:
+    """Criteria for an item being free for the whole window; correlates with ``equipment_id``."""
+    return [~exists().where(*overlapping(starts_at, ends_at, equipment_id)), ~checked_out_during(starts_at, equipment_id)]
+
+
+class EquipmentReservationService:
+    """
+    Booking equipment for future windows.
+
+    A reservation is written with one INSERT ... SELECT ... WHERE NOT EXISTS
+    (overlapping booking or open checkout), so the check and the write are
+    a single statement; on Postgres an exclusion constraint on
+    (equipment_id, tstzrange) also rejects overlaps that concurrent
+    transactions could not see.
+    """
+
+    @staticmethod
+    def reserve(
+        db: Session, equipment_id: int, user_id: int,
+        starts_at: datetime, ends_at: datetime, notes: Optional[str] = None,
+    ) -> Optional[EquipmentReservation]:
+        """
+        Book an item for [starts_at, ends_at).
+
+        Returns:
+            EquipmentReservation: The booking, or None if the item does not exist
+
+        Raises:
+            ReservationConflict: If the item is booked or checked out during the window
+        """
+        starts_at, ends_at = utc_naive(starts_at), utc_naive(ends_at)
+        candidate = select(
+            Equipment.id,
+            literal(user_id, Integer),
+            literal(starts_at, DateTime(timezone=True)),
+            literal(ends_at, DateTime(timezone=True)),
+            literal(notes, Text),
+        ).where(Equipment.id == equipment_id, *free_during(starts_at, ends_at))
+        try:
+            reservation = db.scalars(
+                insert(EquipmentReservation)
+                .from_select(["equipment_id", "user_id", "starts_at", "ends_at", "notes"], candidate)
+                .returning(EquipmentReservation)
+            ).one_or_none()
+            if reservation is None:
+                db.rollback()
+                if db.get(Equipment, equipment_id) is None:
+                    return None
+                raise ReservationConflict(f"Equipment {equipment_id} is not free for the whole window")
+            db.commit()
+            return reservation
+        except IntegrityError:
+            # Postgres exclusion constraint: a concurrent booking got there first
+            db.rollback()
+            raise ReservationConflict(f"Equipment {equipment_id} is not free for the whole window")
+        except Exception:
+            db.rollback()
+            raise
+
+    @staticmethod
+    def cancel(db: Session, equipment_id: int, reservation_id: int, user_id: Optional[int] = None) -> bool:
+        """
+        Delete a reservation; with ``user_id``, only if that user made it.
+
+        Returns:
+            bool: False if no such reservation (for that user) exists
+        """
+        statement = delete(EquipmentReservation).where(
+            EquipmentReservation.id == reservation_id, EquipmentReservation.equipment_id == equipment_id
+        )
+        if user_id is not None:
+            statement = statement.where(EquipmentReservation.user_id == user_id)
+        try:
+            deleted = db.execute(statement).rowcount
+            db.commit()
+            return deleted > 0
+        except Exception:
+            db.rollback()
+            raise
+
+    @staticmethod
+    def in_window(db: Session, equipment_id: int, starts_at: datetime, ends_at: datetime) -> List[EquipmentReservation]:
+        """The item's reservations overlapping [starts_at, ends_at), in start order."""
+        starts_at, ends_at = utc_naive(starts_at), utc_naive(ends_at)
+        return db.scalars(
+            select(EquipmentReservation)
+            .where(*overlapping(starts_at, ends_at, equipment_id))
+            .order_by(EquipmentReservation.starts_at)
+        ).all()
@@ -0,0 +1,144 @@
+from sqlalchemy import Boolean, DateTime, text
+from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+import html
+import re
+
+from app.utils.pagination import decode_cursor, encode_cursor
+
+# Column weights for ranking: name > brand/model > description/notes
+SQLITE_RANK = "-bm25(equipment_fts, 10.0, 4.0, 4.0, 1.0, 1.0)"
+MAX_TERMS = 8
+
+# The database marks matches with these; they become <mark> tags only after the
+# text around them is HTML-escaped, so equipment text can never inject markup
+MATCH_START, MATCH_END = "\x02", "\x03"
+
+
+def highlight(snippet: Optional[str]) -> Optional[str]:
+    """HTML-escape a snippet from the database and turn its match markers into <mark> tags."""
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(MATCH_START, "<mark>").replace(MATCH_END, "</mark>")
+
+
+class EquipmentSearchService:
+    """
+    Ranked full-text search over equipment name, brand, model, description and notes.
+
+    Backed by the FTS5 table on SQLite and the generated ``search_vector``
+    column on Postgres (alembic revision 006). Every term is matched as a
+    prefix, so partial words work for search-as-you-type.
+    """
+
+    CURSOR_SORT = "rank"
+
+    @staticmethod
+    def parse_terms(q: str) -> List[str]:
+        """Reduce free text to plain word tokens so user input can't break query syntax."""
+        return re.findall(r"\w+", q.lower())[:MAX_TERMS]
+
+    @staticmethod
+    def _filters(owner_id, team_id, category, available_only) -> Tuple[str, dict]:
+        clauses, params = [], {}
+        if owner_id:
+            clauses.append("e.owner_id = :owner_id")
+            params["owner_id"] = owner_id
+        if team_id is not None:
+            clauses.append("e.team_id = :team_id")
+            params["team_id"] = team_id
+        if category:
+            clauses.append("e.category = :category")
+            params["category"] = category
+        if available_only:
+            clauses.append("e.is_available = :is_available")
+            params["is_available"] = True
+        return "".join(f" AND {clause}" for clause in clauses), params
+
+    @staticmethod
+    def search(
+        db: Session,
+        q: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        owner_id: Optional[str] = None,
+        team_id: Optional[int] = None,
+        category: Optional[str] = None,
+        available_only: bool = False,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Search equipment, best matches first.
+
+        Returns:
+            (rows, next_cursor): Equipment rows as dicts with ``rank`` and a
+            ``snippet``: HTML-escaped text with the matches in <mark> tags
+
+        Raises:
+            InvalidCursor: If the cursor was not issued by this search
+        """
+        terms = EquipmentSearchService.parse_terms(q)
+        if not terms:
+            return [], None
+
+        filters, params = EquipmentSearchService._filters(owner_id, team_id, category, available_only)
+        params["limit"] = limit + 1
+
+        after = ""
+        if cursor:
+            params["after_rank"], params["after_id"] = decode_cursor(cursor, EquipmentSearchService.CURSOR_SORT)
+            after = "WHERE score < :after_rank OR (score = :after_rank AND id > :after_id)"
+
+        if db.get_bind().dialect.name == "postgresql":
+            params["match"] = " & ".join(f"{term}:*" for term in terms)
+            params["headline_options"] = (
+                f"StartSel={MATCH_START}, StopSel={MATCH_END}, MaxFragments=2, MaxWords=20, MinWords=5"
+            )
+            statement = f"""
+                SELECT page.*, ts_headline(
+                    'english',
+                    concat_ws(' ', page.name, page.brand, page.model, page.description, page.notes),
+                    query,
+                    :headline_options
+                ) AS snippet
+                FROM (
+                    SELECT * FROM (
+                        SELECT e.*, ts_rank_cd(e.search_vector, query) AS score
+                        FROM equipment e, to_tsquery('english', :match) AS query
+                        WHERE e.search_vector @@ query{filters}
+                    ) AS ranked
+                    {after}
+                    ORDER BY score DESC, id
+                    LIMIT :limit
+                ) AS page, to_tsquery('english', :match) AS query
+                ORDER BY page.score DESC, page.id
+            """
+        else:
+            params["match"] = " ".join(f'"{term}"*' for term in terms)
+            params["match_start"], params["match_end"] = MATCH_START, MATCH_END
+            statement = f"""
+                SELECT * FROM (
+                    SELECT e.*, {SQLITE_RANK} AS score,
+                           snippet(equipment_fts, -1, :match_start, :match_end, '…', 12) AS snippet
+                    FROM equipment_fts JOIN equipment e ON e.id = equipment_fts.rowid
+                    WHERE equipment_fts MATCH :match{filters}
+                ) AS ranked
+                {after}
+                ORDER BY score DESC, id
+                LIMIT :limit
+            """
+
+        typed = text(statement).columns(
+            created_at=DateTime(timezone=True),
+            updated_at=DateTime(timezone=True),
+            is_available=Boolean(),
+        )
+        rows = [dict(row._mapping) for row in db.execute(typed, params)]
+        for row in rows:
+            row["rank"] = row.pop("score")
+            row["snippet"] = highlight(row["snippet"])
+            row.pop("search_vector", None)
+
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, encode_cursor(EquipmentSearchService.CURSOR_SORT, rows[-1]["rank"], rows[-1]["id"])
@@ -0,0 +1,144 @@
+from sqlalchemy import delete, exists, select
+from sqlalchemy.orm import Session
+from typing import Iterable, Optional
+
+from app.models.checkout import EquipmentCheckout
+from app.models.equipment import Equipment
+from app.models.kit import kit_items
+from app.services.collection_versions import bump_versions, equipment_scopes
+from app.services.equipment_counters import TRACKED, Deltas, add_deltas, apply_deltas, new_deltas
+from app.services.equipment_lookups import equipment_lookup_keys, queue_invalidation
+from app.services.versioned_writes import delete_returning, update_returning
+
+TRACKED_COLUMNS = tuple(getattr(Equipment, attr) for attr in TRACKED)
+
+# Whether an equipment row has an active checkout (correlates with the enclosing query)
+CHECKED_OUT = exists().where(EquipmentCheckout.equipment_id == Equipment.id, EquipmentCheckout.is_active == True)
+
+
+class CheckoutConflict(Exception):
+    """Raised when a write does not fit an item's checkout state (e.g. checking out a checked-out item)."""
+
+
+def tracked_values(row) -> tuple:
+    return tuple(getattr(row, attr) for attr in TRACKED)
+
+
+def count_change(deltas: Deltas, lookup_keys: set, values: tuple, sign: int) -> None:
+    """Record a row entering (sign=1) or leaving (sign=-1) the counters and cached lookups."""
+    add_deltas(deltas, *values, sign=sign)
+    lookup_keys.update(equipment_lookup_keys(values[0], values[1]))
+
+
+def count_move(deltas: Deltas, lookup_keys: set, old: tuple, new: tuple) -> None:
+    """
+    Record a row's tracked values changing from ``old`` to ``new``.
+
+    Cached lookups (category lists) do not depend on availability, so a
+    change to ``is_available`` alone (checkout, check-in) leaves them be.
+    """
+    add_deltas(deltas, *old, sign=-1)
+    add_deltas(deltas, *new, sign=1)
+    if old[:3] != new[:3]:
+        lookup_keys.update(equipment_lookup_keys(old[0], old[1]))
+        lookup_keys.update(equipment_lookup_keys(new[0], new[1]))
+
+
+def drop_kit_links(db: Session, equipment_ids: Iterable[int]) -> None:
+    """
+    Take deleted items out of their kits. The foreign key cascades on
+    Postgres, but SQLite connections do not enforce foreign keys.
+    """
+    db.execute(delete(kit_items).where(kit_items.c.equipment_id.in_(list(equipment_ids))))
+
+
+def record_core_write(db: Session, deltas: Deltas, lookup_keys: set, rows: Iterable[tuple]) -> None:
+    """
+    What the flush hooks would have done for a Core write to equipment, in the same transaction.
+
+    ``rows`` are the tracked values of every row written, before and after
+    the write; their owner and team scopes get new versions.
+    """
+    apply_deltas(db.connection(), deltas)
+    queue_invalidation(db, lookup_keys)
+    bump_versions(db.connection(), {scope for row in rows for scope in equipment_scopes(row[0], row[1])})
+
+
+class EquipmentWriteService:
+    """
+    Single-item equipment updates and deletes, one statement each.
+
+    An update only reads the row first when it changes a counted column
+    (owner, team, category, availability): RETURNING yields the new values,
+    and the counters also need the old ones. A checked-out item cannot be
+    made available by hand; checking it in does that.
+    """
+
+    @staticmethod
+    def update(db: Session, equipment_id: int, data: dict, version: Optional[int] = None) -> Optional[Equipment]:
+        """
+        Apply a partial update, optionally only if the item is still at ``version``.
+
+        Returns:
+            Equipment: The updated item, or None if it does not exist
+
+        Raises:
+            VersionConflict: If the item exists at another version
+            CheckoutConflict: If it would make a checked-out item available
+            IntegrityError: If the serial number is taken
+        """
+        try:
+            old = None
+            if any(attr in data for attr in TRACKED):
+                row = db.execute(
+                    select(*TRACKED_COLUMNS, CHECKED_OUT).where(Equipment.id == equipment_id).with_for_update()
+                ).one_or_none()
+                if row is None:
+                    db.rollback()
+                    return None
+                *old, checked_out = row
+                if checked_out and data.get("is_available"):
+                    raise CheckoutConflict(f"Equipment {equipment_id} is checked out; check it in instead")
+
+            equipment = update_returning(db, Equipment, equipment_id, data, version)
+            if equipment is None:
+                db.rollback()
+                return None
+
+            deltas, lookup_keys, rows = new_deltas(), set(), [tracked_values(equipment)]
+            if old is not None and tuple(old) != tracked_values(equipment):
+                count_move(deltas, lookup_keys, tuple(old), tracked_values(equipment))
+                rows.append(tuple(old))
+            record_core_write(db, deltas, lookup_keys, rows)
+            db.commit()
+            return equipment
+        except Exception:
+            db.rollback()
+            raise
+
+    @staticmethod
+    def delete(db: Session, equipment_id: int, version: Optional[int] = None) -> bool:
+        """
+        Delete an item, optionally only if it is still at ``version``.
+
+        Returns:
+            bool: False if the item does not exist
+
+        Raises:
+            VersionConflict: If the item exists at another version
+        """
+        try:
+            row = delete_returning(db, Equipment, equipment_id, TRACKED_COLUMNS, version)
+            if row is None:
+                db.rollback()
+                return False
+
+            deltas, lookup_keys = new_deltas(), set()
+            count_change(deltas, lookup_keys, tuple(row), sign=-1)
+            drop_kit_links(db, [equipment_id])
+            record_core_write(db, deltas, lookup_keys, [tuple(row)])
+            db.commit()
+            return True
+        except Exception:
+            db.rollback()
+            raise
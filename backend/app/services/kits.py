@@ -0,0 +1,104 @@
+from sqlalchemy import delete, exists, insert, select
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional
+
+from app.models.checkout import EquipmentCheckout
+from app.models.equipment import Equipment
+from app.models.kit import Kit, kit_items
+from app.schemas.kit import KitCreate, KitUpdate
+from app.services.equipment_writes import CheckoutConflict
+
+
+class UnknownEquipment(Exception):
+    """Raised when a kit would include items that do not exist."""
+
+    def __init__(self, equipment_ids: List[int]):
+        super().__init__(f"Equipment {', '.join(map(str, equipment_ids))} not found")
+        self.equipment_ids = equipment_ids
+
+
+def _kit_query():
+    return select(Kit).options(selectinload(Kit.equipment))
+
+
+def _set_items(db: Session, kit_id: int, equipment_ids: List[int]) -> None:
+    """Replace the kit's items with ``equipment_ids`` (one multi-row INSERT)."""
+    equipment_ids = sorted(set(equipment_ids))
+    found = set(db.scalars(select(Equipment.id).where(Equipment.id.in_(equipment_ids))))
+    if len(found) < len(equipment_ids):
+        raise UnknownEquipment([i for i in equipment_ids if i not in found])
+    db.execute(delete(kit_items).where(kit_items.c.kit_id == kit_id))
+    db.execute(insert(kit_items), [{"kit_id": kit_id, "equipment_id": i} for i in equipment_ids])
+
+
+class KitService:
+    """Kits: named groups of equipment. Checking them out is EquipmentCheckoutService's job."""
+
+    @staticmethod
+    def create(db: Session, data: KitCreate, user_id: int) -> Kit:
+        """
+        Raises:
+            UnknownEquipment: If any of ``data.equipment_ids`` does not exist
+        """
+        try:
+            kit = Kit(**data.model_dump(exclude={"equipment_ids"}), created_by_user_id=user_id)
+            db.add(kit)
+            db.flush()
+            _set_items(db, kit.id, data.equipment_ids)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return KitService.get(db, kit.id)
+
+    @staticmethod
+    def get(db: Session, kit_id: int) -> Optional[Kit]:
+        return db.scalars(
+            _kit_query().where(Kit.id == kit_id).execution_options(populate_existing=True)
+        ).one_or_none()
+
+    @staticmethod
+    def update(db: Session, kit_id: int, data: KitUpdate) -> Optional[Kit]:
+        """
+        Apply a partial update; ``equipment_ids`` replaces the kit's items.
+
+        Items of an open kit checkout stay checked out; adding items to a
+        checked-out kit does not check them out.
+
+        Raises:
+            UnknownEquipment: If any of ``data.equipment_ids`` does not exist
+        """
+        try:
+            kit = db.get(Kit, kit_id)
+            if kit is None:
+                return None
+            values = data.model_dump(exclude_unset=True, exclude={"equipment_ids"})
+            for field, value in values.items():
+                setattr(kit, field, value)
+            if data.equipment_ids is not None:
+                _set_items(db, kit_id, data.equipment_ids)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return KitService.get(db, kit_id)
+
+    @staticmethod
+    def delete(db: Session, kit_id: int) -> bool:
+        """
+        Delete a kit; its items are untouched.
+
+        Raises:
+            CheckoutConflict: If some of the kit is still checked out
+        """
+        try:
+            if db.scalar(select(exists().where(EquipmentCheckout.kit_id == kit_id, EquipmentCheckout.is_active == True))):
+                raise CheckoutConflict(f"Kit {kit_id} is checked out; check it in first")
+            # No cascade on SQLite; a later kit could reuse the id and inherit the links
+            db.execute(delete(kit_items).where(kit_items.c.kit_id == kit_id))
+            deleted = db.execute(delete(Kit).where(Kit.id == kit_id)).rowcount
+            db.commit()
+            return deleted > 0
+        except Exception:
+            db.rollback()
+            raise
@@ -0,0 +1,165 @@
+"""
+Per-worker index of team memberships: user_id -> {team_id: role}.
+
+Permission checks run before every guarded team write and used to cost a
+query each. The index answers them from memory: a user's whole role map is
+loaded with one query on first use (or primed by ``teams``, which also
+returns the Team rows), so a check for any team, including "not a member",
+is a dictionary lookup afterwards.
+
+Writes to TeamMembership drop the affected users once their transaction
+commits:
+
+- ORM inserts, updates and deletes through the mapper events below;
+- Core UPDATE/DELETE statements on team_memberships run through a Session
+  (``update(TeamMembership)...``) through ``do_orm_execute``. Their rows are
+  not known up front, so they drop the whole index.
+
+Other workers only see a change once their entry expires, so ``ttl`` bounds
+how long a revoked role can still pass a check elsewhere.
+"""
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+import threading
+import time
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.team import Team, TeamMembership
+
+PENDING_KEY = "membership_index_invalidations"
+EVERYONE = "*"
+
+
+class MembershipIndex:
+    """Bounded TTL/LRU cache of user_id -> {team_id: role}."""
+
+    def __init__(self, max_users: int = 10000, ttl: int = 60):
+        self.max_users = max_users
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, Tuple[Dict[int, str], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; a load that raced one is not stored
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _get(self, user_id: int) -> Optional[Dict[int, str]]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1] <= time.time():
+                del self._entries[user_id]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[0]
+
+    def _put(self, user_id: int, roles: Dict[int, str], generation: int) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[user_id] = (roles, time.time() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def roles(self, db: Session, user_id: int) -> Dict[int, str]:
+        """The user's role in each of their teams (active or not)."""
+        roles = self._get(user_id)
+        if roles is None:
+            generation = self._generation
+            roles = dict(db.execute(
+                select(TeamMembership.team_id, TeamMembership.role).where(TeamMembership.user_id == user_id)
+            ).all())
+            self._put(user_id, roles, generation)
+        return roles
+
+    def role(self, db: Session, user_id: int, team_id: int) -> Optional[str]:
+        return self.roles(db, user_id).get(team_id)
+
+    def teams(self, db: Session, user_id: int) -> List[Team]:
+        """The user's active teams, in one joined query that also refreshes their role map."""
+        generation = self._generation
+        rows = db.execute(
+            select(Team, TeamMembership.role)
+            .join(TeamMembership, TeamMembership.team_id == Team.id)
+            .where(TeamMembership.user_id == user_id)
+            .order_by(Team.id)
+        ).all()
+        self._put(user_id, {team.id: role for team, role in rows}, generation)
+        return [team for team, _ in rows if team.is_active]
+
+    def invalidate(self, user_ids: Iterable) -> None:
+        """Drop the given users, or everyone if ``user_ids`` contains EVERYONE."""
+        user_ids = set(user_ids)
+        with self._lock:
+            self._generation += 1
+            if EVERYONE in user_ids:
+                self._entries.clear()
+            else:
+                for user_id in user_ids:
+                    self._entries.pop(user_id, None)
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self.invalidate([EVERYONE])
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "users": len(self._entries),
+            "max_users": self.max_users,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+membership_index = MembershipIndex(
+    max_users=settings.MEMBERSHIP_CACHE_MAX_USERS,
+    ttl=settings.MEMBERSHIP_CACHE_TTL,
+)
+
+
+def queue_invalidation(session: Session, user_ids: Iterable) -> None:
+    """Drop ``user_ids`` from the index once ``session`` commits (dropped on rollback)."""
+    session.info.setdefault(PENDING_KEY, set()).update(user_ids)
+
+
+def _queue_row(mapper, connection, target):
+    state = inspect(target)
+    queue_invalidation(state.session, {target.user_id, *state.attrs.user_id.history.deleted})
+
+
+for _event in ("after_insert", "after_update", "after_delete"):
+    event.listen(TeamMembership, _event, _queue_row)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _queue_bulk_write(orm_execute_state):
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) \
+            and orm_execute_state.bind_mapper is inspect(TeamMembership):
+        queue_invalidation(orm_execute_state.session, [EVERYONE])
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    user_ids = session.info.pop(PENDING_KEY, None)
+    if user_ids:
+        membership_index.invalidate(user_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop(PENDING_KEY, None)
@@ -0,0 +1,80 @@
+from datetime import datetime
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.models.checkout import EquipmentCheckout
+from app.models.equipment import Equipment
+from app.models.team import Team, TeamInvitation, TeamMembership
+
+
+class TeamDashboardService:
+    """
+    Everything a team page shows, in five statements whatever the team's size.
+
+    Members, invitations, equipment and checkouts are each one aggregate
+    (GROUP BY or COUNT) over the team's rows, so nothing is loaded into
+    ORM collections and the response stays small.
+    """
+
+    @staticmethod
+    def build(db: Session, team_id: int, now: Optional[datetime] = None) -> Optional[dict]:
+        """
+        Returns:
+            dict: The dashboard (see schemas.team.TeamDashboard), or None if the team does not exist or is inactive
+        """
+        now = now or datetime.utcnow()
+        team = db.scalar(select(Team).where(Team.id == team_id, Team.is_active == True))
+        if team is None:
+            return None
+
+        by_role = dict(db.execute(
+            select(TeamMembership.role, func.count())
+            .where(TeamMembership.team_id == team_id)
+            .group_by(TeamMembership.role)
+        ).all())
+
+        pending_invitations = db.scalar(
+            select(func.count()).select_from(TeamInvitation).where(
+                TeamInvitation.team_id == team_id,
+                TeamInvitation.is_accepted == False,
+                TeamInvitation.expires_at >= now,
+            )
+        )
+
+        by_category, by_condition = {}, {}
+        total = available = 0
+        for category, condition, is_available, count in db.execute(
+            select(Equipment.category, Equipment.condition, Equipment.is_available, func.count())
+            .where(Equipment.team_id == team_id)
+            .group_by(Equipment.category, Equipment.condition, Equipment.is_available)
+        ):
+            counts = by_category.setdefault(category, {"total": 0, "available": 0})
+            counts["total"] += count
+            condition = condition or "unknown"
+            by_condition[condition] = by_condition.get(condition, 0) + count
+            total += count
+            if is_available:
+                counts["available"] += count
+                available += count
+
+        active, overdue = db.execute(
+            select(func.count(), func.coalesce(func.sum(case((EquipmentCheckout.due_date < now, 1), else_=0)), 0))
+            .select_from(EquipmentCheckout)
+            .join(Equipment, Equipment.id == EquipmentCheckout.equipment_id)
+            .where(Equipment.team_id == team_id, EquipmentCheckout.is_active == True)
+        ).one()
+
+        return {
+            "team": team,
+            "members": {"total": sum(by_role.values()), "by_role": by_role},
+            "pending_invitations": pending_invitations,
+            "equipment": {
+                "total_items": total,
+                "available_items": available,
+                "in_use_items": total - available,
+                "by_category": dict(sorted(by_category.items())),
+                "by_condition": dict(sorted(by_condition.items())),
+            },
+            "checkouts": {"active": active, "overdue": overdue},
+        }
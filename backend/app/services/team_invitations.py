@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from typing import List, NamedTuple, Optional
+import secrets
+
+from app.models.team import TeamInvitation, TeamMembership
+from app.models.user import User
+from app.schemas.team import InvitationStatus
+from app.services.collection_versions import bump_versions, team_scope
+
+INVITATION_TTL = timedelta(days=7)
+
+
+class InvitationResult(NamedTuple):
+    email: str
+    status: InvitationStatus
+    invitation: Optional[TeamInvitation] = None  # Only for INVITED
+
+
+class TeamInvitationService:
+    """
+    Invitations for many emails at once.
+
+    The checks POST /teams/{id}/invitations makes per email (already a
+    member? already invited?) are one IN query each here, and the new rows
+    go in with a single INSERT ... RETURNING, so the statement count does
+    not grow with the number of emails.
+    """
+
+    @staticmethod
+    def invite_many(
+        db: Session, team_id: int, emails: List[str], role: str, invited_by_user_id: int,
+        now: Optional[datetime] = None,
+    ) -> List[InvitationResult]:
+        """
+        Invite every email that is not a member, not already invited and not
+        listed earlier in ``emails``; the caller has checked the team and the
+        inviter's role. ``invited_by_user_id`` is the inviter's ``users.id``
+        (``UserSnapshot.id``), not their Auth0 subject.
+
+        Returns:
+            list: An InvitationResult for each of ``emails``, in order
+        """
+        now = now or datetime.utcnow()
+        wanted = set(emails)
+        members = set(db.scalars(
+            select(User.email)
+            .join(TeamMembership, TeamMembership.user_id == User.id)
+            .where(TeamMembership.team_id == team_id, User.email.in_(wanted))
+        ))
+        pending = set(db.scalars(
+            select(TeamInvitation.email).where(
+                TeamInvitation.team_id == team_id,
+                TeamInvitation.email.in_(wanted - members),
+                TeamInvitation.is_accepted == False,
+                TeamInvitation.expires_at > now,
+            )
+        ))
+
+        statuses, seen = [], set()
+        for email in emails:
+            if email in seen:
+                statuses.append(InvitationStatus.DUPLICATE)
+            elif email in members:
+                statuses.append(InvitationStatus.ALREADY_MEMBER)
+            elif email in pending:
+                statuses.append(InvitationStatus.ALREADY_INVITED)
+            else:
+                statuses.append(InvitationStatus.INVITED)
+            seen.add(email)
+
+        new = [email for email, status in zip(emails, statuses) if status == InvitationStatus.INVITED]
+        invitations = {}
+        if new:
+            tokens = [secrets.token_urlsafe(32) for _ in new]
+            try:
+                # RETURNING rows need not come back in parameter order; tokens are unique, so match on them
+                by_token = {
+                    invitation.token: invitation
+                    for invitation in db.scalars(insert(TeamInvitation).returning(TeamInvitation), [
+                        {
+                            "email": email, "team_id": team_id, "role": role, "token": token,
+                            "expires_at": now + INVITATION_TTL, "invited_by_user_id": invited_by_user_id,
+                        }
+                        for email, token in zip(new, tokens)
+                    ])
+                }
+                bump_versions(db.connection(), [team_scope(team_id)])
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            invitations = {email: by_token[token] for email, token in zip(new, tokens)}
+
+        return [
+            InvitationResult(email, status, invitations.get(email) if status == InvitationStatus.INVITED else None)
+            for email, status in zip(emails, statuses)
+        ]
@@ -1,8 +1,12 @@
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.models.team import Team, TeamMembership, TeamInvitation
 from app.models.user import User
 from app.schemas.team import TeamCreate, TeamUpdate
+from app.services.collection_versions import bump_versions, team_scope
+from app.services.membership_index import membership_index
+from app.services.versioned_writes import update_returning
 from datetime import datetime
 
 class TeamService:
@@ -42,11 +46,6 @@ class TeamService:
             db.rollback()
             raise e
     
-    @staticmethod
-    def get_all_teams(db: Session) -> List[Team]:
-        """Get all teams."""
-        return db.query(Team).filter(Team.is_active == True).all()
-    
     @staticmethod
     def get_team_by_id(team_id: int, db: Session) -> Optional[Team]:
         """Get a team by ID."""
@@ -58,28 +57,83 @@ class TeamService:
     @staticmethod
     def update_team(team_id: int, team_update: TeamUpdate, db: Session) -> Optional[Team]:
         """
-        Update a team.
+        Update a team in one UPDATE ... RETURNING.
         
         Args:
             team_id: ID of team to update
-            team_update: Update data
+            team_update: Update data; with ``version``, applied only if the team is still at it
             db: Database session
             
         Returns:
             Team: Updated team or None if not found
-        """
-        team = TeamService.get_team_by_id(team_id, db)
-        if not team:
-            return None
             
+        Raises:
+            VersionConflict: If the team exists at another version
+        """
         # Update only provided fields
-        for key, value in team_update.dict(exclude_unset=True).items():
-            setattr(team, key, value)
+        values = team_update.model_dump(exclude_unset=True)
+        version = values.pop("version", None)
+        values["updated_at"] = datetime.utcnow()
         
-        team.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(team)
-        return team
+        return TeamService._commit_returning(
+            db, lambda: update_returning(db, Team, team_id, values, version, Team.is_active == True)
+        )
+    
+    @staticmethod
+    def update_membership(team_id: int, user_id: int, values: dict, db: Session) -> Optional[TeamMembership]:
+        """
+        Update a member's role in one UPDATE ... RETURNING.
+        
+        Returns:
+            TeamMembership: Updated membership or None if the user is not in the team
+        """
+        statement = update(TeamMembership).where(
+            TeamMembership.team_id == team_id,
+            TeamMembership.user_id == user_id
+        )
+        return TeamService._commit_returning(db, lambda: TeamService._returning(db, statement, TeamMembership, values))
+    
+    @staticmethod
+    def update_invitation(invitation_id: int, values: dict, db: Session) -> Optional[TeamInvitation]:
+        """
+        Update a pending invitation in one UPDATE ... RETURNING.
+        
+        Returns:
+            TeamInvitation: Updated invitation, or None if it does not exist,
+            was accepted or has expired
+        """
+        statement = update(TeamInvitation).where(
+            TeamInvitation.id == invitation_id,
+            TeamInvitation.is_accepted == False,
+            TeamInvitation.expires_at >= datetime.utcnow()
+        )
+        return TeamService._commit_returning(db, lambda: TeamService._returning(db, statement, TeamInvitation, values))
+    
+    @staticmethod
+    def _returning(db: Session, statement, model, values: dict):
+        if values:
+            statement = statement.values(**values)
+        else:
+            # Nothing to change; a no-op SET still tells us whether the row matched
+            statement = statement.values({model.id: model.id})
+        return db.scalars(
+            statement.returning(model).execution_options(populate_existing=True, synchronize_session=False)
+        ).one_or_none()
+    
+    @staticmethod
+    def _commit_returning(db: Session, write):
+        """Run a Core write that returns the row, bump its team's version and commit."""
+        try:
+            obj = write()
+            if obj is None:
+                db.rollback()
+                return None
+            bump_versions(db.connection(), [team_scope(obj.id if isinstance(obj, Team) else obj.team_id)])
+            db.commit()
+            return obj
+        except Exception:
+            db.rollback()
+            raise
     
     @staticmethod
     def delete_team(team_id: int, current_user: User, db: Session) -> bool:
@@ -100,13 +154,7 @@ class TeamService:
             return False
         
         # Check if current user is team owner
-        membership = db.query(TeamMembership).filter(
-            TeamMembership.team_id == team_id,
-            TeamMembership.user_id == current_user.id,
-            TeamMembership.role == "owner"
-        ).first()
-        
-        if not membership:
+        if not TeamService.check_user_team_permission(current_user.id, team_id, ["owner"], db):
             return False
         
         # Soft delete (mark as inactive)
@@ -118,16 +166,8 @@ class TeamService:
     
     @staticmethod
     def get_user_teams(user_id: int, db: Session) -> List[Team]:
-        """Get all teams a user is a member of."""
-        memberships = db.query(TeamMembership).filter(
-            TeamMembership.user_id == user_id
-        ).all()
-        
-        team_ids = [m.team_id for m in memberships]
-        return db.query(Team).filter(
-            Team.id.in_(team_ids),
-            Team.is_active == True
-        ).all()
+        """Get all active teams a user is a member of (one joined query)."""
+        return membership_index.teams(db, user_id)
     
     @staticmethod
     def check_user_team_permission(user_id: int, team_id: int, required_roles: List[str], db: Session) -> bool:
@@ -138,15 +178,9 @@ class TeamService:
             user_id: User ID to check
             team_id: Team ID to check
             required_roles: List of roles that grant permission (e.g., ["owner", "admin"])
-            db: Database session
+            db: Database session (only queried when the user's roles are not cached)
             
         Returns:
             bool: True if user has permission
         """
-        membership = db.query(TeamMembership).filter(
-            TeamMembership.user_id == user_id,
-            TeamMembership.team_id == team_id,
-            TeamMembership.role.in_(required_roles)
-        ).first()
-        
-        return membership is not None
+        return membership_index.role(db, user_id, team_id) in required_roles
@@ -0,0 +1,201 @@
+from jose import jwt, JWTError
+from typing import Dict, Optional
+import asyncio
+import time
+import httpx
+
+from app.core.config import settings
+from app.core.http import Auth0HttpClient, auth0_http
+
+
+class TokenVerificationError(Exception):
+    """Raised when an access token cannot be verified."""
+
+
+class JWKSCache:
+    """
+    Caches the signing keys published at an Auth0 JWKS endpoint, indexed by kid.
+
+    The document is refetched when it is older than ``ttl`` seconds, or when a
+    token arrives with a kid we have not seen (Auth0 key rotation). Refetches
+    triggered by unknown kids are rate limited so forged tokens cannot be used
+    to hammer the JWKS endpoint.
+    """
+
+    def __init__(
+        self,
+        jwks_url: str,
+        ttl: int = 3600,
+        min_refresh_interval: int = 30,
+        http: Auth0HttpClient = auth0_http,
+    ):
+        self.jwks_url = jwks_url
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.http = http
+        self._keys: Dict[str, dict] = {}
+        self._fetched_at: Optional[float] = None
+        self._refreshing: Optional[asyncio.Future] = None
+
+    async def _fetch(self) -> None:
+        response = await self.http.get(self.jwks_url)
+        response.raise_for_status()
+        keys = {
+            key["kid"]: key
+            for key in response.json().get("keys", [])
+            if key.get("kid") and key.get("use", "sig") == "sig"
+        }
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+
+    async def _refresh(self) -> None:
+        # Concurrent refreshes share one fetch
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.ensure_future(self._fetch())
+        await asyncio.shield(self._refreshing)
+
+    def _age(self) -> float:
+        if self._fetched_at is None:
+            return float("inf")
+        return time.monotonic() - self._fetched_at
+
+    async def get_signing_key(self, kid: str) -> dict:
+        """Return the JWK for ``kid``, refetching the JWKS when stale or on rotation."""
+        try:
+            if self._age() > self.ttl:
+                await self._refresh()
+            elif kid not in self._keys and self._age() >= self.min_refresh_interval:
+                await self._refresh()
+        except httpx.HTTPError:
+            # Keep serving the keys we already have if Auth0 is unreachable
+            if not self._keys:
+                raise
+
+        key = self._keys.get(kid)
+        if key is None:
+            raise TokenVerificationError(f"Unknown signing key: {kid}")
+        return key
+
+
+class TokenVerifier:
+    """
+    Verifies Auth0 access tokens locally (RS256 against the cached JWKS).
+
+    /userinfo is only called when the verified claims do not carry the
+    profile fields we need, or for tokens that cannot be verified locally:
+    opaque ones, and every token when no audience is configured. Without an
+    audience to check, a locally verified signature would also accept ID
+    tokens and tokens minted for other APIs, so Auth0 has to vouch for them.
+    """
+
+    PROFILE_CLAIMS = ("email", "name")
+    ALGORITHMS = ["RS256"]
+
+    def __init__(
+        self,
+        domain: str,
+        audience: Optional[str] = None,
+        jwks_url: Optional[str] = None,
+        userinfo_url: Optional[str] = None,
+        issuer: Optional[str] = None,
+        jwks_cache_ttl: int = 3600,
+        jwks_min_refresh_interval: int = 30,
+        http: Auth0HttpClient = auth0_http,
+    ):
+        self.http = http
+        self.audience = audience
+        self.issuer = issuer or f"https://{domain}/"
+        self.userinfo_url = userinfo_url or f"https://{domain}/userinfo"
+        self.jwks = JWKSCache(
+            jwks_url or f"https://{domain}/.well-known/jwks.json",
+            ttl=jwks_cache_ttl,
+            min_refresh_interval=jwks_min_refresh_interval,
+            http=http,
+        )
+
+    @staticmethod
+    def is_jws(token: str) -> bool:
+        """Auth0 issues opaque tokens when no audience is requested; only JWS can be verified."""
+        return token.count(".") == 2
+
+    async def verify(self, token: str) -> dict:
+        """
+        Verify the token signature and standard claims.
+
+        Returns:
+            dict: The verified token claims
+
+        Raises:
+            TokenVerificationError: If the token is malformed, expired, not signed by Auth0
+                or not for our audience (always, when none is configured)
+        """
+        if self.audience is None:
+            raise TokenVerificationError("No audience configured; tokens cannot be verified locally")
+        try:
+            header = jwt.get_unverified_header(token)
+        except JWTError as e:
+            raise TokenVerificationError("Malformed token") from e
+
+        if header.get("alg") not in self.ALGORITHMS:
+            raise TokenVerificationError(f"Unsupported signing algorithm: {header.get('alg')}")
+        kid = header.get("kid")
+        if not kid:
+            raise TokenVerificationError("Token header has no kid")
+
+        key = await self.jwks.get_signing_key(kid)
+        try:
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=self.ALGORITHMS,
+                audience=self.audience,
+                issuer=self.issuer,
+                options={"verify_at_hash": False},
+            )
+        except JWTError as e:
+            raise TokenVerificationError(str(e)) from e
+
+        if not claims.get("sub"):
+            raise TokenVerificationError("Token has no subject")
+        return claims
+
+    async def fetch_user_info(self, token: str) -> dict:
+        """Fetch the user profile from Auth0's /userinfo endpoint."""
+        response = await self.http.get(
+            self.userinfo_url,
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        if response.status_code != 200:
+            raise TokenVerificationError("Could not retrieve user information from Auth0")
+        return response.json()
+
+    async def get_claims(self, token: str) -> dict:
+        """Return the identity claims for a token, verifying locally when possible."""
+        if self.audience is None or not self.is_jws(token):
+            return await self.fetch_user_info(token)
+        return await self.verify(token)
+
+    async def get_user_info(self, token: str, claims: Optional[dict] = None) -> dict:
+        """
+        Return the user's profile, going to /userinfo only if profile claims are missing.
+
+        Args:
+            token: Raw bearer token
+            claims: Already verified claims for the token (optional)
+        """
+        claims = claims if claims is not None else await self.get_claims(token)
+        if all(claims.get(claim) for claim in self.PROFILE_CLAIMS):
+            return claims
+
+        user_info = await self.fetch_user_info(token)
+        if user_info.get("sub") != claims.get("sub"):
+            raise TokenVerificationError("Auth0 profile does not match token subject")
+        return {**claims, **user_info}
+
+
+token_verifier = TokenVerifier(
+    settings.AUTH0_DOMAIN,
+    audience=settings.AUTH0_AUDIENCE,
+    jwks_cache_ttl=settings.AUTH0_JWKS_CACHE_TTL,
+    jwks_min_refresh_interval=settings.AUTH0_JWKS_MIN_REFRESH_INTERVAL,
+)
@@ -0,0 +1,77 @@
+"""
+Single-statement writes with optimistic concurrency.
+
+``UPDATE ... WHERE id = :id AND version = :version RETURNING *`` replaces
+the load / mutate / flush / refresh sequence of an ORM write: one round trip
+instead of three, and a concurrent editor's change can no longer be
+silently overwritten. When the client sends no version the write is
+unconditional (last write wins), as before.
+
+These statements bypass flush hooks, so callers keep counters, cached
+lookups and collection versions up to date themselves, as the bulk
+equipment service does.
+"""
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+
+class VersionConflict(Exception):
+    """Raised when a row exists but is no longer at the version the client last read."""
+
+    def __init__(self, model, row_id: int):
+        super().__init__(f"{model.__name__} {row_id} was modified by someone else; reload and retry")
+
+
+def _missing(db: Session, model, row_id: int, version: Optional[int], criteria) -> None:
+    """After a write matched no row: raise VersionConflict if only the version was wrong."""
+    if version is not None and db.scalar(select(model.id).where(model.id == row_id, *criteria)) is not None:
+        raise VersionConflict(model, row_id)
+
+
+def update_returning(
+    db: Session, model, row_id: int, values: Dict[str, Any], version: Optional[int] = None, *criteria
+):
+    """
+    ``UPDATE model SET values, version = version + 1 WHERE id = row_id [AND version = version] RETURNING *``.
+
+    Returns:
+        The updated object (loaded into ``db``), or None if no row matched ``row_id`` and ``criteria``
+
+    Raises:
+        VersionConflict: If the row exists at another version
+    """
+    statement = update(model).where(model.id == row_id, *criteria).values(**values, version=model.version + 1)
+    if version is not None:
+        statement = statement.where(model.version == version)
+    obj = db.scalars(
+        statement.returning(model).execution_options(populate_existing=True, synchronize_session=False)
+    ).one_or_none()
+    if obj is None:
+        _missing(db, model, row_id, version, criteria)
+    return obj
+
+
+def delete_returning(
+    db: Session, model, row_id: int, returning: Iterable, version: Optional[int] = None, *criteria
+) -> Optional[Row]:
+    """
+    ``DELETE FROM model WHERE id = row_id [AND version = version] RETURNING returning``.
+
+    Returns:
+        The deleted row's ``returning`` columns, or None if no row matched
+
+    Raises:
+        VersionConflict: If the row exists at another version
+    """
+    statement = delete(model).where(model.id == row_id, *criteria)
+    if version is not None:
+        statement = statement.where(model.version == version)
+    row = db.execute(
+        statement.returning(*returning).execution_options(synchronize_session=False)
+    ).one_or_none()
+    if row is None:
+        _missing(db, model, row_id, version, criteria)
+    return row
@@ -0,0 +1,104 @@
+"""
+Weak ETags and ``If-None-Match`` handling for polled read endpoints.
+
+List ETags are built from the version counters of the owner or team scope
+being listed (see app/services/collection_versions.py), item ETags from
+the row's own ``version`` column, so deciding that a client's copy is
+current costs one indexed lookup: no ORM objects are loaded and nothing
+is serialized before answering ``304 Not Modified``.
+"""
+from collections import defaultdict
+from typing import Optional, Sequence
+import threading
+
+from fastapi import Response
+
+from app.utils.responses import wants_msgpack
+
+ETAG_HEADER = "ETag"
+VARY_HEADER = "Vary"
+
+
+def weak_etag(*parts) -> str:
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+def representation_etag(etag: str, accept: Optional[str], fields: Optional[Sequence[str]] = None) -> str:
+    """
+    ``etag`` for one representation of the resource: the negotiated media
+    type and the fieldset are part of it, so a msgpack body or a sparse page
+    never revalidates a client's full JSON copy (or the other way round).
+    """
+    parts = ["msgpack" if wants_msgpack(accept) else "json", *(fields or ())]
+    return etag[:-1] + "-" + ".".join(parts) + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of ``etag`` against an ``If-None-Match`` header value."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+class ConditionalGetStats:
+    """Conditional GETs per endpoint, and how many were answered with 304."""
+
+    def __init__(self):
+        self._requests = defaultdict(int)
+        self._not_modified = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, not_modified: bool) -> None:
+        with self._lock:
+            self._requests[endpoint] += 1
+            if not_modified:
+                self._not_modified[endpoint] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            endpoints = {
+                endpoint: {
+                    "requests": requests,
+                    "not_modified": self._not_modified[endpoint],
+                    "not_modified_ratio": round(self._not_modified[endpoint] / requests, 4),
+                }
+                for endpoint, requests in sorted(self._requests.items())
+            }
+        requests = sum(e["requests"] for e in endpoints.values())
+        not_modified = sum(e["not_modified"] for e in endpoints.values())
+        return {
+            "requests": requests,
+            "not_modified": not_modified,
+            "not_modified_ratio": round(not_modified / requests, 4) if requests else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+conditional_get_stats = ConditionalGetStats()
+
+
+def not_modified_response(
+    endpoint: str, etag: str, if_none_match: Optional[str], accept: Optional[str], response: Response,
+    fields: Optional[Sequence[str]] = None,
+) -> Optional[Response]:
+    """
+    Tag ``response`` with the ETag of the representation ``accept`` and
+    ``fields`` select, and return a 304 if the client's copy is current.
+
+    Both carry ``Vary: Accept`` so shared caches keep JSON and msgpack
+    copies apart.
+
+    Returns:
+        Response: The 304 to return as-is, or None to build the full response
+    """
+    etag = representation_etag(etag, accept, fields)
+    response.headers[ETAG_HEADER] = etag
+    response.headers[VARY_HEADER] = "Accept"
+    matched = etag_matches(if_none_match, etag)
+    conditional_get_stats.record(endpoint, matched)
+    if matched:
+        return Response(status_code=304, headers={ETAG_HEADER: etag, VARY_HEADER: "Accept"})
+    return None
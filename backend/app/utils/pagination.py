@@ -0,0 +1,179 @@
+"""
+Keyset (cursor) pagination shared by the list endpoints.
+
+Pages are ordered by ``(sort_key, id)`` and the next page starts strictly
+after the last row of the previous one, so the database seeks straight to
+it through an index instead of counting past ``offset`` rows. Cursors are
+opaque url-safe tokens; clients just echo back the ``X-Next-Cursor``
+response header as ``?cursor=``.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import base64
+import json
+
+from fastapi import HTTPException, Response
+from sqlalchemy import DateTime, String, literal, tuple_
+from sqlalchemy.types import TypeDecorator
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded or belongs to another ordering."""
+
+
+class _CursorDateTime(TypeDecorator):
+    """
+    Binds a cursor timestamp in the same text format SQLite stores it.
+
+    SQLite keeps DateTime columns as text, and ``func.now()`` server defaults
+    are written without microseconds; SQLAlchemy's own binding always adds
+    ``.000000``, which would make equal timestamps compare as different.
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String())
+        return dialect.type_descriptor(DateTime(timezone=True))
+
+    def process_bind_param(self, value, dialect):
+        if dialect.name == "sqlite" and isinstance(value, datetime):
+            text = value.strftime("%Y-%m-%d %H:%M:%S")
+            return f"{text}.{value.microsecond:06d}" if value.microsecond else text
+        return value
+
+
+def _bind(value: Any):
+    if isinstance(value, datetime):
+        return literal(value, _CursorDateTime())
+    return value
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(sort: str, value: Any, row_id: int) -> str:
+    payload = json.dumps([sort, _encode_value(value), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+    if cursor_sort != sort or not isinstance(row_id, int):
+        raise InvalidCursor("Cursor does not match the requested sort order")
+    return _decode_value(value), row_id
+
+
+@dataclass(frozen=True)
+class KeysetSort:
+    """
+    An ordering over ``(column, id_column)`` that can be paginated by keyset.
+
+    Works with ORM ``Query`` objects and 2.0-style ``select()`` statements.
+    """
+    name: str
+    column: Any
+    id_column: Any
+    descending: bool = False
+
+    @property
+    def key(self) -> str:
+        return f"-{self.name}" if self.descending else self.name
+
+    def apply(self, query, cursor: Optional[str], limit: int):
+        """Restrict ``query`` to the page after ``cursor`` (fetches one extra row to detect more)."""
+        by_id = self.column is self.id_column
+        if cursor:
+            value, last_id = decode_cursor(cursor, self.key)
+            if by_id:
+                after = self.id_column < last_id if self.descending else self.id_column > last_id
+            else:
+                row, bound = tuple_(self.column, self.id_column), tuple_(_bind(value), last_id)
+                after = row < bound if self.descending else row > bound
+            query = query.filter(after)
+
+        columns = [self.id_column] if by_id else [self.column, self.id_column]
+        if self.descending:
+            columns = [c.desc() for c in columns]
+        return query.order_by(*columns).limit(limit + 1)
+
+    def page(self, rows: Sequence[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+        """Split the fetched rows into this page and the cursor for the next one."""
+        items = list(rows[:limit])
+        if len(rows) <= limit:
+            return items, None
+        last = items[-1]
+        value = _row_get(last, self.column.key)
+        return items, encode_cursor(self.key, value, _row_get(last, self.id_column.key))
+
+
+def _row_get(row: Any, key: str) -> Any:
+    if isinstance(row, dict):
+        return row[key]
+    return getattr(row, key)
+
+
+def resolve_sort(sort: str, sorts: Dict[str, KeysetSort]) -> KeysetSort:
+    """Look up a ``sort`` query value such as ``name`` or ``-created_at``."""
+    descending = sort.startswith("-")
+    base = sorts.get(sort.lstrip("-"))
+    if base is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid sort '{sort}'. Allowed: {', '.join(sorts)}",
+        )
+    return KeysetSort(base.name, base.column, base.id_column, descending)
+
+
+def paginate(query, sort: KeysetSort, cursor: Optional[str], limit: int, response: Response) -> List[Any]:
+    """
+    Run a keyset-paginated ORM query and set the ``X-Next-Cursor`` header.
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid
+    """
+    try:
+        query = sort.apply(query, cursor, limit)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    items, next_cursor = sort.page(query.all(), limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
+
+
+async def paginate_async(
+    db, statement, sort: KeysetSort, cursor: Optional[str], limit: int, response: Response, entities: bool = True
+) -> List[Any]:
+    """
+    ``paginate`` for a 2.0-style ``select()`` on an ``AsyncSession``.
+
+    With ``entities=False`` the statement selects plain columns and the page
+    holds result rows; it must include the sort and id columns.
+    """
+    try:
+        statement = sort.apply(statement, cursor, limit)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    result = await db.execute(statement)
+    items, next_cursor = sort.page(result.scalars().all() if entities else result.all(), limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
@@ -0,0 +1,146 @@
+"""
+Response encoding: orjson by default, msgpack on request, and a fast path
+from trusted ORM rows straight to the wire.
+
+FastAPI's normal route for a ``response_model`` validates every returned ORM
+object through its ``from_attributes`` schema, dumps the result to JSON-able
+python and only then encodes it. Rows loaded from our own tables have
+already passed that schema's constraints on the way in, so list endpoints
+use ``wire_response`` instead: it reads each schema field straight off the
+object and hands the plain dicts to orjson (or msgpack). ``response_model``
+stays on the route for the OpenAPI schema.
+"""
+from datetime import date, datetime, time, timedelta
+from enum import Enum
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple, Type, Union, get_args, get_origin
+
+import msgpack
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+MSGPACK_TYPES = (MSGPACK, "application/x-msgpack")
+
+# OPT_UTC_Z writes UTC offsets as "Z", the same way pydantic does
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONResponse(JSONResponse):
+    """The app's default response class."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def _msgpack_default(value: Any) -> Any:
+    # Same text forms as the JSON encoding, so clients can switch freely
+    if isinstance(value, (datetime, date, time)):
+        text = value.isoformat()
+        if isinstance(value, datetime) and value.utcoffset() == timedelta(0):
+            text = text.removesuffix("+00:00") + "Z"
+        return text
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not msgpack serializable")
+
+
+class MsgpackResponse(Response):
+    media_type = MSGPACK
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content, default=_msgpack_default)
+
+
+def _quality(accept: str, media_types: Tuple[str, ...]) -> float:
+    best = 0.0
+    for part in accept.split(","):
+        media_type, *params = part.split(";")
+        if media_type.strip().lower() not in media_types:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        best = max(best, q)
+    return best
+
+
+def wants_msgpack(accept: Optional[str]) -> bool:
+    """True if the ``Accept`` header prefers msgpack over JSON (JSON wins ties)."""
+    if not accept:
+        return False
+    msgpack_q = _quality(accept, MSGPACK_TYPES)
+    return msgpack_q > 0 and msgpack_q > _quality(accept, (JSON, "*/*"))
+
+
+def negotiated(content: Any, accept: Optional[str], response: Response) -> Response:
+    """
+    Encode ``content`` as msgpack or JSON per ``accept``.
+
+    The endpoint returns this as-is, so headers already set on the injected
+    ``response`` (cursor, ETag) are carried over.
+    """
+    response_class = MsgpackResponse if wants_msgpack(accept) else ORJSONResponse
+    return carry_headers(response_class(content), response)
+
+
+def carry_headers(wire: Response, response: Response) -> Response:
+    wire.headers.raw.extend(response.headers.raw)
+    wire.headers["Vary"] = "Accept"
+    return wire
+
+
+# A plan is one (field name, default, nested plan, is_list) entry per schema field
+_Plan = List[Tuple[str, Any, Optional[list], bool]]
+
+
+def _nested_model(annotation: Any) -> Tuple[Optional[Type[BaseModel]], bool]:
+    """The schema nested in a field annotation (``Model``, ``Optional[Model]``, ``List[Model]``)."""
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        annotation = args[0] if len(args) == 1 else annotation
+    if get_origin(annotation) in (list, List):
+        model, _ = _nested_model(get_args(annotation)[0])
+        return model, True
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+
+@lru_cache(maxsize=None)
+def wire_plan(model: Type[BaseModel]) -> _Plan:
+    plan = []
+    for name, info in model.model_fields.items():
+        default = info.get_default(call_default_factory=True)
+        nested, many = _nested_model(info.annotation)
+        plan.append((name, None if default is PydanticUndefined else default, wire_plan(nested) if nested else None, many))
+    return plan
+
+
+def _dump(plan: _Plan, obj: Any) -> dict:
+    row = {}
+    for name, default, nested, many in plan:
+        value = getattr(obj, name, default)
+        if nested is not None and value is not None:
+            value = [_dump(nested, item) for item in value] if many else _dump(nested, value)
+        row[name] = value
+    return row
+
+
+def wire_response(model: Type[BaseModel], objects: Any, accept: Optional[str], response: Response) -> Response:
+    """Encode a trusted ORM object, or a list of them, as ``model`` per ``accept``, without validation."""
+    plan = wire_plan(model)
+    if isinstance(objects, (list, tuple)):
+        content = [_dump(plan, obj) for obj in objects]
+    else:
+        content = _dump(plan, objects)
+    return negotiated(content, accept, response)
@@ -0,0 +1,9 @@
+"""Timestamps are stored as naive UTC throughout (``datetime.utcnow()``)."""
+from datetime import datetime, timezone
+
+
+def utc_naive(value: datetime) -> datetime:
+    """``value`` as naive UTC; naive values are taken to be UTC already."""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
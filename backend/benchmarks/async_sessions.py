@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Sync (threadpool) vs. async (event loop) sessions under 500 parallel clients.
+
+Both modes serve ``GET /equipment/{id}`` from the same SQLite file: the sync
+mode through a ``def`` endpoint on the blocking ``get_db`` session (what the
+equipment router used before the async port), the async mode through the
+app's own router on ``get_async_db``. Every statement waits RTT_MS inside
+the driver's thread, standing in for the network round trip to Postgres:
+it holds a threadpool slot in sync mode but not the event loop in async mode.
+
+Usage: python benchmarks/async_sessions.py [clients] [requests_per_client] [rtt_ms]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util import await_only
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from app.models.base import Base, get_async_db  # noqa: E402
+from app.models.equipment import Equipment  # noqa: E402
+from app.schemas.equipment import EquipmentResponse  # noqa: E402
+
+CLIENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+REQUESTS = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+RTT = (float(sys.argv[3]) if len(sys.argv) > 3 else 2.0) / 1000
+ITEMS = 1000
+# Unbounded overflow: with a capped pool the sync mode deadlocks outright, its
+# 40 threadpool workers waiting on connections held by get_db teardowns that
+# are themselves queued for a worker.
+POOL = dict(pool_size=50, max_overflow=-1)
+
+
+def round_trip(statement):
+    time.sleep(RTT)
+
+
+def build_database():
+    path = os.path.join(tempfile.mkdtemp(), "sessions.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Equipment), [{"name": f"Item {i}", "category": f"cat-{i % 12}"} for i in range(ITEMS)])
+    engine.dispose()
+    return path
+
+
+def sync_app(path):
+    engine = create_engine(f"sqlite:///{path}", **POOL)
+    event.listen(engine, "connect", lambda conn, record: conn.set_trace_callback(round_trip))
+    SessionBench = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def get_db():
+        db = SessionBench()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+
+    @app.get("/api/v1/equipment/{equipment_id}", response_model=EquipmentResponse)
+    def get_equipment_by_id(equipment_id: int, db: Session = Depends(get_db)):
+        equipment = db.query(Equipment).filter(Equipment.id == equipment_id).first()
+        if not equipment:
+            raise HTTPException(status_code=404, detail="Equipment not found")
+        return equipment
+
+    return app
+
+
+def async_app(path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=AsyncAdaptedQueuePool, **POOL)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def add_round_trip(conn, record):
+        await_only(conn.driver_connection.set_trace_callback(round_trip))
+
+    AsyncSessionBench = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncSessionBench() as session:
+            yield session
+
+    main.app.dependency_overrides[get_async_db] = override_get_async_db
+    return main.app
+
+
+async def load(app):
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def one_client(n):
+            for i in range(REQUESTS):
+                start = time.perf_counter()
+                response = await client.get(f"/api/v1/equipment/{1 + (n * REQUESTS + i) % ITEMS}")
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+
+        # Warm-up round so both pools already hold a connection per client
+        await asyncio.gather(*(one_client(n) for n in range(CLIENTS)))
+        latencies.clear()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one_client(n) for n in range(CLIENTS)))
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def run_benchmark():
+    path = build_database()
+    results = {
+        "sync  (threadpool)": asyncio.run(load(sync_app(path))),
+        "async (event loop)": asyncio.run(load(async_app(path))),
+    }
+
+    print(f"{CLIENTS} parallel clients x {REQUESTS} requests, {RTT * 1000:.1f} ms per statement round trip:")
+    for mode, r in results.items():
+        print(f"  {mode}  {r['rps']:7.0f} req/s   p50 {r['p50']:7.1f} ms   p99 {r['p99']:7.1f} ms")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Event-loop latency while many logins wait on a slow Auth0.
+
+Runs a stub /userinfo (in its own process, so it does not compete with the
+loop for the GIL) that answers after a fixed delay, then fires N
+concurrent "logins" from one event loop while a ticker measures how late the
+loop wakes up. Compares the old blocking ``requests.get`` call with the shared
+``Auth0HttpClient``.
+
+Usage: python benchmarks/auth0_event_loop.py [concurrent_logins] [auth0_delay_ms]
+"""
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings  # noqa: E402
+from app.core.http import Auth0HttpClient  # noqa: E402
+
+LOGINS = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+DELAY = (int(sys.argv[2]) if len(sys.argv) > 2 else 100) / 1000
+TICK = 0.005
+
+
+class SlowUserInfo(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        time.sleep(DELAY)
+        payload = b'{"sub": "auth0|bench", "email": "bench@kitlog.io", "name": "Bench"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+async def measure(login):
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append((time.perf_counter() - start - TICK) * 1000)
+
+    tick_task = asyncio.create_task(ticker())
+    await asyncio.sleep(TICK * 2)
+    start = time.perf_counter()
+    await asyncio.gather(*[login() for _ in range(LOGINS)])
+    elapsed = time.perf_counter() - start
+    done.set()
+    await tick_task
+    lags.sort()
+
+    def percentile(p):
+        return round(lags[min(len(lags) - 1, int(round(p * (len(lags) - 1))))], 2)
+
+    return {
+        "wall_s": round(elapsed, 3),
+        "lag_p50_ms": percentile(0.50),
+        "lag_p99_ms": percentile(0.99),
+        "lag_max_ms": percentile(1.0),
+    }
+
+
+def serve(port_queue):
+    server = StubServer(("127.0.0.1", 0), SlowUserInfo)
+    port_queue.put(server.server_port)
+    server.serve_forever()
+
+
+def main():
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(port_queue,), daemon=True)
+    server.start()
+    url = f"http://127.0.0.1:{port_queue.get()}/userinfo"
+    headers = {"Authorization": "Bearer bench"}
+
+    async def blocking_login():
+        requests.get(url, headers=headers).json()
+
+    client = Auth0HttpClient(
+        connect_timeout=settings.AUTH0_HTTP_CONNECT_TIMEOUT,
+        read_timeout=settings.AUTH0_HTTP_READ_TIMEOUT,
+        max_concurrency=settings.AUTH0_HTTP_MAX_CONCURRENCY,
+    )
+
+    async def pooled_login():
+        (await client.get(url, headers=headers)).json()
+
+    async def run():
+        results = {"requests.get (blocking)": await measure(blocking_login)}
+        results["Auth0HttpClient"] = await measure(pooled_login)
+        await client.aclose()
+        return results
+
+    print(f"{LOGINS} concurrent logins, Auth0 latency {DELAY * 1000:.0f} ms")
+    for name, result in asyncio.run(run()).items():
+        print(f"  {name:<26} {result}")
+    server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Hundreds of concurrent checkout attempts on the same few items.
+
+Every round, CLIENTS clients each try to check out one of ITEMS items at the
+same moment, then the winners check their items back in. Every statement
+waits RTT_MS inside the driver's thread, standing in for the network round
+trip to Postgres and widening the window a read-then-write race would need.
+
+After each round the script checks that exactly one attempt per item won,
+that every other attempt got a 409 (not a 500), and at the end that no item
+has more than one active checkout and the category counters did not drift.
+
+Usage: python benchmarks/checkout_contention.py [clients] [items] [rounds] [rtt_ms]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import httpx
+from sqlalchemy import create_engine, event, func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util import await_only
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from app.api.deps import get_current_user  # noqa: E402
+from app.models.base import Base, get_async_db  # noqa: E402
+from app.models.checkout import EquipmentCheckout  # noqa: E402
+from app.models.equipment import Equipment  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.auth_service import UserSnapshot  # noqa: E402
+from app.services.equipment_counters import EquipmentCounterService  # noqa: E402
+
+CLIENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+ITEMS = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+ROUNDS = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+RTT = (float(sys.argv[4]) if len(sys.argv) > 4 else 1.0) / 1000
+
+
+def round_trip(statement):
+    time.sleep(RTT)
+
+
+def build_database():
+    path = os.path.join(tempfile.mkdtemp(), "checkouts.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"auth0_id": "auth0|crew", "email": "crew@kitlog.io", "name": "Crew"}])
+        conn.execute(insert(Equipment), [
+            {"name": f"Camera {i}", "category": "camera", "owner_id": "auth0|rental"} for i in range(ITEMS)
+        ])
+    with sessionmaker(bind=engine)() as db:
+        EquipmentCounterService.check(db, repair=True)  # Seed the counters the Core insert skipped
+        user = UserSnapshot.from_user(db.scalars(select(User)).one())
+    return path, engine, user
+
+
+def install(path, user):
+    # SQLite serializes writers: with hundreds queued on its single write lock
+    # the default 5 s busy timeout runs out before the tail gets its turn.
+    # (Postgres queues them on the row lock instead.)
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}", poolclass=AsyncAdaptedQueuePool, pool_size=50, max_overflow=-1,
+        connect_args={"timeout": 120},
+    )
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def add_round_trip(conn, record):
+        await_only(conn.driver_connection.set_trace_callback(round_trip))
+
+    AsyncSessionBench = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncSessionBench() as session:
+            yield session
+
+    main.app.dependency_overrides[get_async_db] = override_get_async_db
+    main.app.dependency_overrides[get_current_user] = lambda: user
+
+
+async def contend():
+    latencies, codes = [], Counter()
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def attempt(n):
+            start = time.perf_counter()
+            response = await client.post(f"/api/v1/equipment/{1 + n % ITEMS}/checkout")
+            latencies.append(time.perf_counter() - start)
+            return response
+
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            responses = await asyncio.gather(*(attempt(n) for n in range(CLIENTS)))
+            round_codes = Counter(r.status_code for r in responses)
+            codes.update(round_codes)
+            winners = sorted(r.json()["equipment_id"] for r in responses if r.status_code == 200)
+            assert winners == list(range(1, ITEMS + 1)), f"winners {winners}"
+            assert round_codes[409] == CLIENTS - ITEMS, f"status codes {dict(round_codes)}"
+            for equipment_id in winners:
+                assert (await client.post(f"/api/v1/equipment/{equipment_id}/checkin")).status_code == 200
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "codes": dict(sorted(codes.items())),
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def verify(engine):
+    with sessionmaker(bind=engine)() as db:
+        per_item = db.execute(
+            select(EquipmentCheckout.equipment_id, func.count())
+            .where(EquipmentCheckout.is_active == True)
+            .group_by(EquipmentCheckout.equipment_id)
+        ).all()
+        assert not per_item, f"active checkouts left: {per_item}"
+        history = db.scalar(select(func.count()).select_from(EquipmentCheckout))
+        assert history == ITEMS * ROUNDS, f"{history} checkouts recorded"
+        assert EquipmentCounterService.check(db)["drift"] == []
+    return history
+
+
+def run_benchmark():
+    path, engine, user = build_database()
+    install(path, user)
+    result = asyncio.run(contend())
+    history = verify(engine)
+
+    print(f"{CLIENTS} concurrent checkout attempts on {ITEMS} items x {ROUNDS} rounds, {RTT * 1000:.1f} ms per statement round trip:")
+    print(f"  status codes {result['codes']}   {history} checkouts recorded, one winner per item per round")
+    print(f"  {result['rps']:7.0f} attempts/s   p50 {result['p50']:7.1f} ms   p99 {result['p99']:7.1f} ms")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Team availability and booking conflict checks over 1M reservations.
+
+Builds a throwaway SQLite database with ITEMS items in TEAMS teams and
+RESERVATIONS back-to-back-ish bookings (1-7 days, 0-10 days apart) spread
+evenly over the items, a few years of history each. Then times:
+
+  - availability: ``GET /equipment/availability``'s query for one team and
+    a 3-day window in the middle of the history, with the MAX_RESERVATION
+    lower bound (bounded) and without it (unbounded: every booking of the
+    item that starts before the window's end is a candidate)
+  - reserve: EquipmentReservationService.reserve on random items, for free
+    windows and for windows that conflict
+
+Usage: python benchmarks/equipment_availability.py [reservations] [items] [teams]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, exists, insert, select
+from sqlalchemy.orm import sessionmaker
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402,F401  (registers every model)
+from app.models.base import Base  # noqa: E402
+from app.models.equipment import Equipment  # noqa: E402
+from app.models.reservation import EquipmentReservation  # noqa: E402
+from app.models.team import Team  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.equipment_reservations import (  # noqa: E402
+    EquipmentReservationService, ReservationConflict, free_during,
+)
+
+RESERVATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+ITEMS = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+TEAMS = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+EPOCH = datetime(2024, 1, 1)
+REPEAT = 10
+BOOKINGS = 200
+
+
+def build(engine):
+    rng = random.Random(3)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"auth0_id": "auth0|crew", "email": "crew@kitlog.io", "name": "Crew"}])
+        conn.execute(insert(Team), [{"name": f"Team {i}"} for i in range(TEAMS)])
+        conn.execute(insert(Equipment), [
+            {"name": f"Item {i}", "category": "camera", "team_id": 1 + i % TEAMS} for i in range(ITEMS)
+        ])
+        per_item = RESERVATIONS // ITEMS
+        ends = []
+        for equipment_id in range(1, ITEMS + 1):
+            rows, at = [], EPOCH + timedelta(hours=rng.randint(0, 72))
+            for _ in range(per_item):
+                starts_at = at + timedelta(days=rng.randint(0, 10))
+                at = starts_at + timedelta(days=rng.randint(1, 7))
+                rows.append({"equipment_id": equipment_id, "user_id": 1, "starts_at": starts_at, "ends_at": at})
+            conn.execute(insert(EquipmentReservation), rows)
+            ends.append(at)
+    return min(ends), max(ends)
+
+
+def unbounded_free(starts_at, ends_at):
+    return ~exists().where(
+        EquipmentReservation.equipment_id == Equipment.id,
+        EquipmentReservation.starts_at < ends_at,
+        EquipmentReservation.ends_at > starts_at,
+    )
+
+
+def availability(criteria):
+    return select(Equipment.id).where(Equipment.team_id == 1, *criteria).order_by(Equipment.id)
+
+
+def timed(fn):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def run_benchmark():
+    path = os.path.join(tempfile.mkdtemp(), "reservations.db")
+    engine = create_engine(f"sqlite:///{path}")
+    history_end, booked_until = build(engine)
+    db = sessionmaker(bind=engine)()
+
+    starts_at = EPOCH + (history_end - EPOCH) / 2
+    ends_at = starts_at + timedelta(days=3)
+    bounded_ms, bounded = timed(lambda: db.scalars(availability(free_during(starts_at, ends_at))).all())
+    unbounded_ms, unbounded = timed(lambda: db.scalars(availability([unbounded_free(starts_at, ends_at)])).all())
+    assert bounded == unbounded
+
+    rng = random.Random(11)
+    latencies = {"free": [], "conflict": []}
+    for i in range(BOOKINGS):
+        equipment_id = rng.randint(1, ITEMS)
+        if i % 2:
+            kind, start = "conflict", starts_at + timedelta(days=rng.randint(0, 30))
+            length = timedelta(days=30)  # Longer than any gap: always overlaps a booking
+        else:
+            kind, start = "free", booked_until + timedelta(days=10 * i)
+            length = timedelta(days=2)
+        begin = time.perf_counter()
+        try:
+            EquipmentReservationService.reserve(db, equipment_id, 1, start, start + length)
+            assert kind == "free"
+        except ReservationConflict:
+            assert kind == "conflict"
+        latencies[kind].append(time.perf_counter() - begin)
+
+    per_team = ITEMS // TEAMS
+    print(f"{RESERVATIONS:,} reservations over {ITEMS:,} items ({per_team} per team):")
+    print(f"  team availability, 3-day window   bounded {bounded_ms:7.2f} ms   unbounded {unbounded_ms:8.2f} ms"
+          f"   ({len(bounded)} of {per_team} free)")
+    print(f"  reserve (check + insert + commit) free window p50 {statistics.median(latencies['free']) * 1000:.2f} ms"
+          f"   conflicting p50 {statistics.median(latencies['conflict']) * 1000:.2f} ms")
+    db.close()
+    engine.dispose()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    run_benchmark()
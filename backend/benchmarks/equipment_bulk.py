@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Single-row vs. bulk equipment creation throughput.
+
+Imports N items into a throwaway SQLite database through the API: once
+with one ``POST /equipment/`` per item (one commit each), once with
+``POST /equipment/bulk`` in requests of up to ``BULK_MAX_ITEMS`` rows.
+
+Usage: python benchmarks/equipment_bulk.py [items]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.models.base import Base, get_db  # noqa: E402
+
+ITEMS = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+
+def fresh_client():
+    path = os.path.join(tempfile.mkdtemp(), "bulk.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    SessionBench = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        session = SessionBench()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    main.app.dependency_overrides[get_db] = override_get_db
+    return TestClient(main.app)
+
+
+def payload(i):
+    return {
+        "name": f"Item {i}", "category": f"cat-{i % 12}", "serial_number": f"SN-{i:07d}",
+        "owner_id": f"auth0|{i % 20}", "team_id": 1 + i % 3,
+    }
+
+
+def run_benchmark():
+    client = fresh_client()
+    start = time.perf_counter()
+    for i in range(ITEMS):
+        assert client.post("/api/v1/equipment/", json=payload(i)).status_code == 200
+    single = time.perf_counter() - start
+
+    client = fresh_client()
+    start = time.perf_counter()
+    for offset in range(0, ITEMS, settings.BULK_MAX_ITEMS):
+        batch = [payload(i) for i in range(offset, min(offset + settings.BULK_MAX_ITEMS, ITEMS))]
+        body = client.post("/api/v1/equipment/bulk", json={"items": batch}).json()
+        assert not body["errors"]
+    bulk = time.perf_counter() - start
+
+    print(f"{ITEMS:,} items, chunk size {settings.BULK_CHUNK_SIZE}:")
+    print(f"  single-row POST  {single:7.2f} s   {ITEMS / single:8.0f} items/s")
+    print(f"  bulk POST        {bulk:7.2f} s   {ITEMS / bulk:8.0f} items/s   ({single / bulk:.0f}x)")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Dashboard polling with and without ETag revalidation.
+
+Simulates dashboards polling ``GET /equipment/?limit=100``,
+``GET /equipment/{id}`` and ``GET /teams/{id}`` while someone edits one
+equipment item every WRITE_EVERY polls. Reports the share of polls
+answered with 304 and the time per poll against unconditional GETs.
+
+Usage: python benchmarks/equipment_etag.py [polls] [write_every]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from app.models.base import Base, get_db  # noqa: E402
+from app.models.equipment import Equipment  # noqa: E402
+from app.models.team import Team  # noqa: E402
+from app.utils.etag import conditional_get_stats  # noqa: E402
+
+POLLS = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+WRITE_EVERY = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+
+def fresh_client():
+    path = os.path.join(tempfile.mkdtemp(), "etag.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Team), [{"name": "Rental house"}])
+        conn.execute(insert(Equipment), [
+            {"name": f"Item {i}", "category": f"cat-{i % 12}", "owner_id": f"auth0|{i % 20}", "team_id": 1}
+            for i in range(1000)
+        ])
+    SessionBench = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        session = SessionBench()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    main.app.dependency_overrides[get_db] = override_get_db
+    return TestClient(main.app)
+
+
+def poll(client, conditional):
+    urls = ["/api/v1/equipment/?limit=100", "/api/v1/equipment/1", "/api/v1/teams/1"]
+    etags = {}
+    start = time.perf_counter()
+    for i in range(POLLS):
+        if i and i % WRITE_EVERY == 0:
+            client.put("/api/v1/equipment/1", json={"notes": f"Edit {i}"})
+        url = urls[i % len(urls)]
+        headers = {"If-None-Match": etags[url]} if conditional and url in etags else {}
+        response = client.get(url, headers=headers)
+        etags[url] = response.headers["ETag"]
+    return (time.perf_counter() - start) / POLLS * 1000
+
+
+def run_benchmark():
+    plain = poll(fresh_client(), conditional=False)
+    conditional_get_stats.__init__()
+    conditional = poll(fresh_client(), conditional=True)
+    stats = conditional_get_stats.stats()
+
+    print(f"{POLLS:,} polls, one write every {WRITE_EVERY}:")
+    print(f"  unconditional GET   {plain:6.2f} ms/poll")
+    print(f"  If-None-Match       {conditional:6.2f} ms/poll   ({plain / conditional:.1f}x)")
+    print(f"  answered with 304   {stats['not_modified_ratio']:6.1%}")
+    for endpoint, counts in stats["endpoints"].items():
+        print(f"    {endpoint:<16} {counts['not_modified_ratio']:6.1%}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Full rows vs. a sparse fieldset for one large equipment page.
+
+Builds a throwaway SQLite database whose rows carry realistic description and
+notes text, then loads and serializes one page of N rows both ways: full
+``Equipment`` entities through ``EquipmentResponse`` (what the list endpoint
+does without ``?fields=``), and ``?fields=id,name,category,is_available``
+through a column projection and the fieldset adapter. Reports response bytes
+and CPU time per page.
+
+Usage: python benchmarks/equipment_fieldsets.py [rows]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402,F401  (registers every model)
+from app.models.base import Base  # noqa: E402
+from app.models.equipment import Equipment  # noqa: E402
+from app.schemas.equipment import EquipmentResponse  # noqa: E402
+from app.utils.fieldsets import fieldset_response  # noqa: E402
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+FIELDS = ("id", "name", "category", "is_available")
+REPEAT = 5
+
+
+def build(engine):
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Equipment), [
+            {
+                "name": f"Item {i:05d}", "category": f"cat-{i % 40}", "brand": "Arri", "model": "Alexa Mini LF",
+                "serial_number": f"SN-{i:08d}", "location": "Stage 4, cage B", "owner_id": f"auth0|{i % 500}",
+                "description": "Large-format cinema camera body with LPL mount and internal ND filters. " * 6,
+                "notes": "Sensor cleaned and back focus checked after last rental; ships with two batteries. " * 4,
+            }
+            for i in range(ROWS)
+        ])
+
+
+def full_page(db):
+    rows = db.scalars(select(Equipment).order_by(Equipment.id)).all()
+    adapter = TypeAdapter(List[EquipmentResponse])
+    # What FastAPI does for a response_model: validate, dump to JSON-able python, json.dumps
+    content = adapter.dump_python(adapter.validate_python(rows, from_attributes=True), mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def fieldset_page(db):
+    table = Equipment.__table__
+    rows = db.execute(select(*(table.c[name] for name in FIELDS)).order_by(table.c.id)).all()
+    return fieldset_response(EquipmentResponse, FIELDS, rows, None, Response()).body
+
+
+def timed(fn, db):
+    best = float("inf")
+    for _ in range(REPEAT):
+        db.expunge_all()
+        start = time.process_time()
+        body = fn(db)
+        best = min(best, time.process_time() - start)
+    return best * 1000, len(body)
+
+
+def run_benchmark():
+    path = os.path.join(tempfile.mkdtemp(), "fieldsets.db")
+    engine = create_engine(f"sqlite:///{path}")
+    build(engine)
+    db = sessionmaker(bind=engine)()
+
+    full_ms, full_bytes = timed(full_page, db)
+    sparse_ms, sparse_bytes = timed(fieldset_page, db)
+
+    print(f"Page of {ROWS:,} rows, best of {REPEAT} (CPU time):")
+    print(f"  full rows           {full_ms:7.1f} ms   {full_bytes / 1024:8.0f} KiB")
+    print(f"  fields={','.join(FIELDS)}  {sparse_ms:7.1f} ms   {sparse_bytes / 1024:8.0f} KiB")
+    print(f"  saved               {1 - sparse_ms / full_ms:7.0%}      {1 - sparse_bytes / full_bytes:8.0%}")
+    db.close()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Full-text search vs. a LIKE scan over a large equipment table.
+
+Builds a throwaway SQLite database with N equipment rows (the FTS5 index is
+kept in sync by its triggers), then times a ranked search for a few queries
+against the ``ILIKE '%term%'`` filter a naive implementation would use.
+The LIKE page is unranked, so it can stop early on broad terms; FTS scores
+every match to put the best hits first, so it is also compared against a
+LIKE pass that has to visit every match (what any relevance ordering needs).
+
+Usage: python benchmarks/equipment_search.py [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert, or_
+from sqlalchemy.orm import sessionmaker
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402,F401  (registers every model)
+from app.models.base import Base  # noqa: E402
+from app.models.equipment import Equipment  # noqa: E402
+from app.services.equipment_search import EquipmentSearchService  # noqa: E402
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+LIMIT = 50
+REPEAT = 5
+# From selective to broad: ~0.1%, ~2% and ~10% of rows match
+QUERIES = ("fx42", "rode scratched", "tripod")
+
+BRANDS = ["Canon", "Sony", "Rode", "Manfrotto", "Aputure", "Sennheiser", "DJI", "Zoom", "Blackmagic", "Sigma"]
+KINDS = ["camera", "lens 24mm", "lens 85mm", "tripod", "microphone", "gimbal", "light panel", "recorder", "monitor", "drone"]
+WORDS = ["battery", "case", "scratched", "cage", "rig", "spare", "borrowed", "calibrated", "filter", "cable", "mount", "kit"]
+
+
+def build(engine):
+    Base.metadata.create_all(engine)
+    batch = 50_000
+    with engine.begin() as conn:
+        for start in range(0, ROWS, batch):
+            conn.execute(insert(Equipment), [
+                {
+                    "name": f"{BRANDS[i % 10]} {KINDS[(i // 10) % 10]} {i}",
+                    "brand": BRANDS[i % 10],
+                    "model": f"FX{i % 97}" if i % 10 == 1 else f"M{i % 997}",
+                    "category": KINDS[(i // 10) % 10].split()[0],
+                    "description": " ".join(WORDS[(i * k) % len(WORDS)] for k in (1, 3, 7)),
+                    "owner_id": f"auth0|{i % 500}",
+                }
+                for i in range(start, min(start + batch, ROWS))
+            ])
+
+
+def like_filter(db, q):
+    query = db.query(Equipment)
+    for term in EquipmentSearchService.parse_terms(q):
+        pattern = f"%{term}%"
+        query = query.filter(or_(
+            Equipment.name.ilike(pattern), Equipment.brand.ilike(pattern), Equipment.model.ilike(pattern),
+            Equipment.description.ilike(pattern), Equipment.notes.ilike(pattern),
+        ))
+    return query
+
+
+def timed(fn):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def run_benchmark():
+    path = os.path.join(tempfile.mkdtemp(), "search.db")
+    engine = create_engine(f"sqlite:///{path}")
+    print(f"Building {ROWS:,} rows...")
+    build(engine)
+    db = sessionmaker(bind=engine)()
+
+    print(f"Top {LIMIT} results, best of {REPEAT}:")
+    for q in QUERIES:
+        fts_ms, (rows, _) = timed(lambda: EquipmentSearchService.search(db, q, LIMIT))
+        page_ms, _ = timed(lambda: like_filter(db, q).order_by(Equipment.id).limit(LIMIT).all())
+        all_ms, matches = timed(lambda: like_filter(db, q).count())
+        print(
+            f"  q={q!r:<18} fts ranked {fts_ms:8.2f} ms   like page {page_ms:8.2f} ms   "
+            f"like all matches {all_ms:8.2f} ms   ({matches:,} matches, {len(rows)} returned)"
+        )
+    db.close()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    run_benchmark()
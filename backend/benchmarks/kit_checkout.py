@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Checking out a 50-item kit in one call versus one call per item.
+
+Each round checks every item of a KIT_SIZE kit out and back in, once with
+POST /kits/{id}/checkout + /checkin and once with KIT_SIZE calls each to
+/equipment/{id}/checkout and /checkin, through the ASGI app. Every
+statement waits RTT_MS inside the driver's thread, standing in for the
+network round trip to Postgres; the HTTP round trip between the client and
+the app is free here, so the per-item numbers are a lower bound.
+
+Usage: python benchmarks/kit_checkout.py [kit_size] [rounds] [rtt_ms]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.util import await_only
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from app.api.deps import get_current_user  # noqa: E402
+from app.models.base import Base, get_async_db  # noqa: E402
+from app.models.equipment import Equipment  # noqa: E402
+from app.models.kit import Kit, kit_items  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.auth_service import UserSnapshot  # noqa: E402
+from app.services.equipment_counters import EquipmentCounterService  # noqa: E402
+
+KIT_SIZE = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+ROUNDS = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+RTT = (float(sys.argv[3]) if len(sys.argv) > 3 else 1.0) / 1000
+
+
+def round_trip(statement):
+    time.sleep(RTT)
+
+
+def build_database():
+    path = os.path.join(tempfile.mkdtemp(), "kits.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"auth0_id": "auth0|crew", "email": "crew@kitlog.io", "name": "Crew"}])
+        conn.execute(insert(Equipment), [
+            {"name": f"Item {i}", "category": "camera", "owner_id": "auth0|rental"} for i in range(KIT_SIZE)
+        ])
+        conn.execute(insert(Kit), [{"name": "Camera kit", "created_by_user_id": 1}])
+        conn.execute(insert(kit_items), [{"kit_id": 1, "equipment_id": i} for i in range(1, KIT_SIZE + 1)])
+    with sessionmaker(bind=engine)() as db:
+        EquipmentCounterService.check(db, repair=True)  # Seed the counters the Core insert skipped
+        user = UserSnapshot.from_user(db.scalars(select(User)).one())
+    return path, engine, user
+
+
+def install(path, user):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def add_round_trip(conn, record):
+        await_only(conn.driver_connection.set_trace_callback(round_trip))
+
+    AsyncSessionBench = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncSessionBench() as session:
+            yield session
+
+    main.app.dependency_overrides[get_async_db] = override_get_async_db
+    main.app.dependency_overrides[get_current_user] = lambda: user
+
+
+async def kit_round(client):
+    checkout = await client.post("/api/v1/kits/1/checkout")
+    assert checkout.status_code == 200 and len(checkout.json()) == KIT_SIZE
+    assert (await client.post("/api/v1/kits/1/checkin")).status_code == 200
+
+
+async def per_item_round(client):
+    for equipment_id in range(1, KIT_SIZE + 1):
+        assert (await client.post(f"/api/v1/equipment/{equipment_id}/checkout")).status_code == 200
+    for equipment_id in range(1, KIT_SIZE + 1):
+        assert (await client.post(f"/api/v1/equipment/{equipment_id}/checkin")).status_code == 200
+
+
+async def measure():
+    results = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for name, run_round in (("kit", kit_round), ("per-item", per_item_round)):
+            timings = []
+            for _ in range(ROUNDS):
+                start = time.perf_counter()
+                await run_round(client)
+                timings.append(time.perf_counter() - start)
+            results[name] = statistics.median(timings) * 1000
+    return results
+
+
+def run_benchmark():
+    path, engine, user = build_database()
+    install(path, user)
+    results = asyncio.run(measure())
+    with sessionmaker(bind=engine)() as db:
+        assert EquipmentCounterService.check(db)["drift"] == []
+
+    print(f"{KIT_SIZE}-item kit, checkout + checkin, {RTT * 1000:.1f} ms per statement round trip (median of {ROUNDS}):")
+    print(f"  kit endpoints       {results['kit']:8.1f} ms   2 requests, 2 transactions")
+    print(f"  per-item endpoints  {results['per-item']:8.1f} ms   {2 * KIT_SIZE} requests, {2 * KIT_SIZE} transactions"
+          f"   ({results['per-item'] / results['kit']:.0f}x)")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Encoding cost of list responses: response_model validation vs. the wire fast path.
+
+Builds a throwaway SQLite database, loads equipment pages and team pages
+(with members and invitations) of 100, 1k and 10k rows, and times turning
+the loaded ORM objects into a response body three ways:
+
+  - response_model: what FastAPI does by default, validating every object
+    through its from_attributes schema, dumping to JSON-able python and
+    encoding with the stdlib json module
+  - wire json / wire msgpack: app.utils.responses.wire_response
+
+Loading is outside the timed region; only encoding is measured (CPU time).
+
+Usage: python benchmarks/list_encoding.py [sizes...]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import List
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import selectinload, sessionmaker
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402,F401  (registers every model)
+from app.models.base import Base  # noqa: E402
+from app.models.equipment import Equipment  # noqa: E402
+from app.models.team import Team, TeamInvitation, TeamMembership  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.schemas.equipment import EquipmentResponse  # noqa: E402
+from app.schemas.team import TeamWithMembers  # noqa: E402
+from app.utils.responses import wire_response  # noqa: E402
+
+SIZES = [int(arg) for arg in sys.argv[1:]] or [100, 1_000, 10_000]
+REPEAT = 5
+EXPIRES_AT = datetime(2026, 12, 1)
+
+
+def build(engine, rows):
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"auth0_id": f"auth0|{i}", "email": f"u{i}@kitlog.io", "name": f"User {i}"} for i in range(50)])
+        conn.execute(insert(Team), [{"name": f"Team {i}", "description": "Rental house", "subscription_type": "paid"} for i in range(rows)])
+        conn.execute(insert(TeamMembership), [
+            {"team_id": 1 + i % rows, "user_id": 1 + i % 50, "role": "member"} for i in range(rows * 3)
+        ])
+        conn.execute(insert(TeamInvitation), [
+            {"team_id": 1 + i, "email": f"invite{i}@kitlog.io", "role": "member", "token": f"token-{i}",
+             "expires_at": EXPIRES_AT, "invited_by_user_id": 1}
+            for i in range(rows)
+        ])
+        conn.execute(insert(Equipment), [
+            {"name": f"Item {i:05d}", "category": f"cat-{i % 40}", "brand": "Arri", "model": "Alexa Mini LF",
+             "serial_number": f"SN-{i:08d}", "location": "Stage 4", "owner_id": f"auth0|{i % 500}",
+             "description": "Large-format cinema camera body with LPL mount.", "team_id": 1 + i % rows}
+            for i in range(rows)
+        ])
+
+
+def response_model_body(model, objects):
+    adapter = TypeAdapter(List[model])
+    content = adapter.dump_python(adapter.validate_python(objects, from_attributes=True), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def timed(fn):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.process_time()
+        body = fn()
+        best = min(best, time.process_time() - start)
+    return best * 1000, len(body)
+
+
+def run_benchmark():
+    for rows in SIZES:
+        path = os.path.join(tempfile.mkdtemp(), "encoding.db")
+        engine = create_engine(f"sqlite:///{path}")
+        build(engine, rows)
+        db = sessionmaker(bind=engine)()
+        pages = {
+            "equipment": (EquipmentResponse, db.scalars(select(Equipment).order_by(Equipment.id)).all()),
+            "teams": (TeamWithMembers, db.scalars(
+                select(Team).order_by(Team.id).options(selectinload(Team.members), selectinload(Team.invitations))
+            ).all()),
+        }
+
+        print(f"{rows:,} rows per page, best of {REPEAT} (CPU time):")
+        for name, (model, objects) in pages.items():
+            baseline_ms, baseline_bytes = timed(lambda: response_model_body(model, objects))
+            json_ms, json_bytes = timed(lambda: wire_response(model, objects, None, Response()).body)
+            msgpack_ms, msgpack_bytes = timed(lambda: wire_response(model, objects, "application/msgpack", Response()).body)
+            print(
+                f"  {name:<9} response_model {baseline_ms:8.1f} ms   wire json {json_ms:7.1f} ms "
+                f"({baseline_ms / json_ms:4.1f}x)   wire msgpack {msgpack_ms:7.1f} ms "
+                f"({msgpack_bytes / json_bytes:.0%} of json bytes)"
+            )
+            assert json_bytes == baseline_bytes
+        db.close()
+        engine.dispose()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Team overdue lists: computed on every request vs. flagged by the incremental scanner.
+
+Builds a throwaway SQLite database with CHECKOUTS checkout rows over
+CHECKOUTS / 10 items in TEAMS teams: most long checked in, a fifth of the
+items currently out, and 1 in 20 of those overdue. Then times:
+
+  - on-the-fly: the query a dashboard would run without the scanner, joining
+    open checkouts to equipment and filtering by team and due date
+  - precomputed: the GET /teams/{id}/overdue query over overdue_checkouts
+  - the scanner itself: a first full run, then an incremental run one
+    minute later (what every OVERDUE_SCAN_INTERVAL costs), commit included
+
+Usage: python benchmarks/overdue_scan.py [checkouts] [teams]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402,F401  (registers every model)
+from app.models.base import Base  # noqa: E402
+from app.models.checkout import EquipmentCheckout, OverdueCheckout  # noqa: E402
+from app.models.equipment import Equipment  # noqa: E402
+from app.models.team import Team  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.overdue_scanner import OverdueScanService  # noqa: E402
+
+CHECKOUTS = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+TEAMS = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+ITEMS = max(CHECKOUTS // 10, TEAMS)
+REPEAT = 20
+NOW = datetime(2026, 10, 18, 12, 0)
+
+
+def build(engine):
+    rng = random.Random(7)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"auth0_id": "auth0|crew", "email": "crew@kitlog.io", "name": "Crew"}])
+        conn.execute(insert(Team), [{"name": f"Team {i}"} for i in range(TEAMS)])
+        checked_out = set(rng.sample(range(1, ITEMS + 1), ITEMS // 5))
+        conn.execute(insert(Equipment), [
+            {"name": f"Item {i}", "category": "camera", "team_id": 1 + i % TEAMS, "is_available": i + 1 not in checked_out}
+            for i in range(ITEMS)
+        ])
+        rows = []
+        for i in range(CHECKOUTS):
+            equipment_id = 1 + i % ITEMS
+            # The latest checkout of a checked-out item is open; 1 in 20 of those is overdue
+            active = equipment_id in checked_out and i >= CHECKOUTS - ITEMS
+            if not active:
+                due = NOW - timedelta(hours=rng.randint(24, 365 * 24))
+            elif rng.random() < 0.05:
+                due = NOW - timedelta(hours=rng.randint(1, 14 * 24))
+            else:
+                due = NOW + timedelta(hours=rng.randint(1, 21 * 24))
+            rows.append({"equipment_id": equipment_id, "user_id": 1, "due_date": due, "is_active": active})
+        conn.execute(insert(EquipmentCheckout), rows)
+
+
+def on_the_fly(team_id):
+    return (
+        select(EquipmentCheckout.id, EquipmentCheckout.equipment_id, Equipment.name, EquipmentCheckout.due_date)
+        .join(Equipment, Equipment.id == EquipmentCheckout.equipment_id)
+        .where(Equipment.team_id == team_id, EquipmentCheckout.is_active == True, EquipmentCheckout.due_date <= NOW)
+        .order_by(EquipmentCheckout.due_date, EquipmentCheckout.id)
+    )
+
+
+def precomputed(team_id):
+    return (
+        select(OverdueCheckout.checkout_id, OverdueCheckout.equipment_id, Equipment.name, OverdueCheckout.due_date)
+        .join(EquipmentCheckout, EquipmentCheckout.id == OverdueCheckout.checkout_id)
+        .join(Equipment, Equipment.id == OverdueCheckout.equipment_id)
+        .where(OverdueCheckout.team_id == team_id, EquipmentCheckout.is_active == True, Equipment.team_id == team_id)
+        .order_by(OverdueCheckout.due_date, OverdueCheckout.checkout_id)
+    )
+
+
+def timed(fn):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def run_benchmark():
+    path = os.path.join(tempfile.mkdtemp(), "overdue.db")
+    engine = create_engine(f"sqlite:///{path}")
+    build(engine)
+    db = sessionmaker(bind=engine)()
+
+    start = time.perf_counter()
+    first = OverdueScanService.scan(db, now=NOW)
+    first_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    OverdueScanService.scan(db, now=NOW + timedelta(minutes=1))
+    incremental_ms = (time.perf_counter() - start) * 1000
+
+    team_id = 1
+    fly_ms, fly_rows = timed(lambda: db.execute(on_the_fly(team_id)).all())
+    pre_ms, pre_rows = timed(lambda: db.execute(precomputed(team_id)).all())
+    assert [tuple(row) for row in fly_rows] == [tuple(row) for row in pre_rows]
+
+    print(f"{CHECKOUTS:,} checkouts, {TEAMS} teams, {first['flagged']:,} overdue:")
+    print(f"  team overdue list  on-the-fly {fly_ms:7.2f} ms   precomputed {pre_ms:6.2f} ms   ({len(pre_rows)} rows)")
+    print(f"  scanner            first run {first_ms:8.1f} ms   incremental run {incremental_ms:6.1f} ms")
+    db.close()
+    engine.dispose()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    run_benchmark()
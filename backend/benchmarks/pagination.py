@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Offset vs. keyset pagination latency deep into a large equipment table.
+
+Builds a throwaway SQLite database with N equipment rows, then times
+fetching page P (page size 100) with ``OFFSET`` and with a keyset cursor,
+for the default id ordering and for ``sort=name``.
+
+Usage: python benchmarks/pagination.py [rows] [page]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402,F401  (registers every model)
+from app.models.base import Base  # noqa: E402
+from app.models.equipment import Equipment  # noqa: E402
+from app.utils.pagination import KeysetSort  # noqa: E402
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+PAGE = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+LIMIT = 100
+REPEAT = 5
+
+
+def build(engine):
+    Base.metadata.create_all(engine)
+    batch = 50_000
+    with engine.begin() as conn:
+        for start in range(0, ROWS, batch):
+            conn.execute(insert(Equipment), [
+                {"name": f"Item {(i * 7919) % ROWS:07d}", "category": f"cat-{i % 40}", "owner_id": f"auth0|{i % 500}"}
+                for i in range(start, min(start + batch, ROWS))
+            ])
+
+
+def timed(fn):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def run_benchmark():
+    path = os.path.join(tempfile.mkdtemp(), "pagination.db")
+    engine = create_engine(f"sqlite:///{path}")
+    print(f"Building {ROWS:,} rows...")
+    build(engine)
+    db = sessionmaker(bind=engine)()
+
+    print(f"Page {PAGE} (size {LIMIT}, offset {(PAGE - 1) * LIMIT:,}), best of {REPEAT}:")
+    for sort in (KeysetSort("id", Equipment.id, Equipment.id), KeysetSort("name", Equipment.name, Equipment.id)):
+        order = [Equipment.id] if sort.name == "id" else [Equipment.name, Equipment.id]
+        offset_ms, offset_rows = timed(
+            lambda: db.query(Equipment).order_by(*order).offset((PAGE - 1) * LIMIT).limit(LIMIT).all()
+        )
+
+        # Cursor pointing at the last row of page PAGE - 1
+        previous = db.query(Equipment).order_by(*order).offset((PAGE - 1) * LIMIT - 1).limit(1).one()
+        _, cursor = sort.page([previous, previous], 1)
+        keyset_ms, keyset_rows = timed(lambda: sort.page(sort.apply(db.query(Equipment), cursor, LIMIT).all(), LIMIT)[0])
+
+        assert [r.id for r in offset_rows] == [r.id for r in keyset_rows]
+        print(f"  sort={sort.name:<5} offset {offset_ms:8.2f} ms   keyset {keyset_ms:6.2f} ms   ({offset_ms / keyset_ms:.0f}x)")
+    db.close()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    run_benchmark()
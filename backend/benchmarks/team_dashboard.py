@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+A team page: the five calls it used to make versus GET /teams/{id}/dashboard.
+
+Seeds one team with MEMBERS members, pending invitations, ITEMS items over
+a few categories and conditions and some open checkouts, then times, through
+the ASGI app and one request after another:
+
+  - five calls: /teams/{id}, /teams/{id}/members, /teams/{id}/invitations,
+    /equipment/stats/summary?team_id= and /equipment/categories/list?team_id=
+  - one call:   /teams/{id}/dashboard
+
+Every statement waits RTT_MS inside the driver's thread, standing in for
+the network round trip to Postgres. Authentication is stubbed out, so the
+per-request cost it adds to each of the five calls is not counted.
+
+Usage: python benchmarks/team_dashboard.py [members] [items] [iterations] [rtt_ms]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.util import await_only
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from app.api.deps import get_current_user  # noqa: E402
+from app.models.base import Base, get_async_db  # noqa: E402
+from app.models.checkout import EquipmentCheckout  # noqa: E402
+from app.models.equipment import Equipment  # noqa: E402
+from app.models.team import Team, TeamInvitation, TeamMembership  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.auth_service import UserSnapshot  # noqa: E402
+from app.services.equipment_counters import EquipmentCounterService  # noqa: E402
+
+MEMBERS = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+ITEMS = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+ITERATIONS = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+RTT = (float(sys.argv[4]) if len(sys.argv) > 4 else 1.0) / 1000
+CATEGORIES = ("camera", "lens", "audio", "lighting", "grip", "support", "monitor", "power")
+CONDITIONS = ("excellent", "good", "fair", "needs_repair")
+FIVE_CALLS = (
+    "/api/v1/teams/1",
+    "/api/v1/teams/1/members",
+    "/api/v1/teams/1/invitations",
+    "/api/v1/equipment/stats/summary?team_id=1",
+    "/api/v1/equipment/categories/list?team_id=1",
+)
+
+
+def round_trip(statement):
+    time.sleep(RTT)
+
+
+def build_database():
+    path = os.path.join(tempfile.mkdtemp(), "dashboard.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"auth0_id": f"auth0|{i}", "email": f"crew{i}@kitlog.io", "name": f"Crew {i}"} for i in range(MEMBERS)
+        ])
+        conn.execute(insert(Team), [{"name": "Rental house", "subscription_type": "paid"}])
+        conn.execute(insert(TeamMembership), [
+            {"user_id": i + 1, "team_id": 1, "role": "owner" if i == 0 else ("admin" if i < 5 else "member")}
+            for i in range(MEMBERS)
+        ])
+        conn.execute(insert(TeamInvitation), [
+            {"email": f"invitee{i}@kitlog.io", "team_id": 1, "token": f"token-{i}",
+             "expires_at": now + timedelta(days=7), "invited_by_user_id": 1}
+            for i in range(20)
+        ])
+        conn.execute(insert(Equipment), [
+            {"name": f"Item {i}", "category": CATEGORIES[i % len(CATEGORIES)], "condition": CONDITIONS[i % 7 % 4],
+             "team_id": 1, "is_available": i % 10 != 0}
+            for i in range(ITEMS)
+        ])
+        conn.execute(insert(EquipmentCheckout), [
+            {"equipment_id": i + 1, "user_id": 1 + i % MEMBERS, "due_date": now + timedelta(days=i % 5 - 2)}
+            for i in range(0, ITEMS, 10)
+        ])
+    with sessionmaker(bind=engine)() as db:
+        EquipmentCounterService.check(db, repair=True)  # Seed the counters the Core insert skipped
+        user = UserSnapshot.from_user(db.scalars(select(User).where(User.id == 1)).one())
+    return path, user
+
+
+def install(path, user):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def add_round_trip(conn, record):
+        await_only(conn.driver_connection.set_trace_callback(round_trip))
+
+    AsyncSessionBench = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncSessionBench() as session:
+            yield session
+
+    main.app.dependency_overrides[get_async_db] = override_get_async_db
+    main.app.dependency_overrides[get_current_user] = lambda: user
+
+
+async def measure():
+    results = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for name, urls in (("five calls", FIVE_CALLS), ("dashboard", ("/api/v1/teams/1/dashboard",))):
+            for url in urls:  # Warm up caches
+                assert (await client.get(url)).status_code == 200, url
+            timings = []
+            for _ in range(ITERATIONS):
+                start = time.perf_counter()
+                for url in urls:
+                    assert (await client.get(url)).status_code == 200
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            results[name] = (statistics.median(timings) * 1000, timings[int(len(timings) * 0.99) - 1] * 1000)
+    return results
+
+
+def run_benchmark():
+    path, user = build_database()
+    install(path, user)
+    results = asyncio.run(measure())
+
+    print(f"Team page, {MEMBERS} members, {ITEMS} items, {RTT * 1000:.1f} ms per statement round trip ({ITERATIONS} page loads):")
+    for name, (p50, p99) in results.items():
+        print(f"  {name:<11} p50 {p50:7.2f} ms   p99 {p99:7.2f} ms")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Inviting 1,000 emails in one bulk call versus one call per email.
+
+Each round invites INVITES fresh addresses to a paid team, once with a
+single POST /teams/{id}/invitations/bulk and once with INVITES calls to
+POST /teams/{id}/invitations, through the ASGI app. One address in ten
+already belongs to a member, which the bulk call reports and the
+single-email endpoint does not check. Every statement waits RTT_MS inside
+the driver's thread, standing in for the network round trip to Postgres;
+the HTTP round trip between the client and the app is free here, so the
+per-email numbers are a lower bound.
+
+Usage: python benchmarks/team_invitations.py [invites] [rounds] [rtt_ms]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+from sqlalchemy import create_engine, event, func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.util import await_only
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from app.api.deps import get_current_user  # noqa: E402
+from app.models.base import Base, get_async_db  # noqa: E402
+from app.models.team import Team, TeamInvitation, TeamMembership  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.auth_service import UserSnapshot  # noqa: E402
+
+INVITES = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+ROUNDS = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+RTT = (float(sys.argv[3]) if len(sys.argv) > 3 else 1.0) / 1000
+MEMBERS = INVITES // 10
+
+
+def round_trip(statement):
+    time.sleep(RTT)
+
+
+def build_database():
+    path = os.path.join(tempfile.mkdtemp(), "invitations.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"auth0_id": f"auth0|{i}", "email": f"crew{i}@kitlog.io", "name": f"Crew {i}"} for i in range(MEMBERS)
+        ])
+        conn.execute(insert(Team), [{"name": "Rental house", "subscription_type": "paid"}])
+        conn.execute(insert(TeamMembership), [
+            {"user_id": i + 1, "team_id": 1, "role": "owner" if i == 0 else "member"} for i in range(MEMBERS)
+        ])
+    with sessionmaker(bind=engine)() as db:
+        user = UserSnapshot.from_user(db.scalars(select(User).where(User.id == 1)).one())
+    return path, engine, user
+
+
+def install(path, user):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def add_round_trip(conn, record):
+        await_only(conn.driver_connection.set_trace_callback(round_trip))
+
+    AsyncSessionBench = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncSessionBench() as session:
+            yield session
+
+    main.app.dependency_overrides[get_async_db] = override_get_async_db
+    main.app.dependency_overrides[get_current_user] = lambda: user
+
+
+def emails(name, round_no):
+    """INVITES addresses, every tenth one a member's."""
+    return [
+        f"crew{i // 10}@kitlog.io" if i % 10 == 0 else f"{name}-{round_no}-{i}@kitlog.io"
+        for i in range(INVITES)
+    ]
+
+
+async def bulk_round(client, round_no):
+    response = await client.post("/api/v1/teams/1/invitations/bulk", json={"emails": emails("bulk", round_no)})
+    assert response.status_code == 200
+    assert sum(r["status"] == "invited" for r in response.json()) == INVITES - MEMBERS
+
+
+async def per_email_round(client, round_no):
+    for email in emails("single", round_no):
+        response = await client.post(
+            "/api/v1/teams/1/invitations",
+            params={"current_user_id": 1},
+            json={"email": email, "role": "member", "team_id": 1},
+        )
+        assert response.status_code in (200, 400)
+
+
+async def measure():
+    results = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for name, run_round in (("bulk", bulk_round), ("per-email", per_email_round)):
+            timings = []
+            for round_no in range(ROUNDS):
+                start = time.perf_counter()
+                await run_round(client, round_no)
+                timings.append(time.perf_counter() - start)
+            results[name] = statistics.median(timings) * 1000
+    return results
+
+
+def run_benchmark():
+    path, engine, user = build_database()
+    install(path, user)
+    results = asyncio.run(measure())
+    with sessionmaker(bind=engine)() as db:
+        assert db.scalar(select(func.count(func.distinct(TeamInvitation.token)))) == \
+            db.scalar(select(func.count()).select_from(TeamInvitation))
+
+    print(f"{INVITES} invitations, {RTT * 1000:.1f} ms per statement round trip (median of {ROUNDS}):")
+    print(f"  bulk endpoint       {results['bulk']:8.1f} ms   1 request, 1 transaction")
+    print(f"  per-email endpoint  {results['per-email']:8.1f} ms   {INVITES} requests, {INVITES} transactions"
+          f"   ({results['per-email'] / results['bulk']:.0f}x)")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+import main  # noqa: F401  (registers every model on Base.metadata)
+from app.models.base import Base, async_database_url
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def async_engine(engine):
+    # Same database file as ``engine``. TestClient runs each request on a
+    # fresh event loop, so connections must not be pooled across requests.
+    async_engine = create_async_engine(async_database_url(str(engine.url)), poolclass=NullPool)
+    yield async_engine
+    async_engine.sync_engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(engine, async_engine):
+    from fastapi.testclient import TestClient
+    from app.models.base import get_async_db, get_db
+    from app.core.cache import MemoryCacheBackend, lookup_cache
+    from app.services.membership_index import membership_index
+
+    SessionTesting = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        session = SessionTesting()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    AsyncSessionTesting = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncSessionTesting() as session:
+            yield session
+
+    main.app.dependency_overrides[get_db] = override_get_db
+    main.app.dependency_overrides[get_async_db] = override_get_async_db
+    lookup_cache.backend = MemoryCacheBackend()  # Nothing cached against another test's database
+    membership_index.clear()
+    yield TestClient(main.app)
+    main.app.dependency_overrides.pop(get_db, None)
+    main.app.dependency_overrides.pop(get_async_db, None)
@@ -1,24 +1,61 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
+from contextlib import asynccontextmanager, suppress
+import asyncio
 import os
 
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.utils.etag import ETAG_HEADER
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.services.overdue_scanner import run_overdue_scanner
+from app.utils.responses import ORJSONResponse
 from app.models.base import engine, Base
 from app.models.signup import EmailSignup  # Import to register the table
 from app.models.equipment import Equipment  # Import to register the table
+from app.models.checkout import EquipmentCheckout, OverdueCheckout  # Import to register the checkout tables
+from app.models.reservation import EquipmentReservation  # Import to register the reservation table
+from app.models.kit import Kit  # Import to register the kit tables
+from app.models.job_watermark import JobWatermark  # Import to register the background job watermark table
+from app.models.collection_version import CollectionVersion  # Import to register the ETag version table
+from app.models.equipment_counters import EquipmentCounter, EquipmentCategoryCounter  # Import to register counter tables
 from app.models.team import Team, TeamMembership, TeamInvitation  # Import to register team tables
 from app.models.user import User  # Import to register user table
 
 # Load environment variables
 load_dotenv()
 
+# Run migrations on startup
+def run_startup_migrations():
+    from startup import run_migrations
+    print("🚀 Running startup migrations...")
+    if not run_migrations():
+        print("❌ Migration failed during startup")
+        raise Exception("Database migration failed")
+    print("✅ Startup migrations completed successfully!")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    run_startup_migrations()
+    scanner = None
+    if settings.OVERDUE_SCAN_ENABLED:
+        scanner = asyncio.create_task(run_overdue_scanner(settings.OVERDUE_SCAN_INTERVAL))
+    yield
+    if scanner:
+        scanner.cancel()
+        with suppress(asyncio.CancelledError):
+            await scanner
+    from app.core.http import auth0_http
+    await auth0_http.aclose()
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     description="FastAPI backend for KitLog application",
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Set up CORS middleware
@@ -28,18 +65,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, ETAG_HEADER],
 )
 
-# Run migrations on startup
-@app.on_event("startup")
-def run_startup_migrations():
-    from startup import run_migrations
-    print("🚀 Running startup migrations...")
-    if not run_migrations():
-        print("❌ Migration failed during startup")
-        raise Exception("Database migration failed")
-    print("✅ Startup migrations completed successfully!")
-
 # Include API routes
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
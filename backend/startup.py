@@ -11,6 +11,7 @@ from sqlalchemy import create_engine, text
 from alembic.config import Config
 from alembic import command
 from app.core.config import settings
+from app.models.base import sync_database_url
 
 def run_migrations():
     """Run Alembic database migrations."""
@@ -21,10 +22,10 @@ def run_migrations():
         alembic_cfg = Config("alembic.ini")
         
         # Override the database URL in case it's different
-        alembic_cfg.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
+        alembic_cfg.set_main_option("sqlalchemy.url", sync_database_url())
         
         # Check if database has existing tables
-        engine = create_engine(settings.DATABASE_URL)
+        engine = create_engine(sync_database_url())
         with engine.connect() as conn:
             # Check if alembic_version table exists
             if "sqlite" in settings.DATABASE_URL.lower():
@@ -66,7 +67,7 @@ def run_migrations():
         print("✅ Alembic migrations completed successfully")
         
         # Verify tables exist
-        engine = create_engine(settings.DATABASE_URL)
+        engine = create_engine(sync_database_url())
         with engine.connect() as conn:
             if "sqlite" in settings.DATABASE_URL.lower():
                 result = conn.execute(text("SELECT name FROM sqlite_master WHERE type='table'"))
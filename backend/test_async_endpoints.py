@@ -0,0 +1,114 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event, select
+
+from app.models.base import async_database_url, sync_database_url
+from app.models.team import Team, TeamInvitation, TeamMembership
+from app.models.user import User
+
+
+@pytest.fixture
+def team(db):
+    users = [User(auth0_id=f"auth0|{i}", email=f"user{i}@kitlog.io", name=f"User {i}") for i in range(3)]
+    team = Team(name="Rental house", subscription_type="paid")
+    db.add_all(users + [team])
+    db.flush()
+    db.add(TeamMembership(user_id=users[0].id, team_id=team.id, role="owner"))
+    db.commit()
+    return {"team": team, "users": users}
+
+
+def test_database_urls_pick_a_driver_per_engine():
+    assert async_database_url("sqlite:///./kitlog.db") == "sqlite+aiosqlite:///./kitlog.db"
+    assert async_database_url("postgresql://u:p@db/kitlog") == "postgresql+asyncpg://u:p@db/kitlog"
+    assert sync_database_url("postgresql+asyncpg://u:p@db/kitlog") == "postgresql+psycopg2://u:p@db/kitlog"
+    assert sync_database_url("sqlite+aiosqlite:///./kitlog.db") == "sqlite+pysqlite:///./kitlog.db"
+
+
+def test_team_responses_embed_members_and_invitations(client, team):
+    team_id, owner = team["team"].id, team["users"][0]
+    client.post(
+        f"/api/v1/teams/{team_id}/invitations",
+        params={"current_user_id": owner.id},
+        json={"email": "new@kitlog.io", "role": "member", "team_id": team_id},
+    )
+
+    body = client.get(f"/api/v1/teams/{team_id}").json()
+    assert [m["role"] for m in body["members"]] == ["owner"]
+    assert [i["email"] for i in body["invitations"]] == ["new@kitlog.io"]
+    assert client.get("/api/v1/teams/").json()[0]["members"] == body["members"]
+
+
+def test_membership_and_invitation_lifecycle(client, db, team):
+    team_id, (owner, member, invitee) = team["team"].id, team["users"]
+
+    response = client.post(f"/api/v1/teams/{team_id}/members", json={"user_id": member.id, "role": "admin"})
+    assert response.status_code == 200
+    assert response.json()["joined_at"]
+    assert client.post(f"/api/v1/teams/{team_id}/members", json={"user_id": member.id}).status_code == 400
+
+    invitation = client.post(
+        f"/api/v1/teams/{team_id}/invitations",
+        params={"current_user_id": member.id},
+        json={"email": invitee.email, "role": "member", "team_id": team_id},
+    ).json()
+    assert invitation["invited_by_user_id"] == member.id
+    accepted = client.post(f"/api/v1/invitations/{invitation['token']}/accept", params={"accepting_user_id": invitee.id})
+    assert accepted.status_code == 200
+
+    teams = client.get(f"/api/v1/users/{invitee.id}/teams").json()
+    assert [(t["team_name"], t["role"]) for t in teams] == [("Rental house", "member")]
+
+    assert client.delete(f"/api/v1/teams/{team_id}/members/{owner.id}").status_code == 400  # Last owner
+    assert client.delete(f"/api/v1/teams/{team_id}/members/{invitee.id}").status_code == 200
+    members = db.scalars(select(TeamMembership.user_id).where(TeamMembership.team_id == team_id))
+    assert sorted(members) == sorted([owner.id, member.id])
+    assert db.scalar(select(TeamInvitation.is_accepted)) is True
+
+
+
+def add_teams(db, user, count):
+    teams = [Team(name=f"Crew {i}") for i in range(count)]
+    db.add_all(teams)
+    db.flush()
+    expires_at = datetime.utcnow() + timedelta(days=7)
+    for team in teams:
+        db.add(TeamMembership(user_id=user.id, team_id=team.id, role="owner"))
+        db.add(TeamInvitation(
+            email=f"invitee{team.id}@kitlog.io", team_id=team.id, token=f"token-{team.id}",
+            expires_at=expires_at, invited_by_user_id=user.id,
+        ))
+    db.commit()
+
+
+def test_team_list_statement_count_does_not_grow_with_teams(client, db, async_engine, team):
+    owner = team["users"][0]
+    statements = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    def page(limit):
+        statements.clear()
+        response = client.get("/api/v1/teams/", params={"limit": limit})
+        return response.json(), len(statements)
+
+    add_teams(db, owner, 4)
+    few, few_statements = page(100)
+    add_teams(db, owner, 60)
+    many, many_statements = page(100)
+
+    assert len(few) == 5 and len(many) == 65
+    assert all(len(t["members"]) == 1 for t in many)
+    # Teams, then members and invitations each in one IN query
+    assert few_statements == many_statements == 3
+
+
+def test_team_list_pages_with_a_cursor(client, db, team):
+    add_teams(db, team["users"][0], 6)
+    seen, cursor = [], None
+    while True:
+        response = client.get("/api/v1/teams/", params={"limit": 3, **({"cursor": cursor} if cursor else {})})
+        seen += [t["id"] for t in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    assert seen == sorted(seen) and len(seen) == len(set(seen)) == 7
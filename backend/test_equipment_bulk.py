@@ -0,0 +1,104 @@
+import pytest
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.models.equipment import Equipment
+from app.services.equipment_counters import EquipmentCounterService
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(settings, "BULK_CHUNK_SIZE", 4)
+
+
+def items(n, **fields):
+    return [{"name": f"Item {i}", "category": "camera", "serial_number": f"SN-{i}", **fields} for i in range(n)]
+
+
+def test_bulk_create_reports_duplicate_serials_per_row(client, db):
+    client.post("/api/v1/equipment/", json={"name": "Existing", "category": "camera", "serial_number": "SN-3"})
+    payload = items(10, owner_id="auth0|1", team_id=7)
+    payload[8]["serial_number"] = "SN-1"
+    payload[9]["serial_number"] = None
+
+    response = client.post("/api/v1/equipment/bulk", json={"items": payload})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [e["name"] for e in body["created"]] == [f"Item {i}" for i in range(10) if i not in (3, 8)]
+    assert all(e["id"] and e["team_id"] == 7 for e in body["created"])
+    assert [(e["index"], e["detail"]) for e in body["errors"]] == [
+        (3, "Serial number already exists"),
+        (8, "Serial number appears more than once in this request"),
+    ]
+    assert db.query(Equipment).count() == 9
+    assert client.get("/api/v1/equipment/stats/summary", params={"team_id": 7}).json()["total_items"] == 8
+    assert EquipmentCounterService.check(db)["drift"] == []
+
+
+def test_bulk_create_batches_statements(client, async_engine):
+    statements = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    client.post("/api/v1/equipment/bulk", json={"items": items(10)})
+
+    inserts = [s for s in statements if s.startswith("INSERT INTO equipment ")]
+    assert len(inserts) == 3  # ceil(10 / chunk size 4)
+
+
+def test_bulk_update_and_delete(client, db):
+    created = client.post("/api/v1/equipment/bulk", json={"items": items(6, owner_id="auth0|1")}).json()["created"]
+    ids = [e["id"] for e in created]
+
+    response = client.patch("/api/v1/equipment/bulk", json={"items": [
+        {"id": ids[0], "is_available": False},
+        {"id": ids[1], "category": "audio", "owner_id": "auth0|2"},
+        {"id": ids[2], "serial_number": "SN-3"},
+        {"id": 999_999, "name": "Ghost"},
+        {"id": ids[0], "name": "Twice"},
+        {"id": ids[5], "serial_number": "SN-5"},
+    ]}).json()
+
+    assert [e["id"] for e in response["updated"]] == [ids[0], ids[1], ids[5]]
+    assert [(e["index"], e["detail"]) for e in response["errors"]] == [
+        (2, "Serial number already exists"),
+        (3, "Equipment not found"),
+        (4, "Equipment id appears more than once in this request"),
+    ]
+    assert client.get(f"/api/v1/equipment/{ids[1]}").json()["owner_id"] == "auth0|2"
+    assert client.get("/api/v1/equipment/stats/summary", params={"owner_id": "auth0|1"}).json() == {
+        "total_items": 5, "available_items": 4, "in_use_items": 1, "categories": 1,
+    }
+
+    response = client.request("DELETE", "/api/v1/equipment/bulk", json={"ids": ids[:4] + [999_999]}).json()
+    assert response["deleted"] == ids[:4]
+    assert response["errors"] == [{"index": 4, "id": 999_999, "detail": "Equipment not found"}]
+    assert db.query(Equipment).count() == 2
+    assert EquipmentCounterService.check(db)["drift"] == []
+
+
+def test_bulk_rejects_oversized_requests(client, monkeypatch):
+    response = client.post("/api/v1/equipment/bulk", json={"items": items(settings.BULK_MAX_ITEMS + 1)})
+    assert response.status_code == 422
+
+
+def test_bulk_create_falls_back_to_single_rows_on_a_race(client, db, engine, async_engine):
+    raced = []
+
+    def concurrent_insert(conn, cursor, statement, parameters, context, executemany):
+        # Another writer takes SN-2 between the serial check and the chunk insert
+        if statement.startswith("INSERT INTO equipment ") and not raced:
+            raced.append(True)
+            with engine.begin() as other:
+                other.exec_driver_sql(
+                    "INSERT INTO equipment (name, category, serial_number, is_available) VALUES ('Raced', 'camera', 'SN-2', 1)"
+                )
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", concurrent_insert)
+    body = client.post("/api/v1/equipment/bulk", json={"items": items(4, owner_id="auth0|1")}).json()
+    event.remove(async_engine.sync_engine, "before_cursor_execute", concurrent_insert)
+
+    assert [e["serial_number"] for e in body["created"]] == ["SN-0", "SN-1", "SN-3"]
+    assert body["errors"] == [{"index": 2, "id": None, "detail": "Serial number already exists"}]
+    assert db.query(Equipment).count() == 4
+    assert EquipmentCounterService.check(db)["drift"] == []
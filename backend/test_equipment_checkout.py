@@ -0,0 +1,139 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+from app.models.checkout import EquipmentCheckout
+from app.models.user import User
+from app.services.equipment_counters import EquipmentCounterService
+
+
+@pytest.fixture
+def users(client, db):
+    import main
+    from app.api.deps import get_current_user
+    from app.services.auth_service import UserSnapshot
+
+    users = [User(auth0_id=f"auth0|{i}", email=f"crew{i}@kitlog.io", name=f"Crew {i}") for i in range(2)]
+    db.add_all(users)
+    db.commit()
+    snapshots = [UserSnapshot.from_user(user) for user in users]
+    main.app.dependency_overrides[get_current_user] = lambda: snapshots[0]
+    yield snapshots
+    main.app.dependency_overrides.pop(get_current_user, None)
+
+
+def create(client, name="Alexa Mini", **fields):
+    response = client.post("/api/v1/equipment/", json={"name": name, "category": "camera", "owner_id": "auth0|1", **fields})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_checkout_and_checkin(client, db, users):
+    item = create(client)
+    url = f"/api/v1/equipment/{item['id']}"
+
+    due_date = (datetime.utcnow() + timedelta(days=3)).isoformat() + "Z"
+    checkout = client.post(f"{url}/checkout", json={"due_date": due_date, "notes": "Shoot day 1"})
+    assert checkout.status_code == 200
+    assert checkout.json()["user_id"] == users[0].id and checkout.json()["is_active"] is True
+    assert client.get(url).json()["is_available"] is False
+    assert client.get("/api/v1/equipment/stats/summary", params={"owner_id": "auth0|1"}).json()["available_items"] == 0
+
+    assert client.post(f"{url}/checkout").status_code == 409
+    # Availability follows checkouts; it cannot be flipped back by hand
+    assert client.put(url, json={"is_available": True}).status_code == 409
+    bulk = client.patch("/api/v1/equipment/bulk", json={"items": [{"id": item["id"], "is_available": True}]}).json()
+    assert bulk["updated"] == [] and bulk["errors"][0]["id"] == item["id"]
+
+    checkin = client.post(f"{url}/checkin", json={"notes": "Returned clean"})
+    assert checkin.status_code == 200
+    assert checkin.json()["is_active"] is False and checkin.json()["checked_in_at"] is not None
+    assert client.get(url).json()["is_available"] is True
+    assert client.post(f"{url}/checkin").status_code == 409
+    assert client.post(f"{url}/checkout").status_code == 200
+
+    assert EquipmentCounterService.check(db)["drift"] == []
+    assert client.post("/api/v1/equipment/999/checkout").status_code == 404
+    assert client.post("/api/v1/equipment/999/checkin").status_code == 404
+
+
+def test_only_the_borrower_owner_or_team_admins_check_in(client, db, users):
+    import main
+    from app.api.deps import get_current_user
+    from app.models.team import Team, TeamMembership
+    from app.services.auth_service import UserSnapshot
+
+    def sign_in(snapshot):
+        main.app.dependency_overrides[get_current_user] = lambda: snapshot
+
+    team = Team(name="Rental house")
+    staff = [User(auth0_id=f"auth0|staff{i}", email=f"staff{i}@kitlog.io", name=f"Staff {i}") for i in range(2)]
+    db.add_all([team, *staff])
+    db.flush()
+    db.add_all([
+        TeamMembership(user_id=staff[0].id, team_id=team.id, role="member"),
+        TeamMembership(user_id=staff[1].id, team_id=team.id, role="admin"),
+    ])
+    db.commit()
+    member, team_admin = (UserSnapshot.from_user(user) for user in staff)
+    owned, team_item = create(client)["id"], create(client, owner_id=None, team_id=team.id)["id"]
+
+    for equipment_id, allowed in ((owned, users[1]), (team_item, team_admin)):
+        url = f"/api/v1/equipment/{equipment_id}"
+        sign_in(users[0])
+        assert client.post(f"{url}/checkout").status_code == 200
+        sign_in(member)
+        assert client.post(f"{url}/checkin").status_code == 403
+        assert client.get(url).json()["is_available"] is False
+        sign_in(allowed)
+        assert client.post(f"{url}/checkin").status_code == 200
+
+    # The borrower can always bring it back
+    url = f"/api/v1/equipment/{team_item}"
+    sign_in(member)
+    assert client.post(f"{url}/checkout").status_code == 200
+    assert client.post(f"{url}/checkin").status_code == 200
+
+
+def test_bulk_delete_skips_checked_out_items(client, db, users):
+    out, spare = create(client)["id"], create(client, name="Spare")["id"]
+    assert client.post(f"/api/v1/equipment/{out}/checkout").status_code == 200
+
+    response = client.request("DELETE", "/api/v1/equipment/bulk", json={"ids": [out, spare]}).json()
+    assert response["deleted"] == [spare]
+    assert response["errors"] == [{"index": 0, "id": out, "detail": "Equipment is checked out; check it in instead"}]
+    assert client.get(f"/api/v1/equipment/{out}").status_code == 200
+    assert db.query(EquipmentCheckout).filter(EquipmentCheckout.is_active == True).count() == 1
+    assert EquipmentCounterService.check(db)["drift"] == []
+
+
+def test_unavailable_items_cannot_be_checked_out(client, users):
+    item = create(client, is_available=False)  # e.g. out for repair
+    assert client.post(f"/api/v1/equipment/{item['id']}/checkout").status_code == 409
+
+
+def test_concurrent_checkouts_have_one_winner_per_item(client, db, users):
+    items = [create(client, name=f"Camera {i}")["id"] for i in range(4)]
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        responses = list(pool.map(
+            lambda i: client.post(f"/api/v1/equipment/{items[i % 4]}/checkout"), range(64)
+        ))
+
+    assert sorted(r.status_code for r in responses) == [200] * 4 + [409] * 60
+    assert sorted(r.json()["equipment_id"] for r in responses if r.status_code == 200) == items
+    assert db.query(EquipmentCheckout).filter(EquipmentCheckout.is_active == True).count() == 4
+    assert EquipmentCounterService.check(db)["drift"] == []
+
+
+def test_one_active_checkout_per_item_is_enforced_by_the_database(client, db, users):
+    item = create(client)
+    rows = [{"equipment_id": item["id"], "user_id": user.id} for user in users]
+
+    db.execute(insert(EquipmentCheckout), [{**row, "is_active": False} for row in rows])
+    db.execute(insert(EquipmentCheckout), rows[:1])
+    with pytest.raises(IntegrityError):
+        db.execute(insert(EquipmentCheckout), rows[1:])
@@ -0,0 +1,111 @@
+import pytest
+from sqlalchemy import event, insert
+
+import main
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.models.equipment import Equipment
+from app.models.team import Team
+from app.models.user import User
+from app.services.auth_service import UserSnapshot
+from app.services.equipment_counters import EquipmentCounterService
+
+
+@pytest.fixture
+def sign_in(client):
+    """Make requests as the given user."""
+    def sign_in(user):
+        snapshot = UserSnapshot.from_user(user)
+        main.app.dependency_overrides[get_current_user] = lambda: snapshot
+    yield sign_in
+    main.app.dependency_overrides.pop(get_current_user, None)
+
+
+@pytest.fixture
+def team(db):
+    team = Team(name="Rental house")
+    db.add(team)
+    db.commit()
+    return team
+
+
+def stats(client, **params):
+    response = client.get("/api/v1/equipment/stats/summary", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+def assert_counters_match(db, client, team):
+    for params in ({"owner_id": "auth0|1"}, {"owner_id": "auth0|2"}, {"team_id": team.id}):
+        owner_id, team_id = params.get("owner_id"), params.get("team_id")
+        total, available, categories = EquipmentCounterService.aggregate_stats(db, owner_id, team_id)
+        assert stats(client, **params) == {
+            "total_items": total,
+            "available_items": available,
+            "in_use_items": total - available,
+            "categories": categories,
+        }
+    assert EquipmentCounterService.check(db)["drift"] == []
+
+
+def test_counters_follow_create_update_and_delete(client, db, team):
+    ids = []
+    for i in range(4):
+        response = client.post("/api/v1/equipment/", json={
+            "name": f"Light {i}", "category": "lighting" if i % 2 else "camera",
+            "owner_id": "auth0|1", "team_id": team.id,
+        })
+        ids.append(response.json()["id"])
+    assert stats(client, owner_id="auth0|1") == {
+        "total_items": 4, "available_items": 4, "in_use_items": 0, "categories": 2,
+    }
+
+    client.put(f"/api/v1/equipment/{ids[0]}", json={"is_available": False})
+    client.put(f"/api/v1/equipment/{ids[1]}", json={"category": "audio"})
+    client.put(f"/api/v1/equipment/{ids[2]}", json={"owner_id": "auth0|2"})
+    assert_counters_match(db, client, team)
+
+    for equipment_id in ids:
+        client.delete(f"/api/v1/equipment/{equipment_id}")
+    assert stats(client, owner_id="auth0|1")["categories"] == 0
+    assert_counters_match(db, client, team)
+
+
+def test_stats_is_one_query(client, db, async_engine, team, monkeypatch):
+    db.add_all([Equipment(name=f"Item {i}", category=f"cat-{i % 3}", owner_id="auth0|1") for i in range(9)])
+    db.commit()
+    statements = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    counted = stats(client, owner_id="auth0|1")
+    monkeypatch.setattr(settings, "EQUIPMENT_COUNTERS_ENABLED", False)
+    aggregated = stats(client, owner_id="auth0|1")
+
+    assert counted == aggregated == {"total_items": 9, "available_items": 9, "in_use_items": 0, "categories": 3}
+    assert len(statements) == 2
+    assert "FROM equipment_counters" in statements[0]
+
+
+def test_checker_reports_and_repairs_drift(client, db, team, sign_in):
+    client.post("/api/v1/equipment/", json={"name": "Tripod", "category": "support", "owner_id": "auth0|1"})
+    # Core inserts bypass the ORM flush hook, so the counters miss this row
+    db.execute(insert(Equipment), [{"name": "Slider", "category": "support", "owner_id": "auth0|1", "team_id": team.id}])
+    db.commit()
+
+    report = client.get("/api/v1/admin/equipment-counters").json()
+    assert {(d["scope"], d["category"]) for d in report["drift"]} == {
+        ("owner", None), ("owner", "support"), ("team", None), ("team", "support"),
+    }
+    assert report["repaired"] is False
+
+    # Rewriting every counter is for admins only
+    staff = User(auth0_id="auth0|staff", email="staff@kitlog.io", name="Staff")
+    admin = User(auth0_id="auth0|admin", email="admin@kitlog.io", name="Admin", is_admin=True)
+    db.add_all([staff, admin])
+    db.commit()
+    sign_in(staff)
+    assert client.post("/api/v1/admin/equipment-counters/rebuild").status_code == 403
+    sign_in(admin)
+    assert client.post("/api/v1/admin/equipment-counters/rebuild").json()["repaired"] is True
+    assert stats(client, owner_id="auth0|1")["total_items"] == 2
+    assert_counters_match(db, client, team)
@@ -0,0 +1,136 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.team import Team
+from app.models.user import User
+
+DAY = timedelta(days=1)
+START = (datetime.utcnow() + 10 * DAY).replace(hour=9, minute=0, second=0, microsecond=0)
+
+
+@pytest.fixture
+def crew(client, db):
+    import main
+    from app.api.deps import get_current_user
+    from app.services.auth_service import UserSnapshot
+
+    users = [User(auth0_id=f"auth0|{i}", email=f"crew{i}@kitlog.io", name=f"Crew {i}") for i in range(2)]
+    team = Team(name="Rental house")
+    db.add_all([*users, team])
+    db.commit()
+    snapshots = [UserSnapshot.from_user(user) for user in users]
+    main.app.dependency_overrides[get_current_user] = lambda: snapshots[0]
+    yield {"users": snapshots, "team": team, "as_user": lambda i: main.app.dependency_overrides.update(
+        {get_current_user: lambda: snapshots[i]}
+    )}
+    main.app.dependency_overrides.pop(get_current_user, None)
+
+
+def create(client, team, name):
+    return client.post("/api/v1/equipment/", json={"name": name, "category": "camera", "team_id": team.id}).json()["id"]
+
+
+def window(start_days, end_days):
+    return {"starts_at": (START + start_days * DAY).isoformat(), "ends_at": (START + end_days * DAY).isoformat()}
+
+
+def reserve(client, item, start_days, end_days):
+    return client.post(f"/api/v1/equipment/{item}/reservations", json=window(start_days, end_days))
+
+
+def test_overlapping_reservations_are_rejected(client, crew):
+    item = create(client, crew["team"], "Alexa Mini")
+    assert reserve(client, item, 2, 5).status_code == 200
+
+    for start, end in [(3, 4), (1, 3), (4, 6), (1, 6), (2, 5)]:
+        assert reserve(client, item, start, end).status_code == 409, (start, end)
+    # Windows are half-open: back-to-back bookings do not overlap
+    assert reserve(client, item, 0, 2).status_code == 200
+    assert reserve(client, item, 5, 7).status_code == 200
+
+    listed = client.get(f"/api/v1/equipment/{item}/reservations").json()
+    assert [r["starts_at"][:10] for r in listed] == [(START + d * DAY).date().isoformat() for d in (0, 2, 5)]
+    assert reserve(client, 999, 2, 5).status_code == 404
+
+
+@pytest.mark.parametrize("start, end", [(3, 3), (3, 2), (0, 91), (-20, -15)])
+def test_invalid_windows_are_rejected(client, crew, start, end):
+    item = create(client, crew["team"], "Alexa Mini")
+    assert reserve(client, item, start, end).status_code == 422
+
+
+def test_open_checkouts_block_reservations(client, crew):
+    item = create(client, crew["team"], "Alexa Mini")
+    due_date = (START + 3 * DAY).isoformat()
+    assert client.post(f"/api/v1/equipment/{item}/checkout", json={"due_date": due_date}).status_code == 200
+
+    assert reserve(client, item, 2, 4).status_code == 409
+    assert reserve(client, item, 3, 4).status_code == 200  # Due back by then
+
+
+def test_reservations_block_other_borrowers_checkouts(client, crew):
+    item = create(client, crew["team"], "Alexa Mini")
+    url = f"/api/v1/equipment/{item}"
+    crew["as_user"](1)
+    assert reserve(client, item, 2, 5).status_code == 200
+
+    crew["as_user"](0)
+    for due_days in (3, 6, None):  # Into, past or without end through the booking
+        body = {"due_date": (START + due_days * DAY).isoformat()} if due_days else {}
+        response = client.post(f"{url}/checkout", json=body)
+        assert response.status_code == 409 and "reserved" in response.json()["detail"], due_days
+    assert client.get(url).json()["is_available"] is True
+
+    # Back before the booking starts
+    assert client.post(f"{url}/checkout", json={"due_date": (START + 2 * DAY).isoformat()}).status_code == 200
+    assert client.post(f"{url}/checkin").status_code == 200
+    # The booker may take it early, without a due date
+    crew["as_user"](1)
+    assert client.post(f"{url}/checkout").status_code == 200
+
+
+def test_availability_for_a_team(client, crew):
+    team = crew["team"]
+    free, booked, booked_later, checked_out = (create(client, team, f"Camera {i}") for i in range(4))
+    client.post("/api/v1/equipment/", json={"name": "Personal camera", "category": "camera"})
+    assert reserve(client, booked, 1, 4).status_code == 200
+    assert reserve(client, booked_later, 6, 8).status_code == 200
+    assert client.post(f"/api/v1/equipment/{checked_out}/checkout").status_code == 200
+
+    def available(start_days, end_days, **params):
+        query = {"from": (START + start_days * DAY).isoformat(), "to": (START + end_days * DAY).isoformat()}
+        response = client.get("/api/v1/equipment/availability", params={**query, "team_id": team.id, **params})
+        assert response.status_code == 200
+        return [item["id"] for item in response.json()]
+
+    assert available(2, 3) == [free, booked_later]
+    assert available(4, 6) == [free, booked, booked_later]
+    assert available(0, 10) == [free]
+    assert available(0, 10, limit=1) == [free]
+    assert client.get("/api/v1/equipment/availability", params={"from": START.isoformat(), "to": START.isoformat()}).status_code == 400
+
+
+def test_only_the_booker_can_cancel(client, crew):
+    item = create(client, crew["team"], "Alexa Mini")
+    reservation = reserve(client, item, 1, 2).json()
+    url = f"/api/v1/equipment/{item}/reservations/{reservation['id']}"
+
+    crew["as_user"](1)
+    assert client.delete(url).status_code == 404
+    crew["as_user"](0)
+    assert client.delete(url).status_code == 200
+    assert reserve(client, item, 1, 2).status_code == 200
+
+
+def test_concurrent_overlapping_bookings_never_both_succeed(client, crew):
+    item = create(client, crew["team"], "Alexa Mini")
+
+    # Windows [0, 2), [1, 3), [2, 4) and [3, 5), eight attempts each
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        responses = list(pool.map(lambda i: reserve(client, item, i % 4, i % 4 + 2), range(32)))
+
+    assert all(r.status_code in (200, 409) for r in responses)
+    won = sorted((r.json()["starts_at"], r.json()["ends_at"]) for r in responses if r.status_code == 200)
+    assert len(won) == 2 and won[0][1] <= won[1][0]
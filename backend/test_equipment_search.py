@@ -0,0 +1,61 @@
+import pytest
+
+from app.models.equipment import Equipment
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+
+@pytest.fixture
+def equipment(db):
+    rows = [
+        Equipment(name="Canon EOS R5", category="camera", brand="Canon", owner_id="auth0|1"),
+        Equipment(name="Sony FX3", category="camera", brand="Sony", notes="Ships with a Canon EF adapter", owner_id="auth0|1"),
+        Equipment(name="Rode NTG3", category="audio", description="Shotgun microphone", owner_id="auth0|2"),
+    ]
+    db.add_all(rows)
+    db.commit()
+    return rows
+
+
+def test_ranks_name_matches_first_and_highlights(client, equipment):
+    response = client.get("/api/v1/equipment/search", params={"q": "canon"})
+
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["name"] for r in results] == ["Canon EOS R5", "Sony FX3"]
+    assert results[0]["rank"] > results[1]["rank"]
+    assert "<mark>Canon</mark>" in results[1]["snippet"]
+
+
+def test_prefix_terms_filters_and_pagination(client, equipment):
+    first = client.get("/api/v1/equipment/search", params={"q": "can", "limit": 1})
+    cursor = first.headers[NEXT_CURSOR_HEADER]
+    second = client.get("/api/v1/equipment/search", params={"q": "can", "limit": 1, "cursor": cursor})
+
+    assert [r["name"] for r in first.json() + second.json()] == ["Canon EOS R5", "Sony FX3"]
+    assert NEXT_CURSOR_HEADER not in second.headers
+    assert client.get("/api/v1/equipment/search", params={"q": "shotgun", "owner_id": "auth0|1"}).json() == []
+
+
+def test_index_follows_updates_and_deletes(client, db, equipment):
+    mic = equipment[2]
+    mic.description = "Canon-compatible boom"
+    db.commit()
+    assert "Rode NTG3" in [r["name"] for r in client.get("/api/v1/equipment/search", params={"q": "canon"}).json()]
+
+    db.delete(mic)
+    db.commit()
+    assert client.get("/api/v1/equipment/search", params={"q": "boom"}).json() == []
+
+
+def test_snippets_escape_equipment_text(client, db):
+    db.add(Equipment(
+        name="Canon <script>alert(1)</script>", category="camera",
+        notes='Canon lens cap & <img src=x onerror="alert(2)">',
+    ))
+    db.commit()
+
+    snippet = client.get("/api/v1/equipment/search", params={"q": "canon"}).json()[0]["snippet"]
+    assert "<mark>Canon</mark>" in snippet
+    assert "&lt;script&gt;" in snippet
+    # The only markup left is the highlighting
+    assert snippet.replace("<mark>", "").replace("</mark>", "").count("<") == 0
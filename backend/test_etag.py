@@ -0,0 +1,145 @@
+import pytest
+from sqlalchemy import event
+
+from app.models.team import Team, TeamMembership
+from app.models.user import User
+from app.utils.etag import conditional_get_stats, etag_matches
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats(monkeypatch):
+    monkeypatch.setattr(conditional_get_stats, "_requests", type(conditional_get_stats._requests)(int))
+    monkeypatch.setattr(conditional_get_stats, "_not_modified", type(conditional_get_stats._not_modified)(int))
+
+
+def revalidate(client, url, etag):
+    return client.get(url, headers={"If-None-Match": etag})
+
+
+def test_etag_matching():
+    assert etag_matches('W/"equipment-3"', 'W/"equipment-3"')
+    assert etag_matches('"equipment-3"', 'W/"equipment-3"')
+    assert etag_matches('W/"x", W/"equipment-3"', 'W/"equipment-3"')
+    assert etag_matches("*", 'W/"equipment-3"')
+    assert not etag_matches('W/"equipment-4"', 'W/"equipment-3"')
+    assert not etag_matches(None, 'W/"equipment-3"')
+
+
+def test_equipment_not_modified_until_written(client, async_engine):
+    created = client.post("/api/v1/equipment/", json={"name": "Tripod", "category": "support"}).json()
+    item_url = f"/api/v1/equipment/{created['id']}"
+
+    for url, table in (("/api/v1/equipment/", "FROM collection_versions"), (item_url, "FROM equipment")):
+        first = client.get(url)
+        etag = first.headers["ETag"]
+        assert etag.startswith('W/"')
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+        cached = revalidate(client, url, etag)
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["ETag"] == etag
+        # Answered from a version number alone: one indexed lookup, nothing serialized
+        assert len(statements) == 1 and table in statements[0]
+
+    etags = {url: client.get(url).headers["ETag"] for url in ("/api/v1/equipment/", item_url)}
+    writes = [
+        (lambda: client.put(item_url, json={"notes": "Bent leg"}), True),
+        (lambda: client.post("/api/v1/equipment/bulk", json={"items": [{"name": "Slider", "category": "support"}]}), False),
+        (lambda: client.request("DELETE", "/api/v1/equipment/bulk", json={"ids": [created["id"] + 1]}), False),
+    ]
+    for write, touches_item in writes:
+        assert write().status_code == 200
+        assert revalidate(client, "/api/v1/equipment/", etags["/api/v1/equipment/"]).status_code == 200
+        etags["/api/v1/equipment/"] = client.get("/api/v1/equipment/").headers["ETag"]
+        # The item's ETag follows its own row version, not writes to other items
+        response = revalidate(client, item_url, etags[item_url])
+        assert response.status_code == (200 if touches_item else 304)
+        etags[item_url] = response.headers["ETag"]
+
+    assert revalidate(client, item_url, etags[item_url]).status_code == 304
+    assert client.get(item_url).json()["notes"] == "Bent leg"
+    assert client.get("/api/v1/equipment/999999").status_code == 404
+
+
+def test_list_etags_are_scoped_to_owner_and_team(client, db):
+    teams = [Team(name="Rental house"), Team(name="Film school")]
+    db.add_all(teams)
+    db.commit()
+    urls = {
+        "team_a": f"/api/v1/equipment/?team_id={teams[0].id}",
+        "team_b": f"/api/v1/equipment/?team_id={teams[1].id}",
+        "owner": "/api/v1/equipment/?owner_id=auth0|1",
+        "all": "/api/v1/equipment/",
+    }
+    etags = {name: client.get(url).headers["ETag"] for name, url in urls.items()}
+
+    created = client.post("/api/v1/equipment/", json={"name": "Tripod", "category": "support", "team_id": teams[0].id})
+    assert created.status_code == 200
+    changed = {name for name, url in urls.items() if revalidate(client, url, etags[name]).status_code == 200}
+    # Writers to one team neither invalidate nor contend with another team's or owner's lists
+    assert changed == {"team_a", "all"}
+
+    etags = {name: client.get(url).headers["ETag"] for name, url in urls.items()}
+    moved = client.put(f"/api/v1/equipment/{created.json()['id']}", json={"team_id": teams[1].id})
+    assert moved.status_code == 200
+    changed = {name for name, url in urls.items() if revalidate(client, url, etags[name]).status_code == 200}
+    # Moving an item changes the lists it left and the ones it joined
+    assert changed == {"team_a", "team_b", "all"}
+
+
+def test_etags_follow_the_representation(client):
+    created = client.post("/api/v1/equipment/", json={"name": "Tripod", "category": "support"}).json()
+    for url in ("/api/v1/equipment/", f"/api/v1/equipment/{created['id']}"):
+        etag = client.get(url).headers["ETag"]
+        packed = client.get(url, headers={"If-None-Match": etag, "Accept": "application/msgpack"})
+        assert packed.status_code == 200
+        assert packed.headers["content-type"] == "application/msgpack"
+
+        cached = client.get(url, headers={"If-None-Match": packed.headers["ETag"], "Accept": "application/msgpack"})
+        assert cached.status_code == 304
+        assert cached.headers["Vary"] == "Accept"
+
+    full = client.get("/api/v1/equipment/").headers["ETag"]
+    sparse = client.get("/api/v1/equipment/", params={"fields": "id,name"}, headers={"If-None-Match": full})
+    assert sparse.status_code == 200
+    assert sparse.headers["ETag"] != full
+    assert client.get(
+        "/api/v1/equipment/", params={"fields": "id,name"}, headers={"If-None-Match": sparse.headers["ETag"]}
+    ).status_code == 304
+
+
+def test_team_etag_follows_memberships(client, db):
+    user = User(auth0_id="auth0|1", email="a@example.com", name="A")
+    team = Team(name="Rental house")
+    db.add_all([user, team])
+    db.commit()
+    url = f"/api/v1/teams/{team.id}"
+    etag = client.get(url).headers["ETag"]
+    assert revalidate(client, url, etag).status_code == 304
+
+    db.add(TeamMembership(user_id=user.id, team_id=team.id, role="owner"))
+    db.commit()
+    response = revalidate(client, url, etag)
+    assert response.status_code == 200
+    assert [m["role"] for m in response.json()["members"]] == ["owner"]
+
+    # Loading without changing anything does not bump the version
+    etag = response.headers["ETag"]
+    db.get(Team, team.id).name = "Rental house"
+    db.commit()
+    assert revalidate(client, url, etag).status_code == 304
+
+
+def test_not_modified_ratio_is_reported(client):
+    etag = client.get("/api/v1/equipment/").headers["ETag"]
+    for _ in range(3):
+        revalidate(client, "/api/v1/equipment/", etag)
+
+    stats = client.get("/api/v1/admin/conditional-get").json()
+    assert stats["endpoints"]["equipment.list"] == {"requests": 4, "not_modified": 3, "not_modified_ratio": 0.75}
+    assert stats["not_modified_ratio"] == 0.75
@@ -0,0 +1,119 @@
+import csv
+import gzip
+import io
+import json
+import subprocess
+import sys
+import textwrap
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.models.base import Base
+
+
+def test_equipment_export_formats(client):
+    for i in range(5):
+        client.post("/api/v1/equipment/", json={
+            "name": f"Lens {i}", "category": "lens" if i % 2 else "camera", "owner_id": "auth0|1",
+            "notes": 'Has a "quoted", comma\nand a newline',
+        })
+
+    response = client.get("/api/v1/equipment/export", params={"category": "camera"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="equipment.ndjson"'
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["name"] for row in rows] == ["Lens 0", "Lens 2", "Lens 4"]
+    assert rows[0] == client.get(f"/api/v1/equipment/{rows[0]['id']}").json()
+
+    response = client.get("/api/v1/equipment/export", params={"format": "csv", "gzip": True})
+    assert response.headers["content-type"] == "application/gzip"
+    assert response.headers["content-disposition"] == 'attachment; filename="equipment.csv.gz"'
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(response.content).decode())))
+    assert len(rows) == 5
+    assert rows[1]["name"] == "Lens 1"
+    assert rows[1]["notes"] == 'Has a "quoted", comma\nand a newline'
+
+    assert client.get("/api/v1/equipment/export", params={"format": "xml"}).status_code == 422
+
+
+def test_signup_export_streams_in_batches(client, monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    for i in range(5):
+        client.post("/api/v1/signups/", json={"name": f"User {i}", "email": f"user{i}@example.com"})
+
+    response = client.get("/api/v1/signups/export", params={"format": "csv"})
+
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ["id", "name", "email", "created_at", "source"]
+    assert [row[2] for row in rows[1:]] == [f"user{i}@example.com" for i in range(5)]
+
+
+# Streams the export straight through the ASGI app, discarding the body, and
+# prints the peak RSS in KiB. TestClient would buffer the whole response.
+PEAK_RSS_SCRIPT = textwrap.dedent("""
+    import asyncio, resource, sys
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    import main
+    from app.models.base import get_db
+
+    SessionTesting = sessionmaker(bind=create_engine("sqlite:///" + sys.argv[1]))
+
+    def override_get_db():
+        session = SessionTesting()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    main.app.dependency_overrides[get_db] = override_get_db
+    received = 0
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await asyncio.Event().wait()  # The client never disconnects
+
+    async def send(message):
+        global received
+        received += len(message.get("body", b""))
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/api/v1/signups/export", "raw_path": b"/api/v1/signups/export",
+        "query_string": b"format=ndjson", "root_path": "", "headers": [],
+        "client": ("test", 1), "server": ("test", 80),
+    }
+    asyncio.run(main.app(scope, receive, send))
+    assert received > 0
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+""")
+
+
+def peak_rss_kib(tmp_path, rows):
+    path = tmp_path / f"signups-{rows}.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("""
+            WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < :rows)
+            INSERT INTO email_signups (name, email, source, created_at)
+            SELECT 'User ' || i, 'user' || i || '@example.com', 'landing', '2025-01-01 00:00:00' FROM n
+        """), {"rows": rows})
+    engine.dispose()
+    result = subprocess.run(
+        [sys.executable, "-c", PEAK_RSS_SCRIPT, str(path)], capture_output=True, text=True, check=True
+    )
+    return int(result.stdout.split()[-1])
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs the resource module")
+def test_export_memory_is_flat(tmp_path):
+    small = peak_rss_kib(tmp_path, 10_000)
+    large = peak_rss_kib(tmp_path, 1_000_000)
+    # 100x the rows; buffering them would cost hundreds of MiB
+    assert large - small < 20 * 1024, f"peak RSS grew from {small} KiB to {large} KiB"
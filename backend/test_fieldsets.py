@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import event
+
+from app.models.equipment import Equipment
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+
+@pytest.fixture
+def equipment(db):
+    rows = [
+        Equipment(name=f"Item {i % 7}", category=f"cat-{i % 3}", description="x" * 500, notes="y" * 500)
+        for i in range(23)
+    ]
+    db.add_all(rows)
+    db.commit()
+    return rows
+
+
+def test_returns_only_requested_fields_across_pages(client, equipment):
+    # sort=name is not part of the fieldset but still has to drive the cursor
+    params = {"fields": "id,category,is_available", "sort": "name", "limit": 10}
+    pages, cursor = [], None
+    while True:
+        response = client.get("/api/v1/equipment/", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        assert response.headers["ETag"]
+        pages.extend(response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+
+    assert {tuple(item) for item in pages} == {("id", "category", "is_available")}
+    expected = sorted(equipment, key=lambda e: (e.name, e.id))
+    assert [item["id"] for item in pages] == [e.id for e in expected]
+    assert pages[0] == {"id": expected[0].id, "category": expected[0].category, "is_available": True}
+
+
+def test_selects_only_the_needed_columns(client, async_engine, equipment):
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    client.get("/api/v1/equipment/", params={"fields": "name,created_at"})
+    event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+
+    page = next(s for s in statements if "FROM equipment" in s)
+    assert "equipment.name" in page and "equipment.created_at" in page
+    assert "description" not in page and "notes" not in page
+
+
+def test_rejects_unknown_fields(client, equipment):
+    assert client.get("/api/v1/equipment/", params={"fields": "id,secret"}).status_code == 400
+    assert client.get("/api/v1/equipment/", params={"fields": " , "}).status_code == 400
+    assert set(client.get("/api/v1/equipment/").json()[0]) >= {"description", "notes"}
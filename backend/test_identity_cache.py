@@ -0,0 +1,113 @@
+import asyncio
+import time
+
+from app.services.auth_service import IdentityCache, UserSnapshot
+
+
+def make_snapshot(auth0_id="auth0|1", user_id=1):
+    return UserSnapshot(id=user_id, auth0_id=auth0_id, email=f"{user_id}@kitlog.io", name="User")
+
+
+def test_concurrent_misses_resolve_once():
+    cache = IdentityCache(max_entries=10, ttl=60)
+    calls = 0
+
+    async def resolve():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return make_snapshot(), None
+
+    async def dashboard_load():
+        return await asyncio.gather(*[cache.get_or_resolve("token", resolve) for _ in range(50)])
+
+    users = asyncio.run(dashboard_load())
+
+    assert calls == 1
+    assert all(user.id == 1 for user in users)
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["coalesced"] == 49
+
+
+def test_resolution_errors_reach_every_waiter_and_are_not_cached():
+    cache = IdentityCache(max_entries=10, ttl=60)
+
+    async def resolve():
+        await asyncio.sleep(0.01)
+        raise ValueError("invalid token")
+
+    async def load():
+        return await asyncio.gather(
+            *[cache.get_or_resolve("token", resolve) for _ in range(5)],
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(load())
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert cache.get("token") is None
+
+
+def test_lru_eviction_and_ttl():
+    cache = IdentityCache(max_entries=2, ttl=60)
+    cache.put("a", make_snapshot("auth0|a", 1))
+    cache.put("b", make_snapshot("auth0|b", 2))
+    assert cache.get("a") is not None  # "a" is now most recently used
+    cache.put("c", make_snapshot("auth0|c", 3))
+
+    assert cache.get("b") is None
+    assert cache.get("a").id == 1
+    assert cache.stats()["evictions"] == 1
+
+    cache.put("expired", make_snapshot("auth0|d", 4), token_expires_at=time.time() - 1)
+    assert cache.get("expired") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_invalidate_user_drops_all_tokens():
+    cache = IdentityCache(max_entries=10, ttl=60)
+    cache.put("laptop", make_snapshot())
+    cache.put("phone", make_snapshot())
+    cache.invalidate_user("auth0|1")
+
+    assert cache.get("laptop") is None
+    assert cache.get("phone") is None
+
+
+def test_token_misses_resolve_on_the_requests_async_session(client, db, engine, async_engine, monkeypatch):
+    from sqlalchemy import event
+
+    from app.models.user import User
+    from app.services.auth_service import identity_cache
+    from app.services.token_verifier import token_verifier
+
+    profile = {"sub": "auth0|fresh", "email": "fresh@kitlog.io", "name": "Fresh"}
+
+    async def get_claims(token):
+        return profile
+
+    async def get_user_info(token, claims):
+        return profile
+
+    monkeypatch.setattr(token_verifier, "get_claims", get_claims)
+    monkeypatch.setattr(token_verifier, "get_user_info", get_user_info)
+    statements = {"sync": [], "async": []}
+    listeners = [
+        (engine, lambda *args: statements["sync"].append(args[2])),
+        (async_engine.sync_engine, lambda *args: statements["async"].append(args[2])),
+    ]
+    for target, listener in listeners:
+        event.listen(target, "before_cursor_execute", listener)
+    try:
+        response = client.get("/api/v1/equipment/my-teams", headers={"Authorization": "Bearer fresh-token"})
+    finally:
+        for target, listener in listeners:
+            event.remove(target, "before_cursor_execute", listener)
+        identity_cache.invalidate_user("auth0|fresh")
+
+    assert response.status_code == 200
+    # The user lookup, the first-login sync and the endpoint's own query share the async session
+    assert statements["sync"] == []
+    assert any("INSERT INTO users" in statement for statement in statements["async"])
+    assert db.query(User).filter(User.auth0_id == "auth0|fresh").one().email == "fresh@kitlog.io"
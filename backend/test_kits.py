@@ -0,0 +1,178 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.checkout import EquipmentCheckout
+from app.models.equipment import Equipment
+from app.models.kit import kit_items
+from app.models.user import User
+from app.services.equipment_counters import EquipmentCounterService
+
+
+@pytest.fixture
+def users(client, db):
+    import main
+    from app.api.deps import get_current_user
+    from app.services.auth_service import UserSnapshot
+
+    users = [User(auth0_id=f"auth0|{i}", email=f"crew{i}@kitlog.io", name=f"Crew {i}") for i in range(2)]
+    db.add_all(users)
+    db.commit()
+    snapshots = [UserSnapshot.from_user(user) for user in users]
+    main.app.dependency_overrides[get_current_user] = lambda: snapshots[0]
+    yield {"users": snapshots, "as_user": lambda i: main.app.dependency_overrides.update(
+        {get_current_user: lambda: snapshots[i]}
+    )}
+    main.app.dependency_overrides.pop(get_current_user, None)
+
+
+def create_items(client, count):
+    return [
+        client.post("/api/v1/equipment/", json={"name": f"Item {i}", "category": "camera", "owner_id": "auth0|1"}).json()["id"]
+        for i in range(count)
+    ]
+
+
+def create_kit(client, equipment_ids, name="Camera kit"):
+    response = client.post("/api/v1/kits/", json={"name": name, "equipment_ids": equipment_ids})
+    assert response.status_code == 200
+    return response.json()
+
+
+def available(client):
+    return client.get("/api/v1/equipment/stats/summary", params={"owner_id": "auth0|1"}).json()["available_items"]
+
+
+def test_kit_checkout_and_checkin(client, db, users):
+    items = create_items(client, 12)
+    kit = create_kit(client, items[::-1])
+    assert kit["equipment_ids"] == items
+    url = f"/api/v1/kits/{kit['id']}"
+
+    checkout = client.post(f"{url}/checkout", json={"notes": "Shoot day 1"})
+    assert checkout.status_code == 200
+    assert [c["equipment_id"] for c in checkout.json()] == items
+    assert all(c["is_active"] and c["user_id"] == users["users"][0].id for c in checkout.json())
+    assert available(client) == 0
+    assert client.post(f"{url}/checkout").status_code == 409
+
+    # One item comes back early; the kit check-in takes care of the rest
+    assert client.post(f"/api/v1/equipment/{items[0]}/checkin").status_code == 200
+    checkin = client.post(f"{url}/checkin")
+    assert checkin.status_code == 200
+    assert [c["equipment_id"] for c in checkin.json()] == items[1:]
+    assert available(client) == 12
+    assert client.post(f"{url}/checkin").status_code == 409
+    assert EquipmentCounterService.check(db)["drift"] == []
+
+
+def test_kit_checkout_is_all_or_nothing(client, db, users):
+    items = create_items(client, 5)
+    kit = create_kit(client, items)
+    assert client.post(f"/api/v1/equipment/{items[3]}/checkout").status_code == 200
+
+    response = client.post(f"/api/v1/kits/{kit['id']}/checkout")
+    assert response.status_code == 409
+    assert response.json()["detail"]["equipment_ids"] == [items[3]]
+    assert available(client) == 4
+    assert db.scalar(select(func.count()).select_from(EquipmentCheckout)) == 1
+
+    assert client.post(f"/api/v1/equipment/{items[3]}/checkin").status_code == 200
+    assert client.post(f"/api/v1/kits/{kit['id']}/checkout").status_code == 200
+    assert client.post("/api/v1/kits/999/checkout").status_code == 404
+
+
+def test_kit_checkout_respects_other_peoples_reservations(client, db, users):
+    items = create_items(client, 4)
+    kit = create_kit(client, items)
+    starts_at = datetime.utcnow() + timedelta(days=3)
+    users["as_user"](1)
+    booking = {"starts_at": starts_at.isoformat(), "ends_at": (starts_at + timedelta(days=2)).isoformat()}
+    assert client.post(f"/api/v1/equipment/{items[2]}/reservations", json=booking).status_code == 200
+
+    users["as_user"](0)
+    response = client.post(f"/api/v1/kits/{kit['id']}/checkout")
+    assert response.status_code == 409
+    assert response.json()["detail"]["equipment_ids"] == [items[2]]
+    assert available(client) == 4
+
+    due_date = (starts_at - timedelta(hours=1)).isoformat()
+    assert client.post(f"/api/v1/kits/{kit['id']}/checkout", json={"due_date": due_date}).status_code == 200
+    assert available(client) == 0
+    assert EquipmentCounterService.check(db)["drift"] == []
+
+
+def test_kit_checkin_is_for_the_borrower_and_kit_managers(client, db, users):
+    items = create_items(client, 3)
+    kit = create_kit(client, items)
+    url = f"/api/v1/kits/{kit['id']}"
+
+    users["as_user"](1)
+    assert client.post(f"{url}/checkout").status_code == 200
+    assert client.post(f"{url}/checkin").status_code == 200  # The borrower
+    assert client.post(f"{url}/checkout").status_code == 200
+    users["as_user"](0)  # Created the kit, so may check it in
+    assert client.post(f"{url}/checkin").status_code == 200
+
+    assert client.post(f"{url}/checkout").status_code == 200
+    users["as_user"](1)  # Neither borrower nor manager
+    assert client.post(f"{url}/checkin").status_code == 403
+    assert available(client) == 0
+    users["as_user"](0)
+    assert client.post(f"{url}/checkin").status_code == 200
+    assert available(client) == 3
+
+
+def test_deleting_an_item_takes_it_out_of_its_kits(client, db, users):
+    items = create_items(client, 4)
+    kit = create_kit(client, items)
+    url = f"/api/v1/kits/{kit['id']}"
+
+    assert client.delete(f"/api/v1/equipment/{items[0]}").status_code == 200
+    assert client.request("DELETE", "/api/v1/equipment/bulk", json={"ids": [items[1]]}).status_code == 200
+    assert client.get(url).json()["equipment_ids"] == items[2:]
+    assert db.execute(select(kit_items.c.equipment_id).where(kit_items.c.kit_id == kit["id"])).scalars().all() == items[2:]
+
+    # Deleted outside the services, the link stays behind but does not block the kit
+    db.delete(db.get(Equipment, items[2]))
+    db.commit()
+    checkout = client.post(f"{url}/checkout")
+    assert checkout.status_code == 200
+    assert [c["equipment_id"] for c in checkout.json()] == items[3:]
+
+
+def test_kit_management(client, users):
+    items = create_items(client, 3)
+    response = client.post("/api/v1/kits/", json={"name": "Audio kit", "equipment_ids": [items[0], 999]})
+    assert response.status_code == 400 and response.json()["detail"]["equipment_ids"] == [999]
+
+    kit = create_kit(client, items[:2])
+    url = f"/api/v1/kits/{kit['id']}"
+    updated = client.put(url, json={"name": "Audio kit", "equipment_ids": items[1:]}).json()
+    assert updated["name"] == "Audio kit" and updated["equipment_ids"] == items[1:]
+    assert [k["id"] for k in client.get("/api/v1/kits/").json()] == [kit["id"]]
+
+    users["as_user"](1)
+    assert client.delete(url).status_code == 403
+    users["as_user"](0)
+    client.post(f"{url}/checkout")
+    assert client.delete(url).status_code == 409
+    client.post(f"{url}/checkin")
+    assert client.delete(url).status_code == 200
+    assert client.get(url).status_code == 404
+    assert client.get(f"/api/v1/equipment/{items[1]}").status_code == 200
+
+
+def test_concurrent_overlapping_kits_never_both_succeed(client, users):
+    items = create_items(client, 6)
+    # Each kit shares an item with the next one
+    kits = [create_kit(client, items[i:i + 2], f"Kit {i}")["id"] for i in range(5)]
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        responses = list(pool.map(lambda i: client.post(f"/api/v1/kits/{kits[i % 5]}/checkout"), range(20)))
+
+    assert all(r.status_code in (200, 409) for r in responses)
+    won = [c["equipment_id"] for r in responses if r.status_code == 200 for c in r.json()]
+    assert won and len(won) == len(set(won))
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+from sqlalchemy import event
+
+from app.models.user import User
+from app.services.auth_service import AuthService, LoginSyncStats
+
+PROFILE = {
+    "sub": "auth0|42",
+    "email": "crew@kitlog.io",
+    "name": "Crew",
+    "picture": "https://cdn.kitlog.io/crew.png",
+    "email_verified": True,
+    "https://kitlog.io/roles": ["admin"],
+    "updated_at": "2025-07-01T00:00:00Z",
+}
+
+
+@pytest.fixture
+def user_updates(engine):
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        if statement.startswith("UPDATE users"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(engine, "before_cursor_execute", capture)
+
+
+def test_unchanged_login_does_not_write(db, user_updates):
+    stats = LoginSyncStats()
+    with mock.patch("app.services.auth_service.login_sync_stats", stats):
+        AuthService.sync_user_from_auth0(PROFILE, db)
+        for _ in range(5):
+            AuthService.sync_user_from_auth0(dict(PROFILE, updated_at="2025-07-02T00:00:00Z"), db)
+
+    assert user_updates == []
+    assert stats.writes_avoided == 5
+
+
+def test_changed_profile_writes_only_changed_columns(db, user_updates):
+    user = AuthService.sync_user_from_auth0(PROFILE, db)
+    assert "roles" not in user.auth0_metadata
+
+    user = AuthService.sync_user_from_auth0(dict(PROFILE, name="Crew Lead"), db)
+
+    assert user.name == "Crew Lead"
+    assert len(user_updates) == 1
+    assert "email" not in user_updates[0].split("WHERE")[0]
+    assert "last_login" not in user_updates[0]
+
+
+def test_last_login_refreshed_after_granularity(db):
+    AuthService.sync_user_from_auth0(PROFILE, db)
+    user = db.query(User).filter(User.auth0_id == PROFILE["sub"]).first()
+    user.last_login = datetime.utcnow() - timedelta(hours=1)
+    db.commit()
+
+    user = AuthService.sync_user_from_auth0(PROFILE, db)
+
+    assert datetime.utcnow() - user.last_login.replace(tzinfo=None) < timedelta(minutes=1)
@@ -0,0 +1,182 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+import redis
+from sqlalchemy import event
+
+from app.core.cache import LookupCache, RedisCacheBackend, lookup_cache
+from app.models.equipment import Equipment
+
+
+class FakeRedis:
+    """The slice of redis.Redis the cache backend uses, kept in a dict."""
+
+    def __init__(self):
+        self.data = {}
+        self.down = False
+
+    def _check(self):
+        if self.down:
+            raise redis.ConnectionError("Connection refused")
+
+    def get(self, key):
+        self._check()
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self._check()
+        self.data[key] = value.encode()
+
+    def delete(self, *keys):
+        self._check()
+        for key in keys:
+            self.data.pop(key, None)
+
+
+@pytest.fixture
+def statements(async_engine):
+    captured = []
+    listener = lambda *args: captured.append(args[2])
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    yield captured
+    event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+
+
+def categories(client, **params):
+    return client.get("/api/v1/equipment/categories/list", params=params).json()["categories"]
+
+
+def test_categories_are_cached_until_equipment_changes(client, statements):
+    created = client.post("/api/v1/equipment/", json={
+        "name": "Tripod", "category": "support", "owner_id": "auth0|1", "team_id": 3,
+    }).json()
+
+    for params in ({}, {"owner_id": "auth0|1"}, {"team_id": 3}):
+        assert categories(client, **params) == ["support"]
+    statements.clear()
+    for params in ({}, {"owner_id": "auth0|1"}, {"team_id": 3}):
+        assert categories(client, **params) == ["support"]
+    assert statements == []
+
+    client.put(f"/api/v1/equipment/{created['id']}", json={"category": "grip", "owner_id": "auth0|2"})
+    assert categories(client) == ["grip"]
+    assert categories(client, owner_id="auth0|1") == []
+    assert categories(client, owner_id="auth0|2") == ["grip"]
+    assert categories(client, team_id=3) == ["grip"]
+
+    client.delete(f"/api/v1/equipment/{created['id']}")
+    assert categories(client) == categories(client, team_id=3) == []
+
+
+def test_checkouts_leave_cached_categories_alone(client, db, statements):
+    import main
+    from app.api.deps import get_current_user
+    from app.models.user import User
+    from app.services.auth_service import UserSnapshot
+
+    user = User(auth0_id="auth0|1", email="crew@kitlog.io", name="Crew")
+    db.add(user)
+    db.commit()
+    snapshot = UserSnapshot.from_user(user)
+    item = client.post("/api/v1/equipment/", json={"name": "Tripod", "category": "support", "team_id": 3}).json()
+    assert categories(client, team_id=3) == ["support"]
+    invalidations = lookup_cache.invalidations
+
+    main.app.dependency_overrides[get_current_user] = lambda: snapshot
+    try:
+        assert client.post(f"/api/v1/equipment/{item['id']}/checkout").status_code == 200
+        assert client.post(f"/api/v1/equipment/{item['id']}/checkin").status_code == 200
+    finally:
+        main.app.dependency_overrides.pop(get_current_user, None)
+    assert lookup_cache.invalidations == invalidations
+    statements.clear()
+    assert categories(client, team_id=3) == ["support"]
+    assert statements == []
+
+
+def test_bulk_writes_invalidate(client):
+    assert categories(client, owner_id="auth0|1") == []
+    body = client.post("/api/v1/equipment/bulk", json={"items": [
+        {"name": "Boom", "category": "audio", "owner_id": "auth0|1"},
+        {"name": "Light", "category": "lighting"},
+    ]}).json()
+    assert categories(client, owner_id="auth0|1") == ["audio"]
+    assert categories(client) == ["audio", "lighting"]
+
+    client.patch("/api/v1/equipment/bulk", json={"items": [{"id": body["created"][1]["id"], "category": "grip"}]})
+    assert categories(client) == ["audio", "grip"]
+
+    client.request("DELETE", "/api/v1/equipment/bulk", json={"ids": [body["created"][0]["id"]]})
+    assert categories(client, owner_id="auth0|1") == []
+    assert categories(client) == ["grip"]
+
+
+def test_invalidation_waits_for_commit(client, db):
+    assert categories(client) == []
+    invalidations = lookup_cache.invalidations
+
+    db.add(Equipment(name="Slider", category="support"))
+    db.flush()
+    db.rollback()
+    assert lookup_cache.invalidations == invalidations
+
+    db.add(Equipment(name="Slider", category="support"))
+    db.flush()
+    assert categories(client) == []  # Not committed yet
+    db.commit()
+    assert categories(client) == ["support"]
+
+
+def test_redis_backend_is_shared_between_workers():
+    server = FakeRedis()
+    worker_a = LookupCache(RedisCacheBackend(server), ttl=60)
+    worker_b = LookupCache(RedisCacheBackend(server), ttl=60)
+    loads = []
+
+    def load():
+        loads.append(1)
+        return ["audio"]
+
+    assert worker_a.get_or_load("equipment:categories:all", load) == ["audio"]
+    assert worker_b.get_or_load("equipment:categories:all", load) == ["audio"]
+    assert len(loads) == 1
+
+    worker_b.invalidate("equipment:categories:all")
+    assert worker_a.get_or_load("equipment:categories:all", load) == ["audio"]
+    assert len(loads) == 2
+
+    server.down = True  # Outage: every read falls through to the loader
+    assert worker_a.get_or_load("equipment:categories:all", load) == ["audio"]
+    worker_a.invalidate("equipment:categories:all")
+    assert len(loads) == 3
+
+
+class SlowRedis(FakeRedis):
+    def get(self, key):
+        time.sleep(0.5)
+        return super().get(key)
+
+
+def test_slow_redis_does_not_hold_up_other_requests(client, monkeypatch):
+    import main
+
+    monkeypatch.setattr(lookup_cache, "backend", RedisCacheBackend(SlowRedis()))
+
+    async def get(http, url):
+        assert (await http.get(url)).status_code == 200
+        return time.perf_counter()
+
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            start = time.perf_counter()
+            lookup = asyncio.ensure_future(get(http, "/api/v1/equipment/categories/list"))
+            await asyncio.sleep(0.1)
+            health = await get(http, "/health")
+            return health - start, await lookup - start
+
+    health, lookup = asyncio.run(run())
+    assert lookup >= 0.5
+    assert health < 0.3  # Answered while the lookup was still waiting on Redis
@@ -0,0 +1,92 @@
+import pytest
+from sqlalchemy import event, update
+
+from app.models.team import Team, TeamMembership
+from app.models.user import User
+from app.services.membership_index import membership_index
+from app.services.team_service import TeamService
+
+
+@pytest.fixture
+def crew(client, db):
+    users = [User(auth0_id=f"auth0|{i}", email=f"crew{i}@kitlog.io", name=f"Crew {i}") for i in range(3)]
+    teams = [Team(name="Rental house"), Team(name="Production")]
+    db.add_all(users + teams)
+    db.flush()
+    db.add_all([
+        TeamMembership(user_id=users[0].id, team_id=teams[0].id, role="owner"),
+        TeamMembership(user_id=users[0].id, team_id=teams[1].id, role="member"),
+        TeamMembership(user_id=users[1].id, team_id=teams[0].id, role="member"),
+    ])
+    db.commit()
+    # Plain ids: reading them off expired objects would be a query of its own
+    return {"users": [u.id for u in users], "teams": [t.id for t in teams]}
+
+
+@pytest.fixture
+def statements(engine):
+    captured = []
+    listener = lambda *args: captured.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    yield captured
+    event.remove(engine, "before_cursor_execute", listener)
+
+
+def allowed(db, user_id, team_id, roles=("owner", "admin")):
+    return TeamService.check_user_team_permission(user_id, team_id, list(roles), db)
+
+
+def test_permission_checks_are_served_from_memory(db, crew, statements, monkeypatch):
+    # The ratio below is this test's own, not that of every lookup earlier tests made
+    monkeypatch.setattr(membership_index, "hits", 0)
+    monkeypatch.setattr(membership_index, "misses", 0)
+    owner, member, outsider = crew["users"]
+    rental, production = crew["teams"]
+
+    assert allowed(db, owner, rental) and not allowed(db, owner, production)
+    assert not allowed(db, member, rental) and allowed(db, member, rental, ["member"])
+    assert not allowed(db, outsider, rental)
+    assert len(statements) == 3  # One per user
+
+    statements.clear()
+    for _ in range(100):
+        assert allowed(db, owner, rental) and not allowed(db, outsider, production)
+    assert statements == []
+    assert membership_index.stats()["hit_ratio"] > 0.98
+
+
+def test_user_teams_are_one_joined_query_that_primes_the_index(db, crew, statements):
+    owner = crew["users"][0]
+    db.execute(update(Team).where(Team.id == crew["teams"][1]).values(is_active=False))
+    db.commit()
+    statements.clear()
+
+    assert [t.name for t in TeamService.get_user_teams(owner, db)] == ["Rental house"]
+    assert allowed(db, owner, crew["teams"][0]) and allowed(db, owner, crew["teams"][1], ["member"])
+    assert len(statements) == 1
+
+
+def test_membership_writes_invalidate_on_commit(client, db, crew):
+    owner, member, outsider = crew["users"]
+    rental = crew["teams"][0]
+    assert not allowed(db, outsider, rental, ["member"])
+    before = membership_index.stats()["invalidations"]
+
+    # ORM insert through the API
+    assert client.post(f"/api/v1/teams/{rental}/members", json={"user_id": outsider}).status_code == 200
+    assert allowed(db, outsider, rental, ["member"])
+
+    # Core UPDATE ... RETURNING
+    assert client.put(f"/api/v1/teams/{rental}/members/{member}", json={"role": "admin"}).status_code == 200
+    assert allowed(db, member, rental)
+
+    # ORM delete
+    assert client.delete(f"/api/v1/teams/{rental}/members/{member}").status_code == 200
+    assert not allowed(db, member, rental, ["member", "admin"])
+    assert membership_index.stats()["invalidations"] == before + 3
+
+    # Rolled-back writes leave the index alone
+    db.execute(update(TeamMembership).where(TeamMembership.user_id == owner).values(role="member"))
+    db.rollback()
+    assert membership_index.stats()["invalidations"] == before + 3
+    assert allowed(db, owner, rental)
@@ -0,0 +1,139 @@
+import dataclasses
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, insert, update
+
+from app.core.config import settings
+from app.models.checkout import EquipmentCheckout, OverdueCheckout
+from app.models.equipment import Equipment
+from app.models.team import Team, TeamMembership
+from app.models.user import User
+from app.services.overdue_scanner import OverdueScanService
+
+NOW = datetime(2026, 10, 18, 12, 0)
+
+
+@pytest.fixture
+def fleet(db):
+    user = User(auth0_id="auth0|crew", email="crew@kitlog.io", name="Crew")
+    teams = [Team(name="Rental house"), Team(name="Production")]
+    db.add_all([user, *teams])
+    db.flush()
+    db.add_all([TeamMembership(user_id=user.id, team_id=team.id, role="member") for team in teams])
+    items = [Equipment(name=f"Camera {i}", category="camera", team_id=teams[i % 2].id) for i in range(6)]
+    db.add_all(items)
+    db.commit()
+    return {"user": user, "teams": teams, "items": items}
+
+
+@pytest.fixture
+def signed_in(client, fleet):
+    import main
+    from app.api.deps import get_current_user
+    from app.services.auth_service import UserSnapshot
+
+    snapshot = UserSnapshot.from_user(fleet["user"])
+    main.app.dependency_overrides[get_current_user] = lambda: snapshot
+    yield snapshot
+    main.app.dependency_overrides.pop(get_current_user, None)
+
+
+def check_out(db, fleet, item, due_date):
+    checkout_id = db.scalar(insert(EquipmentCheckout).returning(EquipmentCheckout.id), {
+        "equipment_id": item.id, "user_id": fleet["user"].id, "due_date": due_date,
+    })
+    db.commit()
+    return checkout_id
+
+
+def overdue(client, team):
+    response = client.get(f"/api/v1/teams/{team.id}/overdue")
+    assert response.status_code == 200
+    return [row["checkout_id"] for row in response.json()]
+
+
+def test_team_overdue_lists_follow_scans(client, db, fleet, signed_in):
+    items, (rental, production) = fleet["items"], fleet["teams"]
+    late = check_out(db, fleet, items[0], NOW - timedelta(days=2))
+    later = check_out(db, fleet, items[2], NOW - timedelta(hours=1))
+    check_out(db, fleet, items[4], NOW + timedelta(days=1))  # Not due yet
+    elsewhere = check_out(db, fleet, items[1], NOW - timedelta(hours=3))
+
+    assert overdue(client, rental) == []  # Nothing until the scanner has run
+    assert OverdueScanService.scan(db, now=NOW)["flagged"] == 3
+    assert overdue(client, rental) == [late, later]
+    assert overdue(client, production) == [elsewhere]
+
+    # Returned items drop out at once and their flags are purged on the next scan
+    db.execute(update(EquipmentCheckout).where(EquipmentCheckout.id == late).values(is_active=False))
+    db.commit()
+    assert overdue(client, rental) == [later]
+    result = OverdueScanService.scan(db, now=NOW + timedelta(minutes=1))
+    assert (result["flagged"], result["purged"]) == (0, 1)
+    assert db.query(OverdueCheckout).count() == 2
+
+    assert client.get("/api/v1/teams/999/overdue").status_code == 404
+
+
+def test_team_overdue_lists_are_for_members(client, db, fleet, signed_in):
+    outsiders = Team(name="Outsiders")
+    db.add(outsiders)
+    db.commit()
+    assert client.get(f"/api/v1/teams/{outsiders.id}/overdue").status_code == 403
+
+
+def test_manual_scans_are_for_admins(client, db, fleet, signed_in):
+    import main
+    from app.api.deps import get_current_user
+
+    check_out(db, fleet, fleet["items"][0], datetime.utcnow() - timedelta(days=1))
+    assert client.post("/api/v1/admin/overdue-scan").status_code == 403
+    assert db.query(OverdueCheckout).count() == 0
+
+    admin = dataclasses.replace(signed_in, is_admin=True)
+    main.app.dependency_overrides[get_current_user] = lambda: admin
+    response = client.post("/api/v1/admin/overdue-scan")
+    assert response.status_code == 200
+    assert response.json()["flagged"] == 1
+
+
+def test_scans_only_read_past_the_watermark(db, fleet, engine):
+    items = fleet["items"]
+    OverdueScanService.scan(db, now=NOW)
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append((args[2], args[3])))
+    # Due since the last run, plus one the previous run could have missed by a commit
+    recent = check_out(db, fleet, items[0], NOW + timedelta(minutes=30))
+    late_commit = check_out(db, fleet, items[2], NOW - timedelta(seconds=settings.OVERDUE_SCAN_OVERLAP // 2))
+    check_out(db, fleet, items[4], NOW - timedelta(days=1))  # Before the watermark: a past run's business
+
+    statements.clear()
+    assert OverdueScanService.scan(db, now=NOW + timedelta(hours=1))["flagged"] == 2
+    assert {row.checkout_id for row in db.query(OverdueCheckout)} == {recent, late_commit}
+    assert OverdueScanService.scan(db, now=NOW + timedelta(hours=1))["flagged"] == 0
+
+    flag = next((s, p) for s, p in statements if s.lstrip().startswith("INSERT INTO overdue_checkouts"))
+    with engine.connect() as conn:
+        plan = " ".join(row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {flag[0]}", flag[1]))
+    assert "ix_equipment_checkouts_active_due_date (due_date>? AND due_date<?)" in plan
+
+
+def test_lifespan_runs_the_scanner(client, db, fleet, async_engine, monkeypatch):
+    from fastapi.testclient import TestClient
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    import main
+    from app.services import overdue_scanner
+
+    check_out(db, fleet, fleet["items"][0], datetime.utcnow() - timedelta(minutes=1))
+    monkeypatch.setattr(main, "run_startup_migrations", lambda: None)
+    monkeypatch.setattr(overdue_scanner, "AsyncSessionLocal", async_sessionmaker(async_engine, expire_on_commit=False))
+    monkeypatch.setattr(settings, "OVERDUE_SCAN_INTERVAL", 0.05)
+
+    with TestClient(main.app):
+        deadline = time.monotonic() + 5
+        while not db.query(OverdueCheckout).count() and time.monotonic() < deadline:
+            time.sleep(0.05)
+    assert db.query(OverdueCheckout).count() == 1
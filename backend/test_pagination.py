@@ -0,0 +1,46 @@
+import pytest
+
+from app.models.equipment import Equipment
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+
+@pytest.fixture
+def equipment(db):
+    # Duplicate names/categories so the id tie-breaker matters
+    rows = [
+        Equipment(name=f"Item {i % 7}", category=f"cat-{i % 3}", owner_id="auth0|1")
+        for i in range(53)
+    ]
+    db.add_all(rows)
+    db.commit()
+    return rows
+
+
+def walk(client, url):
+    ids, cursor = [], None
+    while True:
+        response = client.get(url, params={"limit": 10, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        ids.extend(item["id"] for item in response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            return ids
+
+
+@pytest.mark.parametrize("sort", ["id", "name", "-name", "category", "created_at", "-created_at"])
+def test_walks_every_row_exactly_once(client, equipment, sort):
+    ids = walk(client, f"/api/v1/equipment/?sort={sort}")
+
+    assert sorted(ids) == sorted(e.id for e in equipment)
+    key = sort.lstrip("-")
+    expected = sorted(equipment, key=lambda e: (getattr(e, key), e.id), reverse=sort.startswith("-"))
+    assert ids == [e.id for e in expected]
+
+
+def test_rejects_foreign_cursor_and_oversized_pages(client, equipment):
+    response = client.get("/api/v1/equipment/", params={"limit": 10, "sort": "name"})
+    cursor = response.headers[NEXT_CURSOR_HEADER]
+
+    assert client.get("/api/v1/equipment/", params={"cursor": cursor, "sort": "category"}).status_code == 400
+    assert client.get("/api/v1/equipment/", params={"cursor": "garbage"}).status_code == 400
+    assert client.get("/api/v1/equipment/", params={"limit": 10_000}).status_code == 422
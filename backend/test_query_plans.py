@@ -0,0 +1,168 @@
+"""
+Query-plan regression suite.
+
+Every SELECT an endpoint (or the team permission helpers) emits is captured
+and run through SQLite's ``EXPLAIN QUERY PLAN``; a test fails as soon as one
+of them reads a table without an index. Plans are taken on an un-ANALYZEd
+database, i.e. from the planner's default heuristics.
+"""
+from datetime import datetime, timedelta
+import re
+
+import pytest
+from sqlalchemy import event
+
+from app.models.base import Base
+from app.models.equipment import Equipment
+from app.models.team import Team, TeamInvitation, TeamMembership
+from app.models.user import User
+from app.services.team_service import TeamService
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+@pytest.fixture
+def seeded(db):
+    users = [User(auth0_id=f"auth0|{i}", email=f"user{i}@kitlog.io", name=f"User {i}") for i in range(3)]
+    teams = [Team(name=f"Team {i}") for i in range(3)]
+    db.add_all(users + teams)
+    db.flush()
+    db.add_all([
+        Equipment(
+            name=f"Item {i}", category=f"cat-{i % 4}", brand="Canon", owner_id=f"auth0|{i % 3}",
+            team_id=teams[i % 3].id, is_available=i % 2 == 0,
+        )
+        for i in range(30)
+    ])
+    db.add_all([
+        TeamMembership(user_id=user.id, team_id=team.id, role="owner" if user is users[0] else "member")
+        for user in users for team in teams
+    ])
+    db.add_all([
+        TeamInvitation(
+            email=f"invitee{i}@kitlog.io", team_id=teams[0].id, token=f"token-{i}",
+            expires_at=datetime.utcnow() + timedelta(days=7), invited_by_user_id=users[0].id,
+        )
+        for i in range(3)
+    ])
+    db.commit()
+    return {"users": users, "teams": teams}
+
+
+@pytest.fixture
+def captured(engine, async_engine):
+    # Ported endpoints run on the async engine, the rest on the sync one
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    for target in (engine, async_engine.sync_engine):
+        event.listen(target, "before_cursor_execute", record)
+    yield statements
+    for target in (engine, async_engine.sync_engine):
+        event.remove(target, "before_cursor_execute", record)
+
+
+def full_scans(engine, statements):
+    """Return (table, sql) for every captured statement that scans a table without an index."""
+    tables = set(Base.metadata.tables)
+    found = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters):
+                match = FULL_SCAN.match(row[3])
+                if match and match.group(1) in tables:
+                    found.append((match.group(1), " ".join(statement.split())))
+    return found
+
+
+def second_page(client, url, **params):
+    """Request a page, then the page after it, so cursor (keyset) queries are captured too."""
+    response = client.get(url, params={"limit": 2, **params})
+    assert response.status_code == 200, response.text
+    cursor = response.headers.get(NEXT_CURSOR_HEADER)
+    if cursor:
+        assert client.get(url, params={"limit": 2, "cursor": cursor, **params}).status_code == 200
+
+
+EQUIPMENT_FILTERS = [
+    {"owner_id": "auth0|1"},
+    {"owner_id": "auth0|1", "category": "cat-1"},
+    {"owner_id": "auth0|1", "category": "cat-1", "available_only": True},
+    {"owner_id": "auth0|1", "available_only": True},
+    {"available_only": True},
+    {"category": "cat-1"},
+    {"category": "cat-1", "available_only": True},
+    {"team_id": 1},
+    {"team_id": 1, "available_only": True},
+    {"owner_id": "auth0|1", "sort": "-created_at"},
+    {"sort": "name"},
+    {"sort": "-created_at"},
+]
+
+
+@pytest.mark.parametrize("params", EQUIPMENT_FILTERS, ids=lambda p: "&".join(f"{k}={v}" for k, v in p.items()))
+def test_equipment_list_uses_indexes(client, engine, seeded, captured, params):
+    second_page(client, "/api/v1/equipment/", **params)
+
+    assert full_scans(engine, captured) == []
+
+
+@pytest.mark.parametrize("url", [
+    "/api/v1/equipment/1",
+    "/api/v1/equipment/stats/summary",
+    "/api/v1/equipment/stats/summary?owner_id=auth0|1",
+    "/api/v1/equipment/categories/list",
+    "/api/v1/equipment/availability?from=2030-01-01T00:00:00&to=2030-01-08T00:00:00&team_id=1",
+    "/api/v1/equipment/1/reservations",
+    "/api/v1/equipment/search?q=canon&owner_id=auth0|1",
+    "/api/v1/equipment/search?q=canon&team_id=1&available_only=true",
+    "/api/v1/teams/1/members",
+    "/api/v1/teams/1/invitations",
+    "/api/v1/invitations/token-1",
+    "/api/v1/users/1/teams",
+])
+def test_endpoint_queries_use_indexes(client, engine, seeded, captured, url):
+    assert client.get(url).status_code == 200
+
+    assert full_scans(engine, captured) == []
+
+
+MEMBER_ONLY_URLS = [
+    "/api/v1/teams/1/dashboard",
+    "/api/v1/teams/1/overdue",
+    "/api/v1/teams/1/equipment",
+    "/api/v1/teams/1/equipment?category=cat-1",
+    "/api/v1/teams/1/equipment?category=cat-1&available_only=true",
+    "/api/v1/teams/1/equipment?available_only=true",
+    "/api/v1/equipment/my-teams",
+    "/api/v1/equipment/my-teams?category=cat-1",
+]
+
+
+@pytest.mark.parametrize("url", MEMBER_ONLY_URLS)
+def test_member_only_queries_use_indexes(client, engine, seeded, captured, url):
+    import main
+    from app.api.deps import get_current_user
+    from app.services.auth_service import UserSnapshot
+
+    user = UserSnapshot.from_user(seeded["users"][0])
+    main.app.dependency_overrides[get_current_user] = lambda: user
+    try:
+        second_page(client, url)
+    finally:
+        main.app.dependency_overrides.pop(get_current_user, None)
+
+    assert full_scans(engine, captured) == []
+
+
+def test_team_permission_queries_use_indexes(db, engine, seeded, captured):
+    user, team = seeded["users"][0], seeded["teams"][1]
+
+    assert TeamService.check_user_team_permission(user.id, team.id, ["owner", "admin"], db)
+    assert {t.id for t in TeamService.get_user_teams(user.id, db)} == {t.id for t in seeded["teams"]}
+
+    assert full_scans(engine, captured) == []
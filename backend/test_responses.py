@@ -0,0 +1,101 @@
+from datetime import datetime, timezone
+from typing import List
+
+import msgpack
+import pytest
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.models.equipment import Equipment
+from app.models.signup import EmailSignup
+from app.models.team import Team, TeamInvitation, TeamMembership
+from app.models.user import User
+from app.schemas.equipment import EquipmentResponse
+from app.schemas.signup import EmailSignupResponse
+from app.schemas.team import TeamInvitation as TeamInvitationSchema, TeamMembership as TeamMembershipSchema, TeamWithMembers
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.responses import ORJSONResponse, MsgpackResponse, wants_msgpack
+
+
+@pytest.fixture
+def rows(db):
+    user = User(auth0_id="auth0|1", email="owner@kitlog.io", name="Owner")
+    team = Team(name="Rental house", description="Cameras", subscription_type="paid")
+    db.add_all([user, team])
+    db.flush()
+    db.add_all([
+        TeamMembership(user_id=user.id, team_id=team.id, role="owner"),
+        TeamInvitation(
+            team_id=team.id, email="new@kitlog.io", role="member", token="t0k3n",
+            expires_at=datetime(2026, 1, 1, 12, 30), invited_by_user_id=user.id,
+        ),
+        EmailSignup(name="Sam", email="sam@kitlog.io", source="landing"),
+    ])
+    db.add_all(
+        Equipment(name=f"Item {i}", category="camera", notes=None if i % 2 else "ünïcode ✓", team_id=team.id)
+        for i in range(5)
+    )
+    db.commit()
+    return team
+
+
+def validated(model, objects):
+    """What FastAPI's response_model path produces for the same ORM objects."""
+    adapter = TypeAdapter(List[model])
+    return adapter.dump_python(adapter.validate_python(objects, from_attributes=True), mode="json")
+
+
+def test_fast_path_matches_response_model_validation(client, db, rows):
+    team = db.scalar(select(Team).options(selectinload(Team.members), selectinload(Team.invitations)))
+    cases = [
+        ("/api/v1/equipment/", EquipmentResponse, db.scalars(select(Equipment).order_by(Equipment.id)).all()),
+        ("/api/v1/teams/", TeamWithMembers, [team]),
+        (f"/api/v1/teams/{rows.id}/members", TeamMembershipSchema, team.members),
+        (f"/api/v1/teams/{rows.id}/invitations", TeamInvitationSchema, team.invitations),
+        ("/api/v1/signups/", EmailSignupResponse, db.scalars(select(EmailSignup)).all()),
+    ]
+    for url, model, objects in cases:
+        response = client.get(url)
+        assert response.status_code == 200, url
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == validated(model, objects), url
+
+    assert client.get(f"/api/v1/teams/{rows.id}").json() == validated(TeamWithMembers, [team])[0]
+
+
+def test_msgpack_is_opt_in_and_keeps_headers(client, rows):
+    plain = client.get("/api/v1/equipment/", params={"limit": 2})
+    packed = client.get("/api/v1/equipment/", params={"limit": 2}, headers={"Accept": "application/msgpack"})
+
+    assert packed.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(packed.content) == plain.json()
+    assert packed.headers[NEXT_CURSOR_HEADER] == plain.headers[NEXT_CURSOR_HEADER]
+    # Each representation has its own ETag, so a JSON copy never revalidates a msgpack request
+    assert packed.headers["ETag"] != plain.headers["ETag"]
+    assert packed.headers["Vary"] == plain.headers["Vary"] == "Accept"
+    stale = client.get(
+        "/api/v1/equipment/", params={"limit": 2},
+        headers={"Accept": "application/msgpack", "If-None-Match": plain.headers["ETag"]},
+    )
+    assert stale.status_code == 200
+
+    sparse = client.get("/api/v1/equipment/", params={"fields": "id,name"}, headers={"Accept": "application/msgpack"})
+    assert msgpack.unpackb(sparse.content) == client.get("/api/v1/equipment/", params={"fields": "id,name"}).json()
+
+
+def test_accept_negotiation():
+    assert wants_msgpack("application/msgpack")
+    assert wants_msgpack("application/json;q=0.5, application/x-msgpack")
+    assert not wants_msgpack(None)
+    assert not wants_msgpack("*/*")
+    assert not wants_msgpack("application/json, application/msgpack")  # Ties go to JSON
+    assert not wants_msgpack("application/msgpack;q=0")
+
+
+def test_encoders_write_datetimes_like_pydantic():
+    aware = datetime(2026, 3, 1, 9, 15, 0, 250000, tzinfo=timezone.utc)
+    expected = TypeAdapter(datetime).dump_python(aware, mode="json")
+
+    assert ORJSONResponse({"at": aware}).body == f'{{"at":"{expected}"}}'.encode()
+    assert msgpack.unpackb(MsgpackResponse({"at": aware}).body) == {"at": expected}
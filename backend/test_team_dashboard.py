@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.models.checkout import EquipmentCheckout
+from app.models.equipment import Equipment
+from app.models.team import Team, TeamInvitation, TeamMembership
+from app.models.user import User
+
+
+@pytest.fixture
+def crew(client, db):
+    import main
+    from app.api.deps import get_current_user
+    from app.services.auth_service import UserSnapshot
+
+    users = [User(auth0_id=f"auth0|{i}", email=f"crew{i}@kitlog.io", name=f"Crew {i}") for i in range(5)]
+    teams = [Team(name="Rental house"), Team(name="Production")]
+    db.add_all(users + teams)
+    db.flush()
+    rental = teams[0]
+    db.add_all([
+        TeamMembership(user_id=user.id, team_id=rental.id, role=role)
+        for user, role in zip(users, ["owner", "admin", "member", "member"])
+    ])
+    db.add(TeamMembership(user_id=users[4].id, team_id=teams[1].id, role="owner"))
+    now = datetime.utcnow()
+    db.add_all([
+        TeamInvitation(email=email, team_id=rental.id, token=email, expires_at=now + expires, is_accepted=accepted,
+                       invited_by_user_id=users[0].id)
+        for email, expires, accepted in [
+            ("pending@kitlog.io", timedelta(days=7), False),
+            ("expired@kitlog.io", timedelta(days=-1), False),
+            ("accepted@kitlog.io", timedelta(days=7), True),
+        ]
+    ])
+    items = [
+        Equipment(name=f"Item {i}", category=category, condition=condition, team_id=rental.id, is_available=i > 1)
+        for i, (category, condition) in enumerate([
+            ("camera", "good"), ("camera", "fair"), ("camera", "good"), ("audio", "excellent"), ("audio", "good"),
+        ])
+    ]
+    items.append(Equipment(name="Other team's camera", category="camera", team_id=teams[1].id, is_available=False))
+    db.add_all(items)
+    db.flush()
+    db.add_all([
+        EquipmentCheckout(equipment_id=items[0].id, user_id=users[2].id, due_date=now - timedelta(days=1)),
+        EquipmentCheckout(equipment_id=items[1].id, user_id=users[3].id, due_date=now + timedelta(days=1)),
+        EquipmentCheckout(equipment_id=items[5].id, user_id=users[4].id, due_date=now - timedelta(days=1)),
+    ])
+    db.commit()
+    snapshots = [UserSnapshot.from_user(user) for user in users]
+    main.app.dependency_overrides[get_current_user] = lambda: snapshots[2]
+    yield {"teams": [t.id for t in teams]}
+    main.app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_dashboard_aggregates_the_team(client, async_engine, crew):
+    url = f"/api/v1/teams/{crew['teams'][0]}/dashboard"
+    assert client.get(url).status_code == 200  # Warms the membership index
+
+    statements = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    response = client.get(url)
+    assert response.status_code == 200
+    assert len(statements) == 5
+
+    dashboard = response.json()
+    assert dashboard["team"]["name"] == "Rental house"
+    assert dashboard["members"] == {"total": 4, "by_role": {"owner": 1, "admin": 1, "member": 2}}
+    assert dashboard["pending_invitations"] == 1
+    assert dashboard["equipment"] == {
+        "total_items": 5,
+        "available_items": 3,
+        "in_use_items": 2,
+        "by_category": {"audio": {"total": 2, "available": 2}, "camera": {"total": 3, "available": 1}},
+        "by_condition": {"excellent": 1, "fair": 1, "good": 3},
+    }
+    assert dashboard["checkouts"] == {"active": 2, "overdue": 1}
+
+
+def test_dashboard_is_for_members(client, crew):
+    assert client.get(f"/api/v1/teams/{crew['teams'][1]}/dashboard").status_code == 403
+    assert client.get("/api/v1/teams/999/dashboard").status_code == 404
@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy import event
+
+from app.models.equipment import Equipment
+from app.models.team import Team, TeamMembership
+from app.models.user import User
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+
+@pytest.fixture
+def crew(client, db):
+    import main
+    from app.api.deps import get_current_user
+    from app.services.auth_service import UserSnapshot
+
+    users = [User(auth0_id=f"auth0|{i}", email=f"crew{i}@kitlog.io", name=f"Crew {i}") for i in range(2)]
+    teams = [Team(name="Rental house"), Team(name="Production"), Team(name="Other crew")]
+    db.add_all(users + teams)
+    db.flush()
+    db.add_all([
+        TeamMembership(user_id=users[0].id, team_id=teams[0].id, role="owner"),
+        TeamMembership(user_id=users[0].id, team_id=teams[1].id, role="member"),
+        TeamMembership(user_id=users[1].id, team_id=teams[2].id, role="owner"),
+    ])
+    db.add_all([
+        Equipment(name=f"Item {i}", category=("camera", "audio")[i % 2], team_id=teams[i % 3].id, is_available=i % 4 != 0)
+        for i in range(12)
+    ])
+    db.add(Equipment(name="Personal tripod", category="support", owner_id="auth0|0"))
+    db.commit()
+    snapshots = [UserSnapshot.from_user(user) for user in users]
+    main.app.dependency_overrides[get_current_user] = lambda: snapshots[0]
+    yield {"users": snapshots, "teams": [t.id for t in teams], "as_user": lambda i: main.app.dependency_overrides.update(
+        {get_current_user: lambda: snapshots[i]}
+    )}
+    main.app.dependency_overrides.pop(get_current_user, None)
+
+
+def names(response):
+    assert response.status_code == 200, response.text
+    return [item["name"] for item in response.json()]
+
+
+def test_team_equipment_is_filtered_and_paginated(client, crew):
+    rental = crew["teams"][0]
+    url = f"/api/v1/teams/{rental}/equipment"
+
+    assert names(client.get(url)) == ["Item 0", "Item 3", "Item 6", "Item 9"]
+    assert names(client.get(url, params={"category": "camera"})) == ["Item 0", "Item 6"]
+    assert names(client.get(url, params={"available_only": True})) == ["Item 3", "Item 6", "Item 9"]
+    assert client.get(url, params={"fields": "id,name"}).json()[0].keys() == {"id", "name"}
+
+    first = client.get(url, params={"limit": 3})
+    second = client.get(url, params={"limit": 3, "cursor": first.headers[NEXT_CURSOR_HEADER]})
+    assert names(first) + names(second) == ["Item 0", "Item 3", "Item 6", "Item 9"]
+
+    etag = first.headers["ETag"]
+    assert client.get(url, params={"limit": 3}, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_team_equipment_is_for_members(client, crew):
+    other = crew["teams"][2]
+    assert client.get(f"/api/v1/teams/{other}/equipment").status_code == 403
+    assert client.get("/api/v1/teams/999/equipment").status_code == 404
+    crew["as_user"](1)
+    assert names(client.get(f"/api/v1/teams/{other}/equipment")) == ["Item 2", "Item 5", "Item 8", "Item 11"]
+
+
+def test_my_team_equipment_spans_every_team_in_one_query(client, db, async_engine, crew):
+    statements = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    response = client.get("/api/v1/equipment/my-teams", params={"category": "camera"})
+    # Rental house and Production, not Other crew or personal items
+    assert names(response) == ["Item 0", "Item 4", "Item 6", "Item 10"]
+    # Two collection versions for the ETag, then the page itself
+    assert len(statements) == 3
+
+    # Joining a team changes what the list holds, so it changes the ETag too
+    other = crew["teams"][2]
+    assert client.post(f"/api/v1/teams/{other}/members", json={"user_id": crew["users"][0].id}).status_code == 200
+    refreshed = client.get(
+        "/api/v1/equipment/my-teams", params={"category": "camera"}, headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert names(refreshed) == ["Item 0", "Item 2", "Item 4", "Item 6", "Item 8", "Item 10"]
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, func, select
+
+from app.models.team import Team, TeamInvitation, TeamMembership
+from app.models.user import User
+
+
+@pytest.fixture
+def crew(client, db):
+    import main
+    from app.api.deps import get_current_user
+    from app.services.auth_service import UserSnapshot
+
+    users = [User(auth0_id=f"auth0|{i}", email=f"crew{i}@kitlog.io", name=f"Crew {i}") for i in range(3)]
+    teams = [Team(name="Rental house", subscription_type="paid"), Team(name="Free crew")]
+    db.add_all(users + teams)
+    db.flush()
+    rental = teams[0]
+    db.add_all([
+        TeamMembership(user_id=users[0].id, team_id=rental.id, role="owner"),
+        TeamMembership(user_id=users[1].id, team_id=rental.id, role="member"),
+        TeamMembership(user_id=users[0].id, team_id=teams[1].id, role="owner"),
+    ])
+    now = datetime.utcnow()
+    db.add_all([
+        TeamInvitation(email=email, team_id=rental.id, token=email, expires_at=now + expires,
+                       invited_by_user_id=users[0].id)
+        for email, expires in [("pending@kitlog.io", timedelta(days=7)), ("expired@kitlog.io", timedelta(days=-1))]
+    ])
+    db.commit()
+    snapshots = [UserSnapshot.from_user(user) for user in users]
+    main.app.dependency_overrides[get_current_user] = lambda: snapshots[0]
+    yield {"teams": [t.id for t in teams], "as_user": lambda i: main.app.dependency_overrides.update(
+        {get_current_user: lambda: snapshots[i]}
+    )}
+    main.app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_bulk_invitations_report_each_email(client, db, async_engine, crew):
+    url = f"/api/v1/teams/{crew['teams'][0]}/invitations/bulk"
+    emails = ["new1@kitlog.io", "crew1@kitlog.io", "pending@kitlog.io", "expired@kitlog.io", "new1@kitlog.io"]
+    emails += [f"more{i}@kitlog.io" for i in range(40)]
+    client.get(f"/api/v1/teams/{crew['teams'][0]}/dashboard")  # Warms the membership index
+
+    statements = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    response = client.post(url, json={"emails": emails, "role": "admin"})
+    assert response.status_code == 200, response.text
+    # Team, members, pending invitations, the INSERT and the collection version bump
+    assert len(statements) == 5
+
+    results = response.json()
+    assert [r["email"] for r in results] == emails
+    assert [r["status"] for r in results[:5]] == ["invited", "already_member", "already_invited", "invited", "duplicate"]
+    invited = [r["invitation"] for r in results if r["status"] == "invited"]
+    assert len(invited) == 42
+    assert all(i["role"] == "admin" and i["team_id"] == crew["teams"][0] for i in invited)
+    assert len({i["token"] for i in invited}) == 42
+    assert results[1]["invitation"] is None
+
+    assert db.scalar(select(func.count()).select_from(TeamInvitation)) == 44
+    token = results[0]["invitation"]["token"]
+    assert client.get(f"/api/v1/invitations/{token}").json()["email"] == "new1@kitlog.io"
+
+    # A second run finds them all pending
+    again = client.post(url, json={"emails": emails[:1]}).json()
+    assert again[0]["status"] == "already_invited"
+
+
+def test_bulk_invitations_are_for_owners_and_admins_of_paid_teams(client, crew):
+    rental, free = crew["teams"]
+    body = {"emails": ["new@kitlog.io"]}
+    assert client.post(f"/api/v1/teams/{free}/invitations/bulk", json=body).status_code == 403
+    assert client.post("/api/v1/teams/999/invitations/bulk", json=body).status_code == 404
+    assert client.post(f"/api/v1/teams/{rental}/invitations/bulk", json={"emails": []}).status_code == 422
+    crew["as_user"](1)
+    assert client.post(f"/api/v1/teams/{rental}/invitations/bulk", json=body).status_code == 403
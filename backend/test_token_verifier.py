@@ -0,0 +1,175 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from app.services.token_verifier import TokenVerifier, TokenVerificationError
+
+AUDIENCE = "https://api.kitlog.test"
+
+
+def make_key_pair(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    public_jwk = jwk.construct(public_pem, algorithm="RS256").to_dict()
+    public_jwk.update({"kid": kid, "use": "sig"})
+    return private_pem, public_jwk
+
+
+class StubAuth0:
+    """Serves a JWKS document and /userinfo from a local HTTP server."""
+
+    def __init__(self):
+        self.jwks = {"keys": []}
+        self.user_info = {}
+        self.hits = {"jwks": 0, "userinfo": 0}
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/.well-known/jwks.json":
+                    stub.hits["jwks"] += 1
+                    body = stub.jwks
+                elif self.path == "/userinfo":
+                    stub.hits["userinfo"] += 1
+                    body = stub.user_info
+                else:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                payload = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+
+
+@pytest.fixture
+def stub():
+    server = StubAuth0()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def verifier(stub):
+    return TokenVerifier(
+        "kitlog.test",
+        audience=AUDIENCE,
+        jwks_url=f"{stub.base_url}/.well-known/jwks.json",
+        userinfo_url=f"{stub.base_url}/userinfo",
+        jwks_min_refresh_interval=0,
+    )
+
+
+def make_token(private_pem, kid, **claims):
+    now = int(time.time())
+    payload = {
+        "iss": "https://kitlog.test/",
+        "aud": AUDIENCE,
+        "sub": "auth0|123",
+        "iat": now,
+        "exp": now + 300,
+    }
+    payload.update(claims)
+    return jwt.encode(payload, private_pem, algorithm="RS256", headers={"kid": kid})
+
+
+def test_verifies_locally_and_caches_jwks(stub, verifier):
+    private_pem, public_jwk = make_key_pair("key-1")
+    stub.jwks["keys"] = [public_jwk]
+    token = make_token(private_pem, "key-1", email="a@kitlog.io", name="A")
+
+    for _ in range(3):
+        claims = asyncio.run(verifier.get_user_info(token))
+
+    assert claims["sub"] == "auth0|123"
+    assert claims["email"] == "a@kitlog.io"
+    assert stub.hits == {"jwks": 1, "userinfo": 0}
+
+
+def test_refetches_jwks_when_kid_rotates(stub, verifier):
+    old_pem, old_jwk = make_key_pair("key-1")
+    new_pem, new_jwk = make_key_pair("key-2")
+    stub.jwks["keys"] = [old_jwk]
+    asyncio.run(verifier.verify(make_token(old_pem, "key-1")))
+
+    stub.jwks["keys"] = [new_jwk]
+    claims = asyncio.run(verifier.verify(make_token(new_pem, "key-2")))
+
+    assert claims["sub"] == "auth0|123"
+    assert stub.hits["jwks"] == 2
+    with pytest.raises(TokenVerificationError):
+        asyncio.run(verifier.verify(make_token(old_pem, "key-1")))
+
+
+def test_rejects_bad_tokens(stub, verifier):
+    private_pem, public_jwk = make_key_pair("key-1")
+    forged_pem, _ = make_key_pair("key-1")
+    stub.jwks["keys"] = [public_jwk]
+
+    with pytest.raises(TokenVerificationError):
+        asyncio.run(verifier.verify(make_token(forged_pem, "key-1")))
+    with pytest.raises(TokenVerificationError):
+        asyncio.run(verifier.verify(make_token(private_pem, "key-1", aud="https://other.api")))
+    with pytest.raises(TokenVerificationError):
+        asyncio.run(verifier.verify(make_token(private_pem, "key-1", exp=int(time.time()) - 60)))
+    with pytest.raises(TokenVerificationError):
+        asyncio.run(verifier.verify("not.a-jwt.token"))
+
+
+def test_falls_back_to_userinfo_for_missing_profile_claims(stub, verifier):
+    private_pem, public_jwk = make_key_pair("key-1")
+    stub.jwks["keys"] = [public_jwk]
+    stub.user_info = {"sub": "auth0|123", "email": "a@kitlog.io", "name": "A"}
+    token = make_token(private_pem, "key-1")
+
+    claims = asyncio.run(verifier.verify(token))
+    assert stub.hits["userinfo"] == 0
+
+    user_info = asyncio.run(verifier.get_user_info(token, claims))
+    assert user_info["email"] == "a@kitlog.io"
+    assert stub.hits["userinfo"] == 1
+
+
+def test_without_an_audience_only_userinfo_vouches_for_tokens(stub):
+    verifier = TokenVerifier(
+        "kitlog.test",
+        jwks_url=f"{stub.base_url}/.well-known/jwks.json",
+        userinfo_url=f"{stub.base_url}/userinfo",
+    )
+    private_pem, public_jwk = make_key_pair("key-1")
+    stub.jwks["keys"] = [public_jwk]
+    stub.user_info = {"sub": "auth0|123", "email": "a@kitlog.io", "name": "A"}
+    # Correctly signed, but an ID token for some client: not an access token for us
+    id_token = make_token(private_pem, "key-1", aud="some-client-id", email="a@kitlog.io", name="A")
+
+    with pytest.raises(TokenVerificationError):
+        asyncio.run(verifier.verify(id_token))
+    assert asyncio.run(verifier.get_claims(id_token))["sub"] == "auth0|123"
+    assert stub.hits == {"jwks": 0, "userinfo": 1}
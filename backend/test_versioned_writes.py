@@ -0,0 +1,123 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.models.equipment import Equipment
+from app.models.team import Team, TeamMembership
+from app.models.user import User
+
+
+@pytest.fixture
+def statements(async_engine):
+    captured = []
+
+    def listener(conn, cursor, statement, *args):
+        captured.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    yield captured
+    event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+
+
+def test_stale_versions_are_rejected(client):
+    created = client.post("/api/v1/equipment/", json={"name": "Tripod", "category": "support"}).json()
+    url = f"/api/v1/equipment/{created['id']}"
+    assert created["version"] == 1
+
+    # Two editors load version 1; the second save must not overwrite the first
+    first = client.put(url, json={"name": "Tripod (Sachtler)", "version": 1})
+    assert first.status_code == 200 and first.json()["version"] == 2
+    second = client.put(url, json={"location": "Cage B", "version": 1})
+    assert second.status_code == 409
+    assert client.get(url).json()["location"] is None
+
+    assert client.delete(url, params={"version": 1}).status_code == 409
+    assert client.put(url, json={"notes": "No version: last write wins"}).json()["version"] == 3
+    assert client.delete(url, params={"version": 3}).status_code == 200
+    assert client.put(url, json={"name": "Gone", "version": 3}).status_code == 404
+    assert client.delete(url).status_code == 404
+
+
+def test_parallel_editors_of_one_version_have_one_winner(client):
+    created = client.post("/api/v1/equipment/", json={"name": "Monitor", "category": "video"}).json()
+    url = f"/api/v1/equipment/{created['id']}"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        responses = list(pool.map(
+            lambda i: client.put(url, json={"location": f"Stage {i}", "version": 1}), range(8)
+        ))
+
+    codes = sorted(r.status_code for r in responses)
+    assert codes == [200] + [409] * 7
+    winner = next(r.json() for r in responses if r.status_code == 200)
+    assert client.get(url).json()["location"] == winner["location"]
+
+
+def starts(statements):
+    return [" ".join(statement.split()[:3]) for statement in statements]
+
+
+def test_writes_are_single_statements(client, db, statements):
+    user = User(auth0_id="auth0|1", email="owner@kitlog.io", name="Owner")
+    team = Team(name="Rental house")
+    db.add_all([user, team])
+    db.flush()
+    db.add(TeamMembership(user_id=user.id, team_id=team.id, role="owner"))
+    db.commit()
+    equipment = client.post("/api/v1/equipment/", json={"name": "Slider", "category": "support"}).json()
+    url = f"/api/v1/equipment/{equipment['id']}"
+
+    statements.clear()
+    client.put(url, json={"notes": "Bearings replaced", "version": 1})
+    assert starts(statements) == ["UPDATE equipment SET", "INSERT INTO collection_versions"]
+    assert "RETURNING" in statements[0]
+
+    # Moving an item between counted categories also needs its old values
+    statements.clear()
+    client.put(url, json={"category": "grip"})
+    assert starts(statements)[:2] == ["SELECT equipment.owner_id, equipment.team_id,", "UPDATE equipment SET"]
+    assert client.get("/api/v1/equipment/stats/summary").json()["categories"] == 1
+
+    statements.clear()
+    assert client.put(
+        f"/api/v1/teams/{team.id}/members/{user.id}", json={"role": "admin"}
+    ).json()["role"] == "admin"
+    assert starts(statements) == ["UPDATE team_memberships SET", "INSERT INTO collection_versions"]
+
+    statements.clear()
+    client.delete(url)
+    assert starts(statements)[0] == "DELETE FROM equipment"
+    assert "RETURNING" in statements[0]
+
+
+def test_team_updates_check_versions(client, db, monkeypatch):
+    from app.api.deps import get_current_user
+    from app.services.team_service import TeamService
+    import main
+
+    team = Team(name="Rental house")
+    db.add(team)
+    db.commit()
+    monkeypatch.setattr(TeamService, "check_user_team_permission", staticmethod(lambda *args: True))
+    main.app.dependency_overrides[get_current_user] = lambda: User(id=1)
+    try:
+        url = f"/api/v1/teams/{team.id}"
+        updated = client.put(url, json={"name": "Rental house & co", "version": 1})
+        assert updated.status_code == 200 and updated.json()["version"] == 2
+        assert client.put(url, json={"description": "Stale", "version": 1}).status_code == 409
+        assert client.get(url).json()["name"] == "Rental house & co"
+    finally:
+        main.app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_orm_flushes_check_versions_too(client, db):
+    item = Equipment(name="Dolly", category="grip")
+    db.add(item)
+    db.commit()
+    assert client.put(f"/api/v1/equipment/{item.id}", json={"name": "Dolly (track)"}).status_code == 200
+
+    item.location = "Stage 2"  # Still holds version 1
+    with pytest.raises(StaleDataError):
+        db.commit()
@@ -9,6 +9,8 @@ const Auth0Provider = ({ children }: Auth0ProviderProps) => {
   const domain = import.meta.env.VITE_AUTH0_DOMAIN;
   const clientId = import.meta.env.VITE_AUTH0_CLIENT_ID;
   const redirectUri = import.meta.env.VITE_AUTH0_CALLBACK_URL || window.location.origin;
+  // Requesting our API audience makes Auth0 issue JWT access tokens the backend can verify locally
+  const audience = import.meta.env.VITE_AUTH0_AUDIENCE;
 
   if (!domain || !clientId) {
     console.error('Auth0 configuration missing. Please check your environment variables.');
@@ -21,7 +23,8 @@ const Auth0Provider = ({ children }: Auth0ProviderProps) => {
       clientId={clientId}
       authorizationParams={{
         redirect_uri: redirectUri,
-        scope: "openid profile email"
+        scope: "openid profile email",
+        ...(audience ? { audience } : {})
       }}
       useRefreshTokens={true}
       cacheLocation="localstorage"
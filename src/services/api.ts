@@ -14,6 +14,7 @@ export interface Equipment {
   notes?: string;
   owner_id?: string;
   owner_name?: string;
+  version: number;
   created_at: string;
   updated_at?: string;
 }
@@ -40,6 +41,70 @@ export interface EquipmentStats {
   categories: number;
 }
 
+export interface EquipmentCheckout {
+  id: number;
+  equipment_id: number;
+  user_id: number;
+  checked_out_at?: string;
+  checked_in_at?: string;
+  due_date?: string;
+  checkout_notes?: string;
+  checkin_notes?: string;
+  is_active: boolean;
+  kit_id?: number;
+}
+
+export interface TeamDashboard {
+  team: Team;
+  members: { total: number; by_role: Record<string, number> };
+  pending_invitations: number;
+  equipment: {
+    total_items: number;
+    available_items: number;
+    in_use_items: number;
+    by_category: Record<string, { total: number; available: number }>;
+    by_condition: Record<string, number>;
+  };
+  checkouts: { active: number; overdue: number };
+}
+
+export interface Kit {
+  id: number;
+  name: string;
+  description?: string;
+  team_id?: number;
+  equipment_ids: number[];
+  created_by_user_id: number;
+  created_at: string;
+  updated_at?: string;
+}
+
+export interface KitCreate {
+  name: string;
+  description?: string;
+  team_id?: number;
+  equipment_ids: number[];
+}
+
+export interface EquipmentReservation {
+  id: number;
+  equipment_id: number;
+  user_id: number;
+  starts_at: string;
+  ends_at: string;
+  notes?: string;
+  created_at?: string;
+}
+
+export interface OverdueCheckout {
+  checkout_id: number;
+  equipment_id: number;
+  equipment_name: string;
+  user_id: number;
+  due_date: string;
+  flagged_at: string;
+}
+
 export interface TeamCreate {
   name: string;
   description?: string;
@@ -51,6 +116,7 @@ export interface Team {
   name: string;
   description?: string;
   subscription_type: 'free' | 'paid' | 'enterprise';
+  version: number;
   created_at: string;
   updated_at?: string;
 }
@@ -74,6 +140,25 @@ export interface TeamMemberCreate {
   user_email?: string;
 }
 
+export interface TeamInvitation {
+  id: number;
+  email: string;
+  team_id: number;
+  role: 'owner' | 'admin' | 'member';
+  token: string;
+  created_at: string;
+  expires_at: string;
+  is_accepted: boolean;
+  accepted_at?: string;
+  invited_by_user_id: number;
+}
+
+export interface TeamInvitationBulkResult {
+  email: string;
+  status: 'invited' | 'already_member' | 'already_invited' | 'duplicate';
+  invitation?: TeamInvitation;
+}
+
 class ApiService {
   private getAccessToken: (() => Promise<string>) | null = null;
 
@@ -136,11 +221,14 @@ class ApiService {
 
   // Equipment endpoints
   async getEquipment(params: {
-    skip?: number;
+    cursor?: string;
     limit?: number;
+    sort?: 'id' | 'name' | 'created_at' | 'category' | '-id' | '-name' | '-created_at' | '-category';
     category?: string;
     available_only?: boolean;
     owner_id?: string;
+    team_id?: number;
+    fields?: string;  // e.g. 'id,name,category,is_available'; omitted fields are absent from the response
   } = {}): Promise<Equipment[]> {
     const searchParams = new URLSearchParams();
     
@@ -156,6 +244,29 @@ class ApiService {
     return this.makeRequest<Equipment[]>(endpoint);
   }
 
+  async getTeamEquipment(teamId: number, params: Omit<Parameters<ApiService['getEquipment']>[0], 'team_id'> = {}): Promise<Equipment[]> {
+    const searchParams = new URLSearchParams();
+    Object.entries(params).forEach(([key, value]) => {
+      if (value !== undefined) {
+        searchParams.append(key, value.toString());
+      }
+    });
+    const queryString = searchParams.toString();
+    return this.makeRequest<Equipment[]>(`/api/v1/teams/${teamId}/equipment${queryString ? `?${queryString}` : ''}`);
+  }
+
+  // Equipment of every team the current user belongs to
+  async getMyTeamEquipment(params: Omit<Parameters<ApiService['getEquipment']>[0], 'team_id'> = {}): Promise<Equipment[]> {
+    const searchParams = new URLSearchParams();
+    Object.entries(params).forEach(([key, value]) => {
+      if (value !== undefined) {
+        searchParams.append(key, value.toString());
+      }
+    });
+    const queryString = searchParams.toString();
+    return this.makeRequest<Equipment[]>(`/api/v1/equipment/my-teams${queryString ? `?${queryString}` : ''}`);
+  }
+
   async getEquipmentById(id: number): Promise<Equipment> {
     return this.makeRequest<Equipment>(`/api/v1/equipment/${id}`);
   }
@@ -167,26 +278,120 @@ class ApiService {
     });
   }
 
-  async updateEquipment(id: number, equipment: Partial<EquipmentCreate>): Promise<Equipment> {
+  async updateEquipment(id: number, equipment: Partial<EquipmentCreate> & { version?: number }): Promise<Equipment> {
     return this.makeRequest<Equipment>(`/api/v1/equipment/${id}`, {
       method: 'PUT',
       body: JSON.stringify(equipment),
     });
   }
 
-  async deleteEquipment(id: number): Promise<{ message: string }> {
-    return this.makeRequest<{ message: string }>(`/api/v1/equipment/${id}`, {
+  async deleteEquipment(id: number, version?: number): Promise<{ message: string }> {
+    const query = version !== undefined ? `?version=${version}` : '';
+    return this.makeRequest<{ message: string }>(`/api/v1/equipment/${id}${query}`, {
       method: 'DELETE',
     });
   }
 
+  async checkoutEquipment(id: number, details: { due_date?: string; notes?: string } = {}): Promise<EquipmentCheckout> {
+    return this.makeRequest<EquipmentCheckout>(`/api/v1/equipment/${id}/checkout`, {
+      method: 'POST',
+      body: JSON.stringify(details),
+    });
+  }
+
+  async checkinEquipment(id: number, notes?: string): Promise<EquipmentCheckout> {
+    return this.makeRequest<EquipmentCheckout>(`/api/v1/equipment/${id}/checkin`, {
+      method: 'POST',
+      body: JSON.stringify({ notes }),
+    });
+  }
+
+  async getKits(team_id?: number): Promise<Kit[]> {
+    return this.makeRequest<Kit[]>(`/api/v1/kits/${team_id !== undefined ? `?team_id=${team_id}` : ''}`);
+  }
+
+  async createKit(kit: KitCreate): Promise<Kit> {
+    return this.makeRequest<Kit>('/api/v1/kits/', {
+      method: 'POST',
+      body: JSON.stringify(kit),
+    });
+  }
+
+  async updateKit(id: number, updates: Partial<KitCreate>): Promise<Kit> {
+    return this.makeRequest<Kit>(`/api/v1/kits/${id}`, {
+      method: 'PUT',
+      body: JSON.stringify(updates),
+    });
+  }
+
+  async deleteKit(id: number): Promise<{ message: string }> {
+    return this.makeRequest<{ message: string }>(`/api/v1/kits/${id}`, {
+      method: 'DELETE',
+    });
+  }
+
+  async checkoutKit(id: number, due_date?: string, notes?: string): Promise<EquipmentCheckout[]> {
+    return this.makeRequest<EquipmentCheckout[]>(`/api/v1/kits/${id}/checkout`, {
+      method: 'POST',
+      body: JSON.stringify({ due_date, notes }),
+    });
+  }
+
+  async checkinKit(id: number, notes?: string): Promise<EquipmentCheckout[]> {
+    return this.makeRequest<EquipmentCheckout[]>(`/api/v1/kits/${id}/checkin`, {
+      method: 'POST',
+      body: JSON.stringify({ notes }),
+    });
+  }
+
+  async reserveEquipment(id: number, starts_at: string, ends_at: string, notes?: string): Promise<EquipmentReservation> {
+    return this.makeRequest<EquipmentReservation>(`/api/v1/equipment/${id}/reservations`, {
+      method: 'POST',
+      body: JSON.stringify({ starts_at, ends_at, notes }),
+    });
+  }
+
+  async getEquipmentReservations(id: number, from?: string, to?: string): Promise<EquipmentReservation[]> {
+    const params = new URLSearchParams();
+    if (from) params.append('from', from);
+    if (to) params.append('to', to);
+    const query = params.toString();
+    return this.makeRequest<EquipmentReservation[]>(`/api/v1/equipment/${id}/reservations${query ? `?${query}` : ''}`);
+  }
+
+  async cancelReservation(id: number, reservationId: number): Promise<{ message: string }> {
+    return this.makeRequest<{ message: string }>(`/api/v1/equipment/${id}/reservations/${reservationId}`, {
+      method: 'DELETE',
+    });
+  }
+
+  async getAvailableEquipment(from: string, to: string, team_id?: number): Promise<Equipment[]> {
+    const params = new URLSearchParams({ from, to });
+    if (team_id !== undefined) params.append('team_id', String(team_id));
+    return this.makeRequest<Equipment[]>(`/api/v1/equipment/availability?${params.toString()}`);
+  }
+
   async getEquipmentStats(owner_id?: string): Promise<EquipmentStats> {
     const endpoint = `/api/v1/equipment/stats/summary${owner_id ? `?owner_id=${owner_id}` : ''}`;
     return this.makeRequest<EquipmentStats>(endpoint);
   }
 
-  async getEquipmentCategories(): Promise<{ categories: string[] }> {
-    return this.makeRequest<{ categories: string[] }>('/api/v1/equipment/categories/list/');
+  async getEquipmentCategories(params: {
+    owner_id?: string;
+    team_id?: number;
+  } = {}): Promise<{ categories: string[] }> {
+    const searchParams = new URLSearchParams();
+    
+    Object.entries(params).forEach(([key, value]) => {
+      if (value !== undefined) {
+        searchParams.append(key, value.toString());
+      }
+    });
+
+    const queryString = searchParams.toString();
+    return this.makeRequest<{ categories: string[] }>(
+      `/api/v1/equipment/categories/list/${queryString ? `?${queryString}` : ''}`
+    );
   }
 
   // Team endpoints
@@ -216,6 +421,15 @@ class ApiService {
     return this.makeRequest<TeamMembership[]>(`/api/v1/teams/${teamId}/members`);
   }
 
+  // Everything the team page shows, in one request
+  async getTeamDashboard(teamId: number): Promise<TeamDashboard> {
+    return this.makeRequest<TeamDashboard>(`/api/v1/teams/${teamId}/dashboard`);
+  }
+
+  async getTeamOverdueCheckouts(teamId: number): Promise<OverdueCheckout[]> {
+    return this.makeRequest<OverdueCheckout[]>(`/api/v1/teams/${teamId}/overdue`);
+  }
+
   async updateTeamMember(teamId: number, memberId: number, updates: Partial<TeamMemberCreate>): Promise<TeamMembership> {
     return this.makeRequest<TeamMembership>(`/api/v1/teams/${teamId}/members/${memberId}`, {
       method: 'PUT',
@@ -223,6 +437,18 @@ class ApiService {
     });
   }
 
+  // Invite many emails at once; each comes back with its own status, in order
+  async inviteTeamMembers(
+    teamId: number,
+    emails: string[],
+    role: TeamInvitation['role'] = 'member'
+  ): Promise<TeamInvitationBulkResult[]> {
+    return this.makeRequest<TeamInvitationBulkResult[]>(`/api/v1/teams/${teamId}/invitations/bulk`, {
+      method: 'POST',
+      body: JSON.stringify({ emails, role }),
+    });
+  }
+
   async removeTeamMember(teamId: number, memberId: number): Promise<{ message: string }> {
     return this.makeRequest<{ message: string }>(`/api/v1/teams/${teamId}/members/${memberId}`, {
       method: 'DELETE',